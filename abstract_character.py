@@ -13,9 +13,9 @@ class AbstractCharacter(Base):
     x: Column[Integer] = Column(Integer)
     y: Column[Integer] = Column(Integer)
     alive: Column[Integer] = Column(Integer)
-    type: Column[String] = Column(String(7))
+    type: Column[String] = Column(String(7), index=True)
 
-    __mapper_args__ = {"polymorphic_on": type}
+    __mapper_args__ = {"polymorphic_on": type, "with_polymorphic": "*"}
 
     ID_LABEL = "ID"
     MIN_RANGE = 0
@@ -38,6 +38,27 @@ class AbstractCharacter(Base):
         self.alive = True
         self.type = char_type
 
+    @classmethod
+    def set_world_bounds(cls, min_range: int, max_range: int):
+        """Sets the inclusive range allowed for x and y on every character."""
+
+        for label, value in (
+            ("Minimum range", min_range),
+            ("Maximum range", max_range),
+        ):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"{label} must be an integer.")
+        if min_range >= max_range:
+            raise ValueError("Minimum range must be lower than maximum range.")
+
+        AbstractCharacter.MIN_RANGE = min_range
+        AbstractCharacter.MAX_RANGE = max_range
+
+    @classmethod
+    def get_world_bounds(cls) -> tuple[int, int]:
+        """Returns the inclusive (min, max) range allowed for x and y."""
+        return AbstractCharacter.MIN_RANGE, AbstractCharacter.MAX_RANGE
+
     def _validate_character_type_input(self, char_type_value):
         """Private helper to validate the character type string."""
         if not isinstance(char_type_value, str):
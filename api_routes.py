@@ -0,0 +1,440 @@
+import json
+import uuid
+from collections import namedtuple
+
+from monster import Monster
+from player import Player
+from response_compression import add_vary, gzip_etag
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+NDJSON_LINES_PER_CHUNK = 500
+STREAM_PAGE_SIZE = 1000
+BATCH_MODES = ["atomic", "best_effort"]
+# Distinguishes ETags across restarts, when the data version starts over
+ETAG_EPOCH = uuid.uuid4().hex[:12]
+BODY_NOT_OBJECT_MESSAGE = "Request body must be a JSON object."
+# Query parameters a list route accepts besides the filter keys
+LIST_QUERY_PARAMETERS = ["sort", "limit", "format"]
+BOOLEAN_QUERY_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+# What a route handler sees of a request: the query string (a werkzeug
+# MultiDict in both servers), the JSON body and the negotiated format
+ApiRequest = namedtuple("ApiRequest", ["args", "body", "ndjson"])
+
+# What a route handler returns. kind is "json" (body is serialized),
+# "text" (body is sent as is) or "ndjson" (body is an iterator of chunks)
+ApiResult = namedtuple("ApiResult", ["body", "status", "kind"])
+
+# One API route. Handlers are blocking CharacterManager calls, so the async
+# server runs them on its database executor
+Route = namedtuple("Route", ["rule", "method", "handler", "cached", "reads_body"])
+
+
+def json_result(value, status: int = 200) -> ApiResult:
+    """Returns a result whose body is sent as JSON"""
+    return ApiResult(value, status, "json")
+
+
+def text_result(text: str, status: int = 200) -> ApiResult:
+    """Returns a result whose body is sent as plain text"""
+    return ApiResult(text, status, "text")
+
+
+def ndjson_result(characters, serialize) -> ApiResult:
+    """Returns a result streaming one JSON document per character"""
+    return ApiResult(ndjson_chunks(characters, serialize), 200, "ndjson")
+
+
+def ndjson_chunks(characters, serialize):
+    """Yields newline-delimited JSON in chunks of NDJSON_LINES_PER_CHUNK lines.
+    characters is consumed lazily, so each chunk is one step of the query."""
+
+    lines = []
+    for character in characters:
+        lines.append(json.dumps(serialize(character)))
+        if len(lines) >= NDJSON_LINES_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def wants_ndjson(request) -> bool:
+    """Returns True if the client asked for newline-delimited JSON,
+    either with ?format=ndjson or through the Accept header"""
+    if request.args.get("format") == "ndjson":
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def make_etag(epoch: str, data_version: int, ndjson: bool) -> str:
+    """Returns the strong ETag of a GET response at data_version.
+    NDJSON and JSON representations of a route get different tags."""
+    representation = "ndjson" if ndjson else "json"
+    return f"{epoch}-{data_version}-{representation}"
+
+
+def request_etag(request, data_version: int) -> str:
+    """Returns the ETag of the representation request asks for at
+    data_version. Servers read the version before running the view, so a
+    tag is never newer than the body it labels."""
+    return make_etag(ETAG_EPOCH, data_version, wants_ndjson(request))
+
+
+def revalidate(request, response_class, etag: str):
+    """Returns a bodiless 304 if the request's If-None-Match holds etag or
+    its gzip variant, otherwise None"""
+    for current_etag in (etag, gzip_etag(etag)):
+        if request.if_none_match.contains(current_etag):
+            return not_modified(response_class, current_etag)
+    return None
+
+
+def not_modified(response_class, etag: str):
+    """Returns a bodiless 304 response carrying etag"""
+    response = response_class(status=304)
+    response.set_etag(etag)
+    add_vary(response)
+    return response
+
+
+def tag_response(response, etag: str):
+    """Sets etag on a successful Flask or Quart response and returns it"""
+    if response.status_code == 200:
+        response.set_etag(etag)
+    return response
+
+
+def list_query(server, args):
+    """Returns (filters, sort, limit) from the query string of a list route,
+    e.g. ?job=knight&min_player_level=5&alive=true&sort=-player_level,id&limit=20,
+    or None when the query string has none of them"""
+    filter_keys = server.get_filter_keys()
+    filters = {}
+    for key in args:
+        if key in filter_keys:
+            filters[key] = filter_value(server, key, args.get(key))
+        elif key not in LIST_QUERY_PARAMETERS:
+            raise ValueError(
+                f"Unsupported query parameter '{key}'. "
+                f"Use one of: {', '.join(filter_keys + LIST_QUERY_PARAMETERS)}."
+            )
+    sort = args.get("sort")
+    limit = args.get("limit")
+    if not filters and sort is None and limit is None:
+        return None
+
+    if limit is not None:
+        if not limit.isdigit():
+            raise ValueError("Limit must be a positive integer.")
+        limit = int(limit)
+    return filters or None, sort.split(",") if sort else None, limit
+
+
+def filter_value(server, key: str, text: str):
+    """Converts a query string value to the type of filter key: true/false
+    or 1/0 for booleans, a whole number for integer columns"""
+    filter_type = server.get_filter_type(key)
+    if filter_type is bool:
+        if text.lower() not in BOOLEAN_QUERY_VALUES:
+            raise ValueError(f"Filter '{key}' must be true or false.")
+        return BOOLEAN_QUERY_VALUES[text.lower()]
+    if filter_type is int:
+        try:
+            return int(text)
+        except ValueError:
+            raise ValueError(f"Filter '{key}' must be an integer.")
+    return text
+
+
+def many_characters(server, ids) -> list:
+    """Returns characters in request order, marking IDs that do not exist"""
+    characters = server.get_many(ids)
+    return [
+        (
+            character.to_dict()
+            if character is not None
+            else {"id": char_id, "missing": True}
+        )
+        for char_id, character in zip(ids, characters)
+    ]
+
+
+# Route handlers
+
+
+def add_character(server, api_request):
+    """Adds a character to the Server"""
+    content = api_request.body
+    if not isinstance(content, dict):
+        return text_result(BODY_NOT_OBJECT_MESSAGE, 400)
+
+    try:
+        if content.get("type") == "player":
+            character = Player(content.get("player_level"), content.get("job"))
+        else:
+            character = Monster(
+                content.get("monster_type"), content.get("monster_ai_difficulty")
+            )
+
+        server.add_character(character)
+
+        return text_result("", 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+def run_batch(server, api_request):
+    """Runs a JSON array of create/update/delete operations in one transaction.
+    ?mode=atomic (default) rolls everything back on the first failure;
+    ?mode=best_effort commits the operations that succeed"""
+    mode = api_request.args.get("mode", "atomic")
+    try:
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Mode must be one of: {', '.join(BATCH_MODES)}.")
+        results = server.execute_batch(api_request.body, atomic=mode == "atomic")
+        return json_result({"results": results}, 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_many_characters(server, api_request):
+    """Gets many characters in one query, e.g. ?ids=1,2,3"""
+    try:
+        try:
+            ids = [
+                int(char_id) for char_id in api_request.args.get("ids", "").split(",")
+            ]
+        except ValueError:
+            raise ValueError("IDs must be a comma-separated list of integers.")
+        return json_result(many_characters(server, ids), 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def lookup_characters(server, api_request):
+    """Gets many characters in one query from a {"ids": [...]} body, for long lists"""
+    content = api_request.body
+    try:
+        if not isinstance(content, dict):
+            raise ValueError(BODY_NOT_OBJECT_MESSAGE)
+        return json_result(many_characters(server, content.get("ids")), 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_character(server, api_request, id):
+    """Gets an existing character from the Server"""
+    try:
+        character = server.get(id)
+        return json_result(character.to_dict(), 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+def get_character_details(server, api_request, id):
+    """Gets character details from the Server"""
+    try:
+        character = server.get_character_details(id)
+        return json_result(character, 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+def delete_character(server, api_request, id):
+    """Delete an existing character from the Server"""
+    try:
+        server.delete_character(id)
+        return text_result("", 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+def delete_characters(server, api_request):
+    """Delete characters from the Server by a list of IDs or an attribute filter"""
+    content = api_request.body
+    try:
+        if not isinstance(content, dict):
+            raise ValueError(BODY_NOT_OBJECT_MESSAGE)
+        deleted = server.delete_characters(
+            ids=content.get("ids"), filters=content.get("filter")
+        )
+        return json_result({"deleted": deleted}, 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def move_characters(server, api_request):
+    """Moves characters in one transaction from a [[id, x, y], ...] payload"""
+    try:
+        moved = server.move_many(api_request.body)
+        return json_result({"moved": moved}, 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_all_by_type(server, api_request, character_type):
+    """Gets all existing characters from the Server by type, optionally
+    filtered, sorted and limited through the query string (see list_query)"""
+    try:
+        query = list_query(server, api_request.args)
+        if query is not None:
+            filters, sort, limit = query
+            filters = {**(filters or {}), "type": character_type}
+            characters = server.find_characters(filters, sort, limit)
+            return json_result(
+                [character.get_details() for character in characters], 200
+            )
+        result = server.get_character_details_by_type(character_type)
+        return json_result(result, 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_all(server, api_request):
+    """Gets all existing characters from the Server, optionally filtered,
+    sorted and limited through the query string (see list_query)"""
+    return _list_characters(server, api_request, lambda character: character.to_dict())
+
+
+def get_all_details(server, api_request):
+    """Gets all existing characters' details from the Server, optionally
+    filtered, sorted and limited through the query string (see list_query)"""
+    return _list_characters(
+        server, api_request, lambda character: character.get_details()
+    )
+
+
+def _list_characters(server, api_request, serialize):
+    """Lists characters as JSON or NDJSON. Unfiltered NDJSON streams keyset
+    pages of views so memory stays flat however many characters there are."""
+    try:
+        query = list_query(server, api_request.args)
+        if query is not None:
+            characters = server.find_characters(*query)
+        elif api_request.ndjson:
+            return ndjson_result(
+                server.iter_views(page_size=STREAM_PAGE_SIZE), serialize
+            )
+        else:
+            characters = server.get_views()
+        if api_request.ndjson:
+            return ndjson_result(iter(characters), serialize)
+        return json_result([serialize(character) for character in characters], 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_characters_in_rect(server, api_request):
+    """Gets the characters inside a rectangle, e.g. ?min_x=0&min_y=0&max_x=5&max_y=5"""
+    args = api_request.args
+    try:
+        characters = server.characters_in_rect(
+            args.get("min_x", type=int),
+            args.get("min_y", type=int),
+            args.get("max_x", type=int),
+            args.get("max_y", type=int),
+            args.get("type"),
+        )
+        return json_result([character.to_dict() for character in characters], 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_characters_within_radius(server, api_request):
+    """Gets the characters within a radius of a point, e.g. ?x=5&y=5&radius=2"""
+    args = api_request.args
+    try:
+        characters = server.characters_within_radius(
+            args.get("x", type=int),
+            args.get("y", type=int),
+            args.get("radius", type=int),
+            args.get("type"),
+        )
+        return json_result([character.to_dict() for character in characters], 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def get_nearest_characters(server, api_request):
+    """Gets the k characters closest to a point, e.g. ?k=3&x=5&y=5"""
+    args = api_request.args
+    try:
+        characters = server.nearest(
+            args.get("k", type=int),
+            args.get("x", type=int),
+            args.get("y", type=int),
+            args.get("type"),
+        )
+        return json_result([character.to_dict() for character in characters], 200)
+    except ValueError as e:
+        return text_result(str(e), 400)
+
+
+def update_character(server, api_request, id):
+    """Update existing character in the Server"""
+    content = api_request.body
+    if not isinstance(content, dict):
+        return text_result(BODY_NOT_OBJECT_MESSAGE, 400)
+
+    try:
+        # The payload shape selects the parameters; the manager validates them
+        # against the stored type, so no separate lookup is needed here
+        if "job" in content or "player_level" in content:
+            server.update_character(id, content.get("job"), content.get("player_level"))
+        else:
+            server.update_character(
+                id, content.get("monster_type"), content.get("monster_ai_difficulty")
+            )
+        return text_result("", 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+def get_server_stats(server, api_request):
+    """Gets server stats"""
+    try:
+        stats = server.get_server_stats().to_dict()
+        return json_result(stats, 200)
+    except ValueError as e:
+        return text_result(str(e), 404)
+
+
+ROUTES = [
+    Route("/server/characters", "POST", add_character, False, True),
+    Route("/server/characters/batch", "POST", run_batch, False, True),
+    Route("/server/characters", "GET", get_many_characters, True, False),
+    Route("/server/characters/lookup", "POST", lookup_characters, False, True),
+    Route("/server/characters/<int:id>", "GET", get_character, True, False),
+    Route(
+        "/server/characters/details/<int:id>",
+        "GET",
+        get_character_details,
+        True,
+        False,
+    ),
+    Route("/server/characters/<int:id>", "DELETE", delete_character, False, False),
+    Route("/server/characters", "DELETE", delete_characters, False, True),
+    Route("/server/characters/positions", "PATCH", move_characters, False, True),
+    Route(
+        "/server/characters/all/<string:character_type>",
+        "GET",
+        get_all_by_type,
+        True,
+        False,
+    ),
+    Route("/server/characters/all", "GET", get_all, True, False),
+    Route("/server/characters/all_details", "GET", get_all_details, True, False),
+    Route("/server/characters/in_rect", "GET", get_characters_in_rect, True, False),
+    Route(
+        "/server/characters/within_radius",
+        "GET",
+        get_characters_within_radius,
+        True,
+        False,
+    ),
+    Route("/server/characters/nearest", "GET", get_nearest_characters, True, False),
+    Route("/server/character/<int:id>", "PUT", update_character, False, True),
+    Route("/server/serverstats", "GET", get_server_stats, True, False),
+]
@@ -0,0 +1,323 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import sqlalchemy
+
+# project root directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Add project root to Python module search path if it's not already included
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from base import Base
+from character_manager import CharacterManager
+from engine_profile import EngineProfile
+from monster import Monster
+from player import Player
+from response_cache import ResponseCache
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_SAMPLES = 200
+FULL_SCAN_SAMPLES = 3
+SEED_BATCH_SIZE = 10_000
+MOVE_BATCH_SIZE = 1_000
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "results.json")
+DEFAULT_THRESHOLD = 0.2
+
+
+def seed_characters(count: int):
+    """Yields an even mix of players and monsters, players at even positions"""
+    jobs = Player.PLAYER_JOB
+    monster_types = Monster.MONSTER_TYPE
+    difficulties = Monster.MONSTER_AI_DIFFICULTY
+    for i in range(count):
+        if i % 2 == 0:
+            yield Player(i % 10 + 1, jobs[i % len(jobs)])
+        else:
+            yield Monster(monster_types[i % 3], difficulties[i % 3])
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(operation, arguments: list) -> dict:
+    """Times operation once per argument tuple except the last, which is used
+    for a separate traced call measuring peak Python memory, so tracing does
+    not skew the latencies"""
+    latencies = []
+    for args in arguments[:-1]:
+        start = time.perf_counter()
+        operation(*args)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation(*arguments[-1])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "samples": len(latencies),
+        "ops_per_sec": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def bench_manager(server: CharacterManager, ids: list[int], samples: int) -> dict:
+    """Benchmarks every CharacterManager operation against a seeded database"""
+    player_ids = [char_id for i, char_id in enumerate(ids) if i % 2 == 0]
+    monster_ids = [char_id for i, char_id in enumerate(ids) if i % 2 == 1]
+    random_ids = [(random.choice(ids),) for _ in range(samples + 1)]
+
+    results = {}
+    results["add_character"] = measure(
+        server.add_character, [(Player(5, "knight"),) for _ in range(samples + 1)]
+    )
+    results["get"] = measure(server.get, random_ids)
+    results["get_all"] = measure(server.get_all, [()] * (FULL_SCAN_SAMPLES + 1))
+    results["get_views"] = measure(server.get_views, [()] * (FULL_SCAN_SAMPLES + 1))
+    results["get_all_by_type"] = measure(
+        server.get_all_by_type, [("monster",)] * (FULL_SCAN_SAMPLES + 1)
+    )
+    results["update_character"] = measure(
+        server.update_character,
+        [
+            (random.choice(player_ids), "warrior", random.randint(1, 10))
+            for _ in range(samples // 2)
+        ]
+        + [
+            (random.choice(monster_ids), "elf", "normal")
+            for _ in range(samples - samples // 2 + 1)
+        ],
+    )
+    results["get_server_stats"] = measure(server.get_server_stats, [()] * (samples + 1))
+    results["move_many (1000 moves)"] = measure(
+        server.move_many,
+        [
+            (
+                [
+                    (random.choice(ids), random.randint(0, 10), random.randint(0, 10))
+                    for _ in range(MOVE_BATCH_SIZE)
+                ],
+            )
+            for _ in range(FULL_SCAN_SAMPLES + 1)
+        ],
+    )
+
+    doomed = random.sample(ids, min(len(ids), samples + 1))
+    results["delete_character"] = measure(
+        server.delete_character, [(char_id,) for char_id in doomed]
+    )
+    return results
+
+
+def bench_api(server: CharacterManager, ids: list[int], samples: int) -> dict:
+    """Benchmarks the main server_api routes through the Flask test client.
+    A fresh response cache per request keeps it from answering, so the
+    timings include the database work."""
+    import server_api
+
+    server_api.server = server
+    client = server_api.app.test_client()
+
+    def get(path: str):
+        server_api.response_cache = ResponseCache()
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    # bench_manager deleted at most samples + 1 IDs, so twice that many
+    # candidates leave enough live ones, checked in a single existing_ids call
+    candidates = random.sample(ids, min(len(ids), 2 * (samples + 1)))
+    existing = server.existing_ids(candidates)
+    live_ids = [char_id for char_id in candidates if char_id in existing][: samples + 1]
+    results = {}
+    results["GET /server/characters/<id>"] = measure(
+        get, [(f"/server/characters/{char_id}",) for char_id in live_ids]
+    )
+    results["GET /server/characters/details/<id>"] = measure(
+        get, [(f"/server/characters/details/{char_id}",) for char_id in live_ids]
+    )
+    results["GET /server/serverstats"] = measure(
+        get, [("/server/serverstats",)] * (samples + 1)
+    )
+    for path in (
+        "/server/characters/all",
+        "/server/characters/all_details",
+        "/server/characters/all/player",
+    ):
+        results[f"GET {path}"] = measure(get, [(path,)] * (FULL_SCAN_SAMPLES + 1))
+    results["POST /server/characters"] = measure(
+        lambda: client.post(
+            "/server/characters",
+            json={
+                "type": "monster",
+                "monster_type": "orc",
+                "monster_ai_difficulty": "hard",
+            },
+        ),
+        [()] * (samples + 1),
+    )
+    return results
+
+
+def run_size(
+    size: int, samples: int, workdir: str, engine_profile: EngineProfile
+) -> dict:
+    """Seeds a fresh database with size characters and benchmarks it through
+    an engine built from engine_profile, as the servers build theirs"""
+    db_file = os.path.join(workdir, f"bench_{size}.sqlite")
+    engine = engine_profile.create_engine(db_file)
+    Base.metadata.create_all(engine)
+    server = CharacterManager("BENCH", db_file, engine=engine)
+
+    start = time.perf_counter()
+    ids = server.add_characters(seed_characters(size), batch_size=SEED_BATCH_SIZE)
+    seed_seconds = time.perf_counter() - start
+    print(f"Seeded {size} characters in {seed_seconds:.2f}s", flush=True)
+
+    results = {"seed_seconds": round(seed_seconds, 3)}
+    results["manager"] = bench_manager(server, ids, samples)
+    results["api"] = bench_api(server, ids, samples)
+
+    engine.dispose()
+    # WAL mode keeps -wal and -shm files next to the database
+    for path in (db_file, f"{db_file}-wal", f"{db_file}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns a message for every operation slower than the baseline by more
+    than threshold, on throughput or on p99 latency"""
+    regressions = []
+    for size, groups in results["results"].items():
+        for group in ("manager", "api"):
+            for name, current in groups[group].items():
+                previous = (
+                    baseline.get("results", {}).get(size, {}).get(group, {}).get(name)
+                )
+                if not previous:
+                    continue
+                # measure reports no throughput when the timed calls took no
+                # measurable time, so there is nothing to compare
+                current_ops = current["ops_per_sec"]
+                previous_ops = previous["ops_per_sec"]
+                if (
+                    current_ops is not None
+                    and previous_ops is not None
+                    and current_ops < previous_ops * (1 - threshold)
+                ):
+                    regressions.append(
+                        f"{size} {name}: {current['ops_per_sec']} ops/sec "
+                        f"(baseline {previous['ops_per_sec']})"
+                    )
+                if current["p99_ms"] > previous["p99_ms"] * (1 + threshold):
+                    regressions.append(
+                        f"{size} {name}: p99 {current['p99_ms']} ms "
+                        f"(baseline {previous['p99_ms']} ms)"
+                    )
+    return regressions
+
+
+def print_report(results: dict):
+    """Prints one line per benchmarked operation"""
+    for size, groups in results["results"].items():
+        print(f"\n== {size} characters (seeded in {groups['seed_seconds']}s) ==")
+        for group in ("manager", "api"):
+            for name, metrics in groups[group].items():
+                print(
+                    f"{name:<40} {metrics['ops_per_sec']:>12} ops/s "
+                    f"p50 {metrics['p50_ms']:>10} ms  p99 {metrics['p99_ms']:>10} ms  "
+                    f"peak {metrics['peak_memory_kb']:>10} KiB"
+                )
+
+
+def main():
+    """Runs the benchmarks, writes JSON results and checks them against a baseline"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=1013)
+    profile_defaults = EngineProfile().get_pragmas()
+    parser.add_argument(
+        "--journal-mode",
+        choices=EngineProfile.JOURNAL_MODES,
+        default=profile_defaults["journal_mode"],
+    )
+    parser.add_argument(
+        "--synchronous",
+        choices=EngineProfile.SYNCHRONOUS_MODES,
+        default=profile_defaults["synchronous"],
+    )
+    args = parser.parse_args()
+
+    engine_profile = EngineProfile(
+        journal_mode=args.journal_mode, synchronous=args.synchronous
+    )
+
+    random.seed(args.seed)
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "samples": args.samples,
+            "engine_profile": {
+                **engine_profile.get_pragmas(),
+                **engine_profile.get_pool_settings(),
+            },
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # server_api opens characters.sqlite in the working directory on import
+        previous_dir = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for size in args.sizes:
+                results["results"][str(size)] = run_size(
+                    size, args.samples, workdir, engine_profile
+                )
+        finally:
+            os.chdir(previous_dir)
+
+    print_report(results)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+
+class CharacterCache:
+    """Bounded LRU cache of character snapshots keyed by character ID"""
+
+    MAX_SIZE_LABEL = "Cache Size"
+
+    def __init__(self, max_size: int):
+        """Constructor - Initialize an empty cache holding at most max_size entries.
+        A max_size of 0 disables the cache."""
+
+        if not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise ValueError(f"{self.MAX_SIZE_LABEL} must be an integer.")
+        if max_size < 0:
+            raise ValueError(f"{self.MAX_SIZE_LABEL} cannot be negative.")
+
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._generation = 0
+
+    def is_enabled(self) -> bool:
+        """Returns True if the cache can hold entries."""
+        return self._max_size > 0
+
+    def get(self, char_id: int):
+        """Returns the cached snapshot for char_id, or None on a miss."""
+        if not self.is_enabled():
+            return None
+
+        with self._lock:
+            snapshot = self._entries.get(char_id)
+            if snapshot is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(char_id)
+            self._hits += 1
+            return snapshot
+
+    def get_generation(self) -> int:
+        """Returns a counter bumped by every invalidation. Read it before
+        loading a row from the database and pass it to put."""
+        with self._lock:
+            return self._generation
+
+    def put(self, char_id: int, snapshot, generation: int = None):
+        """Stores a snapshot, evicting the least recently used entry when full.
+        When generation is given and an invalidation happened since, the
+        snapshot may predate a write and is not stored."""
+        if not self.is_enabled():
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[char_id] = snapshot
+            self._entries.move_to_end(char_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, char_id: int):
+        """Drops the snapshot for char_id if it is cached."""
+        with self._lock:
+            self._entries.pop(char_id, None)
+            self._generation += 1
+
+    def clear(self):
+        """Drops every cached snapshot."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def get_stats(self) -> dict:
+        """Returns the cache size, capacity and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -1,11 +1,46 @@
+import threading
+from collections import deque
+from itertools import islice
+
 from abstract_character import AbstractCharacter
 from player import Player
 from monster import Monster
 from server_stats import ServerStats
+from server_stats_counter import ServerStatsCounter
+from data_version import DataVersion
+from character_cache import CharacterCache
+from engine_profile import EngineProfile
+from stat_tables import StatTables, get_stat_tables, set_stat_tables
+from spatial_index import SpatialGridIndex
+from character_snapshot import CharacterSnapshot
+from character_view import CharacterView
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import class_mapper, sessionmaker, Session
+
+
+def _chunked(iterable, size: int):
+    """Yields lists of at most size items from any iterable, lazily."""
+
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 class CharacterManager:
@@ -18,11 +53,66 @@ class CharacterManager:
     JOB_TYPE_LABEL = "Job/Type"
     LEVEL_LABEL = "Level"
     DIFFICULTY_LABEL = "Difficulty"
+    BATCH_SIZE_LABEL = "Batch Size"
+    PAGE_SIZE_LABEL = "Page Size"
+    AFTER_ID_LABEL = "After ID"
+    CHUNK_SIZE_LABEL = "Chunk Size"
+    RADIUS_LABEL = "Radius"
+    COUNT_LABEL = "Count"
+    IDS_LABEL = "IDs"
+    OPERATIONS_LABEL = "Operations"
+    BATCH_OPERATIONS = ["create", "update", "delete"]
+    FILTER_LABEL = "Filter"
+    FILTER_COLUMNS = [
+        "type",
+        "job",
+        "player_level",
+        "monster_type",
+        "monster_ai_difficulty",
+        "alive",
+    ]
+    # Equality filters on these columns take integers or booleans; the rest strings
+    INTEGER_FILTER_COLUMNS = ["player_level"]
+    BOOLEAN_FILTER_COLUMNS = ["alive"]
+    # Each range column accepts inclusive min_<column> and max_<column> filters
+    RANGE_FILTER_COLUMNS = ["player_level", "health", "damage", "x", "y"]
+    PLAYER_ONLY_COLUMNS = ["job", "player_level"]
+    MONSTER_ONLY_COLUMNS = ["monster_type", "monster_ai_difficulty"]
+    SORT_LABEL = "Sort"
+    SORT_COLUMNS = [
+        "id",
+        "job",
+        "player_level",
+        "monster_type",
+        "monster_ai_difficulty",
+        "health",
+        "damage",
+        "x",
+        "y",
+    ]
+    LIMIT_LABEL = "Limit"
+    CHANGE_LOG_SIZE = 1000
+    CHANGE_LOG_MAX_IDS = 10000
 
-    def __init__(self, server_name: str, db_filename: str, engine: Engine = None):
+    def __init__(
+        self,
+        server_name: str,
+        db_filename: str,
+        engine: Engine = None,
+        cache_size: int = 0,
+        engine_profile: EngineProfile = None,
+        spatial_cell_size: int = None,
+    ):
         """
         Constructor - Initializes the CharacterManager with a server name
         and sets up the database connection.
+        Without an explicit engine, one is created from engine_profile
+        (default: EngineProfile(), i.e. WAL with a thread-safe pool).
+        A positive cache_size keeps that many characters in an LRU cache for get().
+        The spatial index splits the map into cells of spatial_cell_size
+        (default: 1/64 of the map width). The map size is process-wide:
+        call AbstractCharacter.set_world_bounds at startup, before any
+        manager is created.
         """
 
         # Validate server_name
@@ -37,11 +127,84 @@ class CharacterManager:
             raise ValueError("Database Name must be a string.")
         self._db_filename = db_filename
 
+        if engine_profile is not None and not isinstance(engine_profile, EngineProfile):
+            raise ValueError("Engine Profile must be an instance of EngineProfile.")
+
         if engine:
             self._engine = engine
         else:
-            self._engine = create_engine(f"sqlite:///{db_filename}")
+            self._engine = (engine_profile or EngineProfile()).create_engine(
+                db_filename
+            )
         self._db_session_factory = sessionmaker(bind=self._engine)
+        # Sessions that write take the write lock when they begin (see EngineProfile)
+        self._write_session_factory = sessionmaker(
+            bind=self._engine.execution_options(**{EngineProfile.WRITE_OPTION: True})
+        )
+
+        self._ensure_schema()
+
+        self._character_cache = CharacterCache(cache_size)
+
+        self._data_version = 0
+        self._data_version_lock = threading.Lock()
+        self._change_log = deque(maxlen=self.CHANGE_LOG_SIZE)
+
+        if spatial_cell_size is None:
+            min_range, max_range = AbstractCharacter.get_world_bounds()
+            spatial_cell_size = max(1, (max_range - min_range) // 64)
+        self._spatial_cell_size = spatial_cell_size
+        SpatialGridIndex(spatial_cell_size)  # validates the cell size up front
+        self._spatial_index = None
+        self._spatial_index_lock = threading.Lock()
+
+    def get_engine_settings(self) -> dict:
+        """
+        Returns the settings in effect on a pooled connection, as reported
+        by SQLite itself, together with the pool sizing.
+        """
+
+        settings = {}
+        with self._engine.connect() as connection:
+            for name in EngineProfile.PRAGMA_NAMES:
+                settings[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+        settings["synchronous"] = EngineProfile.SYNCHRONOUS_MODES[
+            settings["synchronous"]
+        ]
+        settings["temp_store"] = EngineProfile.TEMP_STORE_MODES[settings["temp_store"]]
+
+        pool = self._engine.pool
+        settings["pool_class"] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            settings["pool_size"] = pool.size()
+            settings["pool_checked_out"] = pool.checkedout()
+        return settings
+
+    def _ensure_schema(self):
+        """
+        Private helper bringing databases created by older schema scripts up to date.
+        The counters table is created if missing, as are the characters
+        indexes, and missing counter rows are seeded from the characters table
+        so that reading the stats does not have to write. The data version
+        table gets its single row.
+        """
+
+        ServerStatsCounter.__table__.create(self._engine, checkfirst=True)
+        DataVersion.__table__.create(self._engine, checkfirst=True)
+        with self._engine.begin() as connection:
+            connection.execute(
+                sqlite_insert(DataVersion.__table__)
+                .values(id=DataVersion.ROW_ID, version=0)
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+
+        if inspect(self._engine).has_table(AbstractCharacter.__tablename__):
+            for index in AbstractCharacter.__table__.indexes:
+                index.create(self._engine, checkfirst=True)
+            with self._db_session_factory() as session:
+                counters = self._read_stats_counters(session)
+            self._seed_missing_stats_counters(counters)
 
     def _validate_non_empty_string(self, display_name: str, value):
         """Private helper to validate that a value is a non-empty string."""
@@ -63,8 +226,15 @@ class CharacterManager:
         if not isinstance(id_value, int):
             raise ValueError(f"{display_name} needs to be an integer.")
 
-    def add_character(self, character_obj: AbstractCharacter):
-        """Adds a character object to the database."""
+    def _validate_positive_integer(self, display_name: str, value):
+        """Private helper to validate that a value is a positive integer."""
+
+        self._validate_integer_id(display_name, value)
+        if value < 1:
+            raise ValueError(f"{display_name} must be a positive integer.")
+
+    def _validate_character_object(self, character_obj):
+        """Private helper to validate a character object before it is stored."""
 
         if character_obj is None:
             raise ValueError("Character Object cannot be undefined.")
@@ -73,44 +243,326 @@ class CharacterManager:
                 "Invalid Character Object: Must be an instance of AbstractCharacter or its subclass."
             )
 
-        with self._db_session_factory() as session:
-            session.add(character_obj)
-            session.flush()
-            session.commit()
+    def add_character(self, character_obj: AbstractCharacter) -> int:
+        """Adds a character object to the database and returns its new ID."""
+
+        self._validate_character_object(character_obj)
+
+        with self._write_session_factory() as session:
+            position = self._add_in_session(session, character_obj)
+            version = self._commit_write(session)
+
+        self._record_write([position[0]], version)
+        self._sync_spatial_index(upserts=[position])
+        return position[0]
+
+    def _add_in_session(
+        self, session: Session, character_obj: AbstractCharacter
+    ) -> tuple:
+        """
+        Private helper inserting one character inside the caller's transaction,
+        together with its server stats counter delta.
+        Returns its (id, x, y, type) for the spatial index.
+        """
+
+        session.add(character_obj)
+        session.flush()
+        self._apply_stats_delta(
+            session,
+            character_obj.type,
+            1,
+            *self._stats_values(
+                character_obj.type,
+                getattr(character_obj, "player_level", None),
+                getattr(character_obj, "monster_ai_difficulty", None),
+            ),
+        )
+        return (
+            character_obj.id,
+            character_obj.x,
+            character_obj.y,
+            character_obj.type,
+        )
+
+    def add_characters(self, characters, batch_size: int = 1000) -> list[int]:
+        """
+        Adds many character objects using one multi-row INSERT and one
+        transaction per batch, and returns the new IDs in input order.
+        characters may be any iterable, including a generator; only one batch
+        is held in memory. Batches before an invalid object stay committed.
+        """
+
+        if characters is None:
+            raise ValueError("Characters cannot be undefined (None).")
+        self._validate_positive_integer(self.BATCH_SIZE_LABEL, batch_size)
+
+        table = AbstractCharacter.__table__
+        columns = [column.key for column in table.columns if column.key != "id"]
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+
+        new_ids = []
+        for batch in _chunked(characters, batch_size):
+            rows = []
+            deltas = {}
+            for character_obj in batch:
+                self._validate_character_object(character_obj)
+                row = {key: getattr(character_obj, key, None) for key in columns}
+                rows.append(row)
+
+                level, score = self._stats_values(
+                    row["type"], row["player_level"], row["monster_ai_difficulty"]
+                )
+                count_delta, level_delta, score_delta = deltas.get(
+                    row["type"], (0, 0, 0)
+                )
+                deltas[row["type"]] = (
+                    count_delta + 1,
+                    level_delta + level,
+                    score_delta + score,
+                )
+
+            with self._write_session_factory() as session:
+                batch_ids = session.execute(statement, rows).scalars().all()
+                for char_type, delta in deltas.items():
+                    self._apply_stats_delta(session, char_type, *delta)
+                version = self._commit_write(session)
+
+            new_ids.extend(batch_ids)
+            self._record_write(batch_ids, version)
+            self._sync_spatial_index(
+                upserts=[
+                    (char_id, row["x"], row["y"], row["type"])
+                    for char_id, row in zip(batch_ids, rows)
+                ]
+            )
+
+        return new_ids
 
     def character_exists(self, char_id: int) -> bool:
-        """Checks if a character with the given ID exists in the database."""
+        """
+        Checks if a character with the given ID exists in the database.
+        Runs SELECT EXISTS(...) on the primary key without building an entity.
+        """
 
         self._validate_integer_id(self.ID_LABEL, char_id)
 
+        characters = AbstractCharacter.__table__
         with self._db_session_factory() as session:
-            character = session.execute(
-                select(AbstractCharacter).filter(AbstractCharacter.id == char_id)
-            ).scalar_one_or_none()
+            return session.execute(
+                select(exists().where(characters.c.id == char_id))
+            ).scalar()
+
+    def existing_ids(self, ids: list[int], chunk_size: int = 500) -> set[int]:
+        """
+        Returns the subset of ids that exist in the database, checked with
+        one primary-key IN query per chunk of chunk_size IDs.
+        """
 
-        return character is not None
+        ids = self._validate_id_list(ids)
+        self._validate_positive_integer(self.CHUNK_SIZE_LABEL, chunk_size)
+
+        with self._db_session_factory() as session:
+            return self._existing_in_session(session, ids, chunk_size)
+
+    @staticmethod
+    def _existing_in_session(session: Session, ids: list[int], chunk_size: int) -> set:
+        """Private helper returning the subset of ids that exist, in the caller's session."""
+
+        characters = AbstractCharacter.__table__
+        found = set()
+        for chunk in _chunked(dict.fromkeys(ids), chunk_size):
+            found.update(
+                session.execute(
+                    select(characters.c.id).where(characters.c.id.in_(chunk))
+                ).scalars()
+            )
+        return found
 
     def get(self, char_id: int) -> AbstractCharacter:
         """
         Retrieves a character object by ID from the database.
-        Attempts to load as Player then Monster if type is ambiguous.
+        A single polymorphic load returns a Player or Monster; when the cache
+        is enabled, hits are served from a detached snapshot instead.
         """
 
         self._validate_integer_id(self.ID_LABEL, char_id)
 
-        with self._db_session_factory() as session:
-            character = session.execute(
-                select(Player).filter(Player.id == char_id)
-            ).scalar_one_or_none()
+        if self._character_cache.is_enabled():
+            self._sync_data_version()
+        snapshot = self._character_cache.get(char_id)
+        if snapshot is not None:
+            return self._restore_snapshot(snapshot)
 
-            if character is None:
-                character = session.execute(
-                    select(Monster).filter(Monster.id == char_id)
-                ).scalar_one_or_none()
+        # The put is skipped if a write invalidates the cache during the load
+        generation = self._character_cache.get_generation()
+        with self._db_session_factory() as session:
+            character = session.get(AbstractCharacter, char_id)
 
         if character is None:
             raise ValueError(f"Character with ID {char_id} does not exist.")
 
+        self._character_cache.put(char_id, self._take_snapshot(character), generation)
+        return character
+
+    def get_many(self, ids: list[int], chunk_size: int = 500) -> list:
+        """
+        Retrieves many characters by ID and returns them in request order,
+        with None in place of each ID that does not exist. Cache hits are
+        served from snapshots; the rest is loaded with one polymorphic
+        WHERE id IN (...) query per chunk of chunk_size IDs.
+        """
+
+        ids = self._validate_id_list(ids)
+        self._validate_positive_integer(self.CHUNK_SIZE_LABEL, chunk_size)
+
+        if self._character_cache.is_enabled():
+            self._sync_data_version()
+        found = {}
+        misses = []
+        for char_id in dict.fromkeys(ids):
+            snapshot = self._character_cache.get(char_id)
+            if snapshot is not None:
+                found[char_id] = self._restore_snapshot(snapshot)
+            else:
+                misses.append(char_id)
+
+        generation = self._character_cache.get_generation()
+        for character in self._load_characters(misses, chunk_size):
+            found[character.id] = character
+            self._character_cache.put(
+                character.id, self._take_snapshot(character), generation
+            )
+
+        return [found.get(char_id) for char_id in ids]
+
+    def get_data_version(self) -> int:
+        """
+        Returns a counter stored in the database that increases with every
+        committed write made through any CharacterManager on it, including
+        other processes, so derived data can be cached per version.
+        """
+
+        return self._sync_data_version()
+
+    def _commit_write(self, session: Session) -> int:
+        """
+        Private helper incrementing the database data version inside the
+        caller's write transaction, committing it, and returning the new version.
+        """
+
+        versions = DataVersion.__table__
+        version = session.execute(
+            sqlite_insert(versions)
+            .values(id=DataVersion.ROW_ID, version=1)
+            .on_conflict_do_update(
+                index_elements=["id"], set_={"version": versions.c.version + 1}
+            )
+            .returning(versions.c.version)
+        ).scalar_one()
+        session.commit()
+        return version
+
+    def _sync_data_version(self) -> int:
+        """
+        Private helper reading the database data version. A version this
+        manager has not seen means another process wrote: every cached
+        snapshot and the spatial index are dropped, since the changed IDs
+        are unknown.
+        """
+
+        versions = DataVersion.__table__
+        with self._engine.connect() as connection:
+            version = connection.execute(
+                select(versions.c.version).where(versions.c.id == DataVersion.ROW_ID)
+            ).scalar_one_or_none()
+        version = version or 0
+
+        with self._data_version_lock:
+            unseen = version > self._data_version
+            if unseen:
+                self._data_version = version
+                self._change_log.append((version, None))
+        if unseen:
+            self._drop_derived_state()
+        return version
+
+    def _drop_derived_state(self):
+        """Private helper dropping every cached snapshot and the spatial index."""
+
+        self._character_cache.clear()
+        with self._spatial_index_lock:
+            self._spatial_index = None
+
+    def _record_write(self, char_ids: list[int], version: int):
+        """
+        Private helper run after a write commits at version: drops cached
+        snapshots of the given IDs (every snapshot when None) and logs the
+        changed IDs under version for incremental snapshot refresh. If another
+        process wrote since the last known version, everything is dropped.
+        """
+
+        # Writes touching too many rows are logged as None (reload everything)
+        logged_ids = (
+            tuple(char_ids)
+            if char_ids is not None and len(char_ids) <= self.CHANGE_LOG_MAX_IDS
+            else None
+        )
+        with self._data_version_lock:
+            unseen = version > self._data_version + 1
+            if version > self._data_version:
+                self._data_version = version
+                self._change_log.append((version, None if unseen else logged_ids))
+
+        if unseen:
+            self._drop_derived_state()
+        elif char_ids is None:
+            self._character_cache.clear()
+        else:
+            for char_id in char_ids:
+                self._character_cache.invalidate(char_id)
+
+    def _changed_ids_since(self, version: int) -> set[int]:
+        """
+        Private helper returning the IDs written after version, or None when
+        the change log no longer covers that range (or a write was unbounded).
+        """
+
+        changed = set()
+        with self._data_version_lock:
+            if version == self._data_version:
+                return changed
+            if not self._change_log or self._change_log[0][0] > version + 1:
+                return None
+            for logged_version, logged_ids in self._change_log:
+                if logged_version <= version:
+                    continue
+                if logged_ids is None:
+                    return None
+                changed.update(logged_ids)
+        return changed
+
+    def get_cache_stats(self) -> dict:
+        """Returns the size, capacity and hit/miss counters of the character cache."""
+
+        return self._character_cache.get_stats()
+
+    @staticmethod
+    def _take_snapshot(character: AbstractCharacter) -> tuple:
+        """Private helper capturing a character's class and column values."""
+
+        mapper = class_mapper(type(character))
+        return type(character), {
+            attr.key: getattr(character, attr.key) for attr in mapper.column_attrs
+        }
+
+    @staticmethod
+    def _restore_snapshot(snapshot: tuple) -> AbstractCharacter:
+        """Private helper building a new detached-style character from a snapshot."""
+
+        character_class, values = snapshot
+        character = class_mapper(character_class).class_manager.new_instance()
+        for key, value in values.items():
+            setattr(character, key, value)
         return character
 
     def get_all(self) -> list[AbstractCharacter]:
@@ -125,71 +577,1011 @@ class CharacterManager:
     def get_all_by_type(self, character_type: str) -> list[AbstractCharacter]:
         """Returns a list of characters filtered by type ('player' or 'monster')."""
 
-        self._validate_non_empty_string("Character type", character_type)
-        if character_type not in [Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE]:
-            raise ValueError("Character type must be either 'player' or 'monster'.")
+        character_class = self._get_character_class(character_type)
 
         with self._db_session_factory() as session:
-            if character_type == Player.CHARACTER_TYPE:
-                characters = session.execute(select(Player)).scalars().all()
-            elif character_type == Monster.CHARACTER_TYPE:
-                characters = session.execute(select(Monster)).scalars().all()
-            else:
-                characters = []
+            characters = session.execute(select(character_class)).scalars().all()
         return characters
 
+    def iter_all(
+        self, character_type: str = None, after_id: int = None, page_size: int = 1000
+    ):
+        """
+        Returns an iterator over characters in ID order, optionally of one type
+        and starting after a given ID. Rows are fetched one keyset page
+        (WHERE id > ? ORDER BY id LIMIT ?) per short-lived session and streamed
+        with yield_per, so memory stays bounded by page_size.
+        """
+
+        character_class = (
+            AbstractCharacter
+            if character_type is None
+            else self._get_character_class(character_type)
+        )
+        if after_id is not None:
+            self._validate_integer_id(self.AFTER_ID_LABEL, after_id)
+        self._validate_positive_integer(self.PAGE_SIZE_LABEL, page_size)
+
+        return self._iter_pages(character_class, after_id, page_size)
+
+    def get_page(
+        self, character_type: str = None, after_id: int = None, page_size: int = 100
+    ) -> tuple[list[AbstractCharacter], int]:
+        """
+        Returns one keyset page of characters in ID order and the cursor for
+        the next page, which is None once the last page has been returned.
+        """
+
+        character_class = (
+            AbstractCharacter
+            if character_type is None
+            else self._get_character_class(character_type)
+        )
+        if after_id is not None:
+            self._validate_integer_id(self.AFTER_ID_LABEL, after_id)
+        self._validate_positive_integer(self.PAGE_SIZE_LABEL, page_size)
+
+        with self._db_session_factory() as session:
+            characters = (
+                session.execute(
+                    self._page_statement(character_class, after_id, page_size + 1)
+                )
+                .scalars()
+                .all()
+            )
+
+        if len(characters) > page_size:
+            characters = characters[:page_size]
+            return characters, characters[-1].id
+        return characters, None
+
+    def _get_character_class(self, character_type: str):
+        """Private helper validating a character type and returning its mapped class."""
+
+        self._validate_non_empty_string("Character type", character_type)
+        if character_type == Player.CHARACTER_TYPE:
+            return Player
+        if character_type == Monster.CHARACTER_TYPE:
+            return Monster
+        raise ValueError("Character type must be either 'player' or 'monster'.")
+
+    @staticmethod
+    def _page_statement(character_class, after_id: int, limit: int):
+        """Private helper building a keyset page query ordered by ID."""
+
+        statement = select(character_class).order_by(character_class.id).limit(limit)
+        if after_id is not None:
+            statement = statement.where(character_class.id > after_id)
+        return statement
+
+    def _iter_pages(self, character_class, after_id: int, page_size: int):
+        """Private generator walking keyset pages until a short page is returned."""
+
+        while True:
+            fetched = 0
+            with self._db_session_factory() as session:
+                result = session.execute(
+                    self._page_statement(
+                        character_class, after_id, page_size
+                    ).execution_options(yield_per=page_size)
+                ).scalars()
+                for character in result:
+                    fetched += 1
+                    after_id = character.id
+                    yield character
+
+            if fetched < page_size:
+                return
+
+    def get_view(self, char_id: int) -> CharacterView:
+        """Returns a read-only view of one character by ID, loaded without the ORM."""
+
+        self._validate_integer_id(self.ID_LABEL, char_id)
+
+        characters = AbstractCharacter.__table__
+        with self._engine.connect() as connection:
+            row = connection.execute(
+                self._view_statement().where(characters.c.id == char_id)
+            ).first()
+
+        if row is None:
+            raise ValueError(f"Character with ID {char_id} does not exist.")
+        return CharacterView._make(row)
+
+    def get_views(self, character_type: str = None) -> list[CharacterView]:
+        """
+        Returns read-only views of all characters, or of one type, built from
+        Core rows without ORM instances. Like get_all, players come first.
+        """
+
+        character_types = (
+            [Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE]
+            if character_type is None
+            else [self._get_character_class(character_type).CHARACTER_TYPE]
+        )
+
+        characters = AbstractCharacter.__table__
+        views = []
+        with self._engine.connect() as connection:
+            for char_type in character_types:
+                views.extend(
+                    map(
+                        CharacterView._make,
+                        connection.execute(
+                            self._view_statement().where(characters.c.type == char_type)
+                        ),
+                    )
+                )
+        return views
+
+    def iter_views(
+        self, character_type: str = None, after_id: int = None, page_size: int = 1000
+    ):
+        """
+        Returns an iterator over read-only views in ID order, paged like
+        iter_all but built from Core rows without ORM instances.
+        """
+
+        if character_type is not None:
+            self._get_character_class(character_type)
+        if after_id is not None:
+            self._validate_integer_id(self.AFTER_ID_LABEL, after_id)
+        self._validate_positive_integer(self.PAGE_SIZE_LABEL, page_size)
+
+        return self._iter_view_pages(character_type, after_id, page_size)
+
+    def find_characters(
+        self, filters: dict = None, sort: list[str] = None, limit: int = None
+    ) -> list[CharacterView]:
+        """
+        Returns read-only views of the characters matching filters, ordered by
+        sort and cut at limit, all evaluated in SQL. For example the top 20
+        level-10 knights by health:
+            find_characters({"job": "knight", "player_level": 10}, ["-health"], 20)
+        Without filters every character matches; without sort, ID order is used.
+        """
+
+        statement = self._view_statement()
+        if filters is not None:
+            statement = statement.where(*self._build_filter_conditions(filters))
+        if sort is not None:
+            statement = statement.order_by(None).order_by(*self._build_sort_order(sort))
+        if limit is not None:
+            self._validate_positive_integer(self.LIMIT_LABEL, limit)
+            statement = statement.limit(limit)
+
+        with self._engine.connect() as connection:
+            return list(map(CharacterView._make, connection.execute(statement)))
+
+    @staticmethod
+    def _view_statement():
+        """Private helper selecting the CharacterView columns in ID order."""
+
+        characters = AbstractCharacter.__table__
+        return select(*(characters.c[name] for name in CharacterView._fields)).order_by(
+            characters.c.id
+        )
+
+    def _iter_view_pages(self, character_type: str, after_id: int, page_size: int):
+        """Private generator walking keyset pages of views until a short page."""
+
+        characters = AbstractCharacter.__table__
+        statement = self._view_statement().limit(page_size)
+        if character_type is not None:
+            statement = statement.where(characters.c.type == character_type)
+
+        while True:
+            page_statement = statement
+            if after_id is not None:
+                page_statement = statement.where(characters.c.id > after_id)
+            with self._engine.connect() as connection:
+                views = list(
+                    map(CharacterView._make, connection.execute(page_statement))
+                )
+
+            yield from views
+            if len(views) < page_size:
+                return
+            after_id = views[-1].id
+
+    def snapshot(self) -> CharacterSnapshot:
+        """
+        Returns a columnar snapshot of every character for analytics, built
+        from plain rows without creating ORM objects.
+        """
+
+        return self.refresh_snapshot(CharacterSnapshot())
+
+    def refresh_snapshot(
+        self, snapshot: CharacterSnapshot, chunk_size: int = 500
+    ) -> CharacterSnapshot:
+        """
+        Brings a snapshot up to date and returns it. Only rows written since
+        the snapshot's version are re-read; the whole table is reloaded when
+        the in-process change log does not reach back that far.
+        """
+
+        if not isinstance(snapshot, CharacterSnapshot):
+            raise ValueError("Snapshot must be an instance of CharacterSnapshot.")
+        self._validate_positive_integer(self.CHUNK_SIZE_LABEL, chunk_size)
+
+        characters = AbstractCharacter.__table__
+        statement = select(
+            *(characters.c[name] for name in CharacterSnapshot.ROW_FIELDS)
+        ).order_by(characters.c.id)
+
+        # Read the version first: rows written meanwhile are fetched again next time
+        version = self._sync_data_version()
+        changed_ids = (
+            None
+            if snapshot.get_version() is None
+            else self._changed_ids_since(snapshot.get_version())
+        )
+
+        with self._db_session_factory() as session:
+            if changed_ids is None:
+                snapshot.load(
+                    session.execute(
+                        statement.execution_options(yield_per=10000)
+                    ).tuples(),
+                    version,
+                )
+                return snapshot
+
+            rows = []
+            for chunk in _chunked(changed_ids, chunk_size):
+                rows.extend(
+                    session.execute(
+                        statement.where(characters.c.id.in_(chunk))
+                    ).tuples()
+                )
+        snapshot.apply_changes(changed_ids, rows, version)
+        return snapshot
+
+    def characters_in_rect(
+        self,
+        min_x: int,
+        min_y: int,
+        max_x: int,
+        max_y: int,
+        character_type: str = None,
+    ) -> list[AbstractCharacter]:
+        """
+        Returns the characters inside the inclusive rectangle, in ID order,
+        optionally of one type. Only grid cells overlapping the rectangle are
+        visited, then the matches are loaded by ID.
+        """
+
+        for label, value in (
+            ("Minimum X", min_x),
+            ("Minimum Y", min_y),
+            ("Maximum X", max_x),
+            ("Maximum Y", max_y),
+        ):
+            self._validate_integer_id(label, value)
+        if min_x > max_x or min_y > max_y:
+            raise ValueError("Minimum X/Y cannot be greater than Maximum X/Y.")
+        self._validate_spatial_type(character_type)
+
+        char_ids = self._get_spatial_index().in_rect(
+            min_x, min_y, max_x, max_y, character_type
+        )
+        return self._load_characters(char_ids)
+
+    def characters_within_radius(
+        self, x: int, y: int, radius: int, character_type: str = None
+    ) -> list[AbstractCharacter]:
+        """
+        Returns the characters within radius of (x, y), nearest first,
+        optionally of one type.
+        """
+
+        self._validate_integer_id(AbstractCharacter.X_LABEL, x)
+        self._validate_integer_id(AbstractCharacter.Y_LABEL, y)
+        self._validate_integer_id(self.RADIUS_LABEL, radius)
+        if radius < 0:
+            raise ValueError(f"{self.RADIUS_LABEL} cannot be negative.")
+        self._validate_spatial_type(character_type)
+
+        char_ids = self._get_spatial_index().within_radius(x, y, radius, character_type)
+        return self._load_characters(char_ids)
+
+    def nearest(
+        self, k: int, x: int, y: int, character_type: str = None
+    ) -> list[AbstractCharacter]:
+        """
+        Returns up to k characters closest to (x, y), nearest first (ties by
+        ID), optionally of one type.
+        """
+
+        self._validate_positive_integer(self.COUNT_LABEL, k)
+        self._validate_integer_id(AbstractCharacter.X_LABEL, x)
+        self._validate_integer_id(AbstractCharacter.Y_LABEL, y)
+        self._validate_spatial_type(character_type)
+
+        char_ids = self._get_spatial_index().nearest(k, x, y, character_type)
+        return self._load_characters(char_ids)
+
+    def _validate_spatial_type(self, character_type: str):
+        """Private helper validating the optional type filter of a spatial query."""
+
+        if character_type is not None:
+            self._get_character_class(character_type)
+
+    def _get_spatial_index(self) -> SpatialGridIndex:
+        """
+        Private helper returning the spatial index, building it from the
+        positions in the database on first use, or again after another
+        process wrote.
+        """
+
+        self._sync_data_version()
+        with self._spatial_index_lock:
+            if self._spatial_index is None:
+                characters = AbstractCharacter.__table__
+                spatial_index = SpatialGridIndex(self._spatial_cell_size)
+                with self._db_session_factory() as session:
+                    rows = session.execute(
+                        select(
+                            characters.c.id,
+                            characters.c.x,
+                            characters.c.y,
+                            characters.c.type,
+                        )
+                    )
+                    for char_id, x, y, char_type in rows:
+                        spatial_index.upsert(char_id, x, y, char_type)
+                self._spatial_index = spatial_index
+            return self._spatial_index
+
+    def _sync_spatial_index(self, upserts: list = (), removals: list[int] = ()):
+        """
+        Private helper applying committed position changes to the spatial index.
+        upserts holds (id, x, y, type) tuples. Nothing is done before the index
+        is built, since the build reads the committed rows anyway.
+        """
+
+        with self._spatial_index_lock:
+            if self._spatial_index is None:
+                return
+            for char_id in removals:
+                self._spatial_index.remove(char_id)
+            for char_id, x, y, char_type in upserts:
+                self._spatial_index.upsert(char_id, x, y, char_type)
+
+    def _load_characters(
+        self, char_ids: list[int], chunk_size: int = 500
+    ) -> list[AbstractCharacter]:
+        """
+        Private helper loading characters by ID with one polymorphic IN query
+        per chunk, returned in the order of char_ids. Missing IDs are skipped.
+        """
+
+        loaded = {}
+        with self._db_session_factory() as session:
+            for chunk in _chunked(char_ids, chunk_size):
+                for character in session.execute(
+                    select(AbstractCharacter).where(AbstractCharacter.id.in_(chunk))
+                ).scalars():
+                    loaded[character.id] = character
+        return [loaded[char_id] for char_id in char_ids if char_id in loaded]
+
     def update_character(
         self, char_id: int, type_specific_param1, type_specific_param2
-    ):
+    ) -> int:
         """
         Updates an existing character's job/type and level/difficulty.
         The exact parameters (job_type, level_difficulty) depend on the character's type.
+        Health and damage are derived once and written with a single
+        UPDATE ... WHERE id = ? AND type = ?; returns the affected row count.
         """
 
         self._validate_integer_id(self.ID_LABEL, char_id)
 
-        character = self.get(char_id)
+        with self._write_session_factory() as session:
+            row_count = self._update_in_session(
+                session, char_id, type_specific_param1, type_specific_param2
+            )
+            version = self._commit_write(session)
 
-        with self._db_session_factory() as session:
-            if character.type == Player.CHARACTER_TYPE:
-                self._validate_non_empty_string(
-                    self.JOB_TYPE_LABEL, type_specific_param1
+        self._record_write([char_id], version)
+        return row_count
+
+    def _update_in_session(
+        self, session: Session, char_id: int, type_specific_param1, type_specific_param2
+    ) -> int:
+        """
+        Private helper validating and applying one update inside the caller's
+        transaction, together with its server stats counter delta.
+        Only the (immutable) type is read beforehand; the old counted values
+        are read by the counter UPDATE itself. That UPDATE is the first write,
+        so it opens the write transaction and no other writer can change the
+        row between the counter delta and the row update.
+        """
+
+        characters = AbstractCharacter.__table__
+        char_type = session.execute(
+            select(characters.c.type).where(characters.c.id == char_id)
+        ).scalar_one_or_none()
+
+        if char_type is None:
+            raise ValueError(f"Character with ID {char_id} does not exist.")
+
+        values = self._get_update_values(
+            char_type, type_specific_param1, type_specific_param2
+        )
+
+        old_level, old_score = self._stored_stats_values(char_id, char_type)
+        new_level, new_score = self._stats_values(
+            char_type, values.get("player_level"), values.get("monster_ai_difficulty")
+        )
+        counters = ServerStatsCounter.__table__
+        counted = session.execute(
+            update(counters)
+            .where(counters.c.character_type == char_type)
+            .values(
+                total_player_level=counters.c.total_player_level
+                + (new_level - old_level),
+                total_monster_difficulty_score=counters.c.total_monster_difficulty_score
+                + (new_score - old_score),
+            )
+        ).rowcount
+
+        result = session.execute(
+            update(characters)
+            .where(characters.c.id == char_id, characters.c.type == char_type)
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            raise ValueError(f"Character with ID {char_id} does not exist.")
+
+        if not counted:
+            # Seeds the missing counter row from the updated characters table
+            self._apply_stats_delta(session, char_type, 0, 0, 0)
+        return result.rowcount
+
+    @staticmethod
+    def _stored_stats_values(char_id: int, char_type: str) -> tuple:
+        """
+        Private helper returning SQL expressions for a stored character's
+        (level, difficulty score) contribution, mirroring _stats_values.
+        """
+
+        characters = AbstractCharacter.__table__
+        if char_type == Player.CHARACTER_TYPE:
+            column = func.coalesce(characters.c.player_level, 0)
+            return select(column).where(characters.c.id == char_id).scalar_subquery(), 0
+        if char_type == Monster.CHARACTER_TYPE:
+            column = case(
+                Monster.MONSTER_AI_DIFFICULTY_SCORE,
+                value=characters.c.monster_ai_difficulty,
+                else_=0,
+            )
+            return 0, select(column).where(characters.c.id == char_id).scalar_subquery()
+        return 0, 0
+
+    def _get_update_values(
+        self, char_type: str, type_specific_param1, type_specific_param2
+    ) -> dict:
+        """Private helper validating update parameters and deriving the new column values."""
+
+        if char_type == Player.CHARACTER_TYPE:
+            self._validate_non_empty_string(self.JOB_TYPE_LABEL, type_specific_param1)
+            self._validate_integer_id(self.LEVEL_LABEL, type_specific_param2)
+            Player._validate_job_input(type_specific_param1)
+            Player._validate_player_level_input(type_specific_param2)
+
+            job = type_specific_param1.lower()
+            health, damage = Player.calculate_stats(job, type_specific_param2)
+            return {
+                "job": job,
+                "player_level": type_specific_param2,
+                "health": health,
+                "damage": damage,
+            }
+
+        if char_type == Monster.CHARACTER_TYPE:
+            self._validate_non_empty_string(self.JOB_TYPE_LABEL, type_specific_param1)
+            self._validate_non_empty_string(self.DIFFICULTY_LABEL, type_specific_param2)
+            Monster._validate_monster_type_input(type_specific_param1)
+            Monster._validate_monster_ai_difficulty_input(type_specific_param2)
+
+            monster_type = type_specific_param1.lower()
+            difficulty = type_specific_param2.lower()
+            health, damage = Monster.calculate_stats(monster_type, difficulty)
+            return {
+                "monster_type": monster_type,
+                "monster_ai_difficulty": difficulty,
+                "health": health,
+                "damage": damage,
+            }
+
+        raise ValueError("Unsupported character type for update.")
+
+    def move_many(self, moves, chunk_size: int = 500) -> int:
+        """
+        Moves many characters at once from (id, x, y) triples and returns the
+        number of characters moved. Every position is validated against the
+        world bounds and every ID must exist before anything is written; the
+        moves are then applied with one executemany UPDATE in a single
+        transaction. When an ID appears more than once, its last move wins.
+        """
+
+        if not isinstance(moves, (list, tuple)):
+            raise ValueError("Moves must be a list of [id, x, y] entries.")
+        self._validate_positive_integer(self.CHUNK_SIZE_LABEL, chunk_size)
+
+        positions = {}
+        for move in moves:
+            if not isinstance(move, (list, tuple)) or len(move) != 3:
+                raise ValueError("Each move must be an [id, x, y] entry.")
+            char_id, x, y = move
+            self._validate_integer_id(self.ID_LABEL, char_id)
+            AbstractCharacter._validate_position_input(AbstractCharacter.X_LABEL, x)
+            AbstractCharacter._validate_position_input(AbstractCharacter.Y_LABEL, y)
+            positions.pop(char_id, None)
+            positions[char_id] = (x, y)
+
+        if not positions:
+            return 0
+
+        characters = AbstractCharacter.__table__
+        statement = (
+            update(characters)
+            .where(characters.c.id == bindparam("move_id"))
+            .values(x=bindparam("new_x"), y=bindparam("new_y"))
+        )
+
+        with self._write_session_factory() as session:
+            types = {}
+            for chunk in _chunked(positions, chunk_size):
+                types.update(
+                    session.execute(
+                        select(characters.c.id, characters.c.type).where(
+                            characters.c.id.in_(chunk)
+                        )
+                    ).all()
+                )
+            missing = [char_id for char_id in positions if char_id not in types]
+            if missing:
+                raise ValueError(
+                    f"Characters with IDs {', '.join(map(str, missing))} do not exist."
                 )
-                self._validate_integer_id(self.LEVEL_LABEL, type_specific_param2)
-                player = session.get(Player, char_id)
-                player.set_job(type_specific_param1)
-                player.set_level(type_specific_param2)
-
-            elif character.type == Monster.CHARACTER_TYPE:
-                self._validate_non_empty_string(
-                    self.JOB_TYPE_LABEL, type_specific_param1
+
+            moved = session.connection().execute(
+                statement,
+                [
+                    {"move_id": char_id, "new_x": x, "new_y": y}
+                    for char_id, (x, y) in positions.items()
+                ],
+            )
+            if moved.rowcount != len(positions):
+                # A delete committed after the check; the UPDATE holds the
+                # write lock now, so this second look is consistent
+                deleted = set(positions) - self._existing_in_session(
+                    session, list(positions), chunk_size
                 )
-                self._validate_non_empty_string(
-                    self.DIFFICULTY_LABEL, type_specific_param2
+                raise ValueError(
+                    f"Characters with IDs {', '.join(map(str, sorted(deleted)))} do not exist."
                 )
-                monster = session.get(Monster, char_id)
-                monster.set_monster_type(type_specific_param1)
-                monster.set_monster_ai_difficulty(type_specific_param2)
+            version = self._commit_write(session)
+
+        self._record_write(list(positions), version)
+        self._sync_spatial_index(
+            upserts=[
+                (char_id, x, y, types[char_id]) for char_id, (x, y) in positions.items()
+            ]
+        )
+        return len(positions)
+
+    def execute_batch(self, operations, atomic: bool = True) -> list[dict]:
+        """
+        Runs a list of mixed operations in one transaction and returns one
+        result per operation, in order. Operations are dictionaries shaped
+        like the API payloads, with an "op" key:
+            {"op": "create", "type": "player", "job": "knight", "player_level": 3}
+            {"op": "update", "id": 7, "monster_type": "orc", "monster_ai_difficulty": "hard"}
+            {"op": "delete", "id": 7}
+        When atomic, the first failing operation rolls back the whole batch and
+        raises. Otherwise each operation runs in its own savepoint; failures
+        are reported in their result and the rest is committed.
+        """
+
+        if not isinstance(operations, (list, tuple)):
+            raise ValueError(f"{self.OPERATIONS_LABEL} must be a list.")
+
+        results = []
+        written_ids = []
+        upserts = []
+        removals = []
+        with self._write_session_factory() as session:
+            for index, operation in enumerate(operations):
+                try:
+                    if atomic:
+                        result = self._run_batch_operation(session, operation)
+                    else:
+                        with session.begin_nested():
+                            result = self._run_batch_operation(session, operation)
+                except ValueError as e:
+                    if atomic:
+                        session.rollback()
+                        raise ValueError(f"Operation {index} failed: {e}") from e
+                    results.append(
+                        {
+                            "index": index,
+                            "ok": False,
+                            "id": self._batch_operation_id(operation),
+                            "error": str(e),
+                        }
+                    )
+                    continue
+
+                op_name, char_id, position = result
+                results.append({"index": index, "ok": True, "id": char_id})
+                written_ids.append(char_id)
+                if op_name == "create":
+                    upserts.append(position)
+                elif op_name == "delete":
+                    removals.append(char_id)
+            if written_ids:
+                version = self._commit_write(session)
             else:
-                raise ValueError("Unsupported character type for update.")
+                session.commit()
 
-            session.commit()
+        if written_ids:
+            self._record_write(written_ids, version)
+            self._sync_spatial_index(upserts=upserts, removals=removals)
+        return results
+
+    def _run_batch_operation(self, session: Session, operation) -> tuple:
+        """
+        Private helper validating and applying one batch operation inside the
+        caller's transaction. Returns (op, id, position); position is only
+        set for creates.
+        """
+
+        if not isinstance(operation, dict):
+            raise ValueError("Operation must be a dictionary.")
+        op_name = operation.get("op")
+        if op_name not in self.BATCH_OPERATIONS:
+            raise ValueError(
+                f"Unsupported operation '{op_name}'. "
+                f"Use one of: {', '.join(self.BATCH_OPERATIONS)}."
+            )
+
+        if op_name == "create":
+            character_class = self._get_character_class(operation.get("type"))
+            if character_class is Player:
+                character = Player(operation.get("player_level"), operation.get("job"))
+            else:
+                character = Monster(
+                    operation.get("monster_type"),
+                    operation.get("monster_ai_difficulty"),
+                )
+            position = self._add_in_session(session, character)
+            return op_name, position[0], position
+
+        char_id = operation.get("id")
+        self._validate_integer_id(self.ID_LABEL, char_id)
+
+        if op_name == "update":
+            # The operation's keys select the parameters, as in the PUT route
+            if "job" in operation or "player_level" in operation:
+                params = (operation.get("job"), operation.get("player_level"))
+            else:
+                params = (
+                    operation.get("monster_type"),
+                    operation.get("monster_ai_difficulty"),
+                )
+            self._update_in_session(session, char_id, *params)
+            return op_name, char_id, None
+
+        characters = AbstractCharacter.__table__
+        if not self._delete_where(session, characters.c.id == char_id):
+            raise ValueError(f"Character with ID {char_id} does not exist.")
+        return op_name, char_id, None
+
+    @staticmethod
+    def _batch_operation_id(operation):
+        """Private helper returning the ID named by an operation, if any."""
+        return operation.get("id") if isinstance(operation, dict) else None
 
     def delete_character(self, char_id: int):
         """Deletes an existing character from the database by ID."""
 
         self._validate_integer_id(self.ID_LABEL, char_id)
 
-        with self._db_session_factory() as session:
-            character = session.execute(
-                select(AbstractCharacter).filter(AbstractCharacter.id == char_id)
-            ).scalar_one_or_none()
+        characters = AbstractCharacter.__table__
+        with self._write_session_factory() as session:
+            deleted_ids = self._delete_where(session, characters.c.id == char_id)
 
-            if character is None:
+            if not deleted_ids:
                 raise ValueError(f"Character with ID {char_id} does not exist.")
 
-            session.delete(character)
-            session.commit()
+            version = self._commit_write(session)
+
+        self._record_write([char_id], version)
+        self._sync_spatial_index(removals=[char_id])
+
+    def delete_characters(
+        self, ids: list[int] = None, filters: dict = None, chunk_size: int = 500
+    ) -> int:
+        """
+        Deletes characters either by a list of IDs or by an attribute filter
+        such as {"type": "monster", "monster_type": "orc"}, and returns the
+        number of deleted rows. Rows are removed with set-based DELETE
+        statements, one transaction per chunk of chunk_size rows.
+        IDs that do not exist are ignored.
+        """
+
+        if (ids is None) == (filters is None):
+            raise ValueError("Provide either IDs or a filter to delete characters.")
+        self._validate_positive_integer(self.CHUNK_SIZE_LABEL, chunk_size)
+
+        characters = AbstractCharacter.__table__
+        deleted = 0
+
+        if ids is not None:
+            ids = self._validate_id_list(ids)
+            for chunk in _chunked(dict.fromkeys(ids), chunk_size):
+                with self._write_session_factory() as session:
+                    deleted_ids = self._delete_where(
+                        session, characters.c.id.in_(chunk)
+                    )
+                    version = self._commit_write(session)
+                deleted += len(deleted_ids)
+                self._record_write(deleted_ids, version)
+                self._sync_spatial_index(removals=deleted_ids)
+            return deleted
+
+        conditions = self._build_filter_conditions(filters)
+        while True:
+            matching_ids = (
+                select(characters.c.id)
+                .where(*conditions)
+                .order_by(characters.c.id)
+                .limit(chunk_size)
+            )
+            with self._write_session_factory() as session:
+                deleted_ids = self._delete_where(
+                    session, characters.c.id.in_(matching_ids)
+                )
+                version = self._commit_write(session)
+            deleted += len(deleted_ids)
+            self._record_write(deleted_ids, version)
+            self._sync_spatial_index(removals=deleted_ids)
+            if len(deleted_ids) < chunk_size:
+                return deleted
+
+    def _delete_where(self, session: Session, condition) -> list[int]:
+        """
+        Private helper deleting the rows matching condition inside the caller's
+        transaction and applying their server stats counter deltas.
+        Returns the deleted IDs.
+        """
+
+        characters = AbstractCharacter.__table__
+        rows = session.execute(
+            delete(characters)
+            .where(condition)
+            .returning(
+                characters.c.id,
+                characters.c.type,
+                characters.c.player_level,
+                characters.c.monster_ai_difficulty,
+            )
+        ).all()
+
+        deltas = {}
+        for _, char_type, player_level, monster_ai_difficulty in rows:
+            level, score = self._stats_values(
+                char_type, player_level, monster_ai_difficulty
+            )
+            count_delta, level_delta, score_delta = deltas.get(char_type, (0, 0, 0))
+            deltas[char_type] = (
+                count_delta - 1,
+                level_delta - level,
+                score_delta - score,
+            )
+
+        for char_type, delta in deltas.items():
+            self._apply_stats_delta(session, char_type, *delta)
+
+        return [row[0] for row in rows]
+
+    def _validate_id_list(self, ids) -> list[int]:
+        """Private helper to validate a list of character IDs."""
+
+        if not isinstance(ids, (list, tuple, set)):
+            raise ValueError(f"{self.IDS_LABEL} must be a list of integers.")
+        for char_id in ids:
+            self._validate_integer_id(self.ID_LABEL, char_id)
+        return list(ids)
+
+    def get_filter_keys(self) -> list[str]:
+        """Returns every key accepted in a filter dictionary."""
+
+        return self.FILTER_COLUMNS + [
+            f"{bound}_{column}"
+            for column in self.RANGE_FILTER_COLUMNS
+            for bound in ("min", "max")
+        ]
+
+    def get_filter_type(self, key: str) -> type:
+        """Returns the type a filter value must have for key: int, bool or str."""
+
+        if key not in self.get_filter_keys():
+            raise ValueError(
+                f"Unsupported {self.FILTER_LABEL.lower()} '{key}'. "
+                f"Use one of: {', '.join(self.get_filter_keys())}."
+            )
+        if key in self.BOOLEAN_FILTER_COLUMNS:
+            return bool
+        if key in self.INTEGER_FILTER_COLUMNS or key not in self.FILTER_COLUMNS:
+            return int
+        return str
+
+    def _build_filter_conditions(self, filters) -> list:
+        """
+        Private helper compiling an attribute filter into SQL conditions.
+        Only whitelisted keys are accepted: plain columns map to equality
+        tests and min_<column>/max_<column> to inclusive range tests.
+        Filtering on a player-only or monster-only column also restricts the
+        type, which lets the composite (type, ...) indexes answer the query.
+        """
+
+        if not isinstance(filters, dict) or not filters:
+            raise ValueError(f"{self.FILTER_LABEL} must be a non-empty dictionary.")
+
+        characters = AbstractCharacter.__table__
+        conditions = []
+        implied_types = set()
+        for key, value in filters.items():
+            filter_type = self.get_filter_type(key)
+            if value is None or value == "":
+                raise ValueError(f"{self.FILTER_LABEL} '{key}' cannot be empty.")
+            if filter_type is bool:
+                if not isinstance(value, bool):
+                    raise ValueError(f"{self.FILTER_LABEL} '{key}' must be a boolean.")
+            elif filter_type is int:
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise ValueError(f"{self.FILTER_LABEL} '{key}' must be an integer.")
+            elif not isinstance(value, str):
+                raise ValueError(f"{self.FILTER_LABEL} '{key}' must be a string.")
+
+            if key in self.FILTER_COLUMNS:
+                column_name = key
+                if key == "type":
+                    self._get_character_class(value)
+                if isinstance(value, str):
+                    value = value.lower()
+                conditions.append(characters.c[key] == value)
+            else:
+                bound, column_name = key.split("_", 1)
+                column = characters.c[column_name]
+                conditions.append(
+                    column >= value if bound == "min" else column <= value
+                )
+
+            if column_name in self.PLAYER_ONLY_COLUMNS:
+                implied_types.add(Player.CHARACTER_TYPE)
+            elif column_name in self.MONSTER_ONLY_COLUMNS:
+                implied_types.add(Monster.CHARACTER_TYPE)
+
+        if "type" not in filters:
+            conditions.extend(
+                characters.c.type == char_type for char_type in sorted(implied_types)
+            )
+        return conditions
+
+    def _build_sort_order(self, sort) -> list:
+        """
+        Private helper compiling sort keys such as ["-player_level", "id"]
+        into ORDER BY clauses. A leading "-" sorts descending; the ID is
+        always the final tie-breaker so results are deterministic.
+        """
+
+        if not isinstance(sort, (list, tuple)):
+            raise ValueError(f"{self.SORT_LABEL} must be a list of column names.")
+
+        characters = AbstractCharacter.__table__
+        order = []
+        for key in sort:
+            if not isinstance(key, str):
+                raise ValueError(f"{self.SORT_LABEL} must be a list of column names.")
+            column_name = key.removeprefix("-")
+            if column_name not in self.SORT_COLUMNS:
+                raise ValueError(
+                    f"Unsupported {self.SORT_LABEL.lower()} '{column_name}'. "
+                    f"Use one of: {', '.join(self.SORT_COLUMNS)}."
+                )
+            column = characters.c[column_name]
+            if column_name == "monster_ai_difficulty":
+                # Rank difficulties easy < normal < hard rather than alphabetically
+                column = case(Monster.MONSTER_AI_DIFFICULTY_SCORE, value=column)
+            order.append(column.desc() if key.startswith("-") else column.asc())
+            if column_name == "id":
+                return order
+        order.append(characters.c.id.asc())
+        return order
+
+    def rebalance(self, stat_tables: StatTables = None) -> int:
+        """
+        Rewrites stored health and damage from the stat tables, optionally
+        installing new tables first, and returns the number of changed rows.
+        Each table entry becomes one parameter set of an executemany UPDATE
+        matched through the (type, job, level) and (type, monster_type,
+        difficulty) indexes, all in a single transaction.
+        """
+
+        if stat_tables is not None:
+            set_stat_tables(stat_tables)
+        tables = get_stat_tables()
+
+        characters = AbstractCharacter.__table__
+        stats_changed = or_(
+            characters.c.health != bindparam("new_health"),
+            characters.c.damage != bindparam("new_damage"),
+        )
+        new_stats = {
+            "health": bindparam("new_health"),
+            "damage": bindparam("new_damage"),
+        }
+        player_update = (
+            update(characters)
+            .where(
+                and_(
+                    characters.c.type == Player.CHARACTER_TYPE,
+                    characters.c.job == bindparam("match_job"),
+                    characters.c.player_level == bindparam("match_level"),
+                    stats_changed,
+                )
+            )
+            .values(**new_stats)
+        )
+        monster_update = (
+            update(characters)
+            .where(
+                and_(
+                    characters.c.type == Monster.CHARACTER_TYPE,
+                    characters.c.monster_type == bindparam("match_type"),
+                    characters.c.monster_ai_difficulty == bindparam("match_difficulty"),
+                    stats_changed,
+                )
+            )
+            .values(**new_stats)
+        )
+
+        player_params = [
+            {
+                "match_job": job,
+                "match_level": level,
+                "new_health": health,
+                "new_damage": damage,
+            }
+            for (job, level), (health, damage) in tables.get_player_table().items()
+        ]
+        monster_params = [
+            {
+                "match_type": monster_type,
+                "match_difficulty": difficulty,
+                "new_health": health,
+                "new_damage": damage,
+            }
+            for (monster_type, difficulty), (
+                health,
+                damage,
+            ) in tables.get_monster_table().items()
+        ]
+
+        with self._write_session_factory() as session:
+            connection = session.connection()
+            updated = connection.execute(player_update, player_params).rowcount
+            updated += connection.execute(monster_update, monster_params).rowcount
+            version = self._commit_write(session)
+
+        self._record_write(None, version)
+        return updated
 
     def get_server_name(self) -> str:
         """Returns the server name."""
@@ -197,57 +1589,234 @@ class CharacterManager:
         return self._server_name
 
     def get_server_stats(self) -> ServerStats:
-        """Calculates and returns a ServerStats object based on current character data."""
-
-        all_players = self.get_all_by_type("player")
-        all_monsters = self.get_all_by_type("monster")
-        characters = all_players + all_monsters
-
-        total_num_characters = len(characters)
-        num_players = len(all_players)
-        num_monsters = len(all_monsters)
-
-        total_player_level = 0
-        total_monster_difficulty_value = 0
-
-        for char in characters:
-            if char.type == Player.CHARACTER_TYPE:
-                total_player_level += char.get_level()
-            elif char.type == Monster.CHARACTER_TYPE:
-                difficulty = char.get_monster_ai_difficulty()
-                if difficulty == "easy":
-                    total_monster_difficulty_value += 1
-                elif difficulty == "normal":
-                    total_monster_difficulty_value += 2
-                elif difficulty == "hard":
-                    total_monster_difficulty_value += 3
-
-        avg_player_level = (
-            int(total_player_level / num_players) if num_players != 0 else 0
+        """Returns a ServerStats object built from the persisted per-type counters."""
+
+        totals = self.get_server_stats_totals()
+        player_totals = totals[Player.CHARACTER_TYPE]
+        monster_totals = totals[Monster.CHARACTER_TYPE]
+
+        return ServerStats.from_totals(
+            player_totals["num_characters"],
+            monster_totals["num_characters"],
+            player_totals["total_player_level"],
+            monster_totals["total_monster_difficulty_score"],
         )
 
-        avg_monster_ai_difficulty_score = (
-            total_monster_difficulty_value / num_monsters if num_monsters != 0 else 0
+    def get_server_stats_totals(self) -> dict:
+        """
+        Returns the raw per-type counters as {type: {field: value}}, the sums
+        ServerStats averages are derived from. Counters missing for a type
+        (e.g. the table was emptied after startup) are seeded from the
+        characters table first.
+        """
+
+        with self._db_session_factory() as session:
+            counters = self._read_stats_counters(session)
+        if self._seed_missing_stats_counters(counters):
+            with self._db_session_factory() as session:
+                counters = self._read_stats_counters(session)
+        return counters
+
+    def _seed_missing_stats_counters(self, counters: dict) -> bool:
+        """
+        Private helper seeding the counter rows missing from counters in their
+        own transaction. Returns True if any row was missing.
+        """
+
+        missing_types = [
+            char_type
+            for char_type in (Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE)
+            if char_type not in counters
+        ]
+        if missing_types:
+            with self._write_session_factory() as session:
+                self._seed_stats_counters(session, missing_types)
+                session.commit()
+        return bool(missing_types)
+
+    def _seed_stats_counters(self, session: Session, char_types: list[str]):
+        """
+        Private helper inserting the counter rows of char_types, aggregated
+        from the characters table by the INSERT itself. A row another writer
+        seeded first is left as is (ON CONFLICT DO NOTHING), so concurrent
+        seeding neither fails nor double counts.
+        """
+
+        counters = ServerStatsCounter.__table__
+        characters = AbstractCharacter.__table__
+        for char_type in char_types:
+            level_sum = (
+                func.coalesce(func.sum(characters.c.player_level), 0)
+                if char_type == Player.CHARACTER_TYPE
+                else literal(0)
+            )
+            score_sum = (
+                func.coalesce(func.sum(self._difficulty_score_expression()), 0)
+                if char_type == Monster.CHARACTER_TYPE
+                else literal(0)
+            )
+            totals = select(
+                literal(char_type), func.count(characters.c.id), level_sum, score_sum
+            ).where(characters.c.type == char_type)
+            session.execute(
+                sqlite_insert(counters)
+                .from_select(
+                    ["character_type", *ServerStatsCounter.COUNTER_FIELDS], totals
+                )
+                .on_conflict_do_nothing(index_elements=["character_type"])
+            )
+
+    def verify_server_stats_counters(self) -> dict:
+        """
+        Recomputes the server stats counters from the characters table and
+        returns the drift as {type: {field: (stored, actual)}}.
+        An empty dictionary means the counters are accurate.
+        """
+
+        with self._db_session_factory() as session:
+            return self._reconcile_stats_counters(session)
+
+    def rebuild_server_stats_counters(self) -> dict:
+        """
+        Overwrites the server stats counters with values recomputed from the
+        characters table and returns the drift that was corrected.
+        """
+
+        with self._write_session_factory() as session:
+            drift = self._reconcile_stats_counters(session)
+            session.execute(ServerStatsCounter.__table__.delete())
+            for char_type, totals in self._compute_stats_totals(session).items():
+                session.add(ServerStatsCounter(character_type=char_type, **totals))
+            if drift:
+                version = self._commit_write(session)
+            else:
+                session.commit()
+
+        if drift:
+            self._record_write([], version)
+        return drift
+
+    @staticmethod
+    def _stats_values(
+        char_type: str, player_level, monster_ai_difficulty
+    ) -> tuple[int, int]:
+        """Private helper returning a character's (level, difficulty score) contribution to the counters."""
+
+        if char_type == Player.CHARACTER_TYPE:
+            return player_level or 0, 0
+        if char_type == Monster.CHARACTER_TYPE:
+            return 0, Monster.MONSTER_AI_DIFFICULTY_SCORE.get(monster_ai_difficulty, 0)
+        return 0, 0
+
+    def _apply_stats_delta(
+        self,
+        session: Session,
+        char_type: str,
+        count_delta: int,
+        level_delta: int,
+        score_delta: int,
+    ):
+        """
+        Private helper to adjust the counters of a type inside the caller's transaction.
+        The characters table must already be flushed: a missing counter row is
+        seeded from it, which already includes the change being recorded.
+        """
+
+        counters = ServerStatsCounter.__table__
+        result = session.execute(
+            update(counters)
+            .where(counters.c.character_type == char_type)
+            .values(
+                num_characters=counters.c.num_characters + count_delta,
+                total_player_level=counters.c.total_player_level + level_delta,
+                total_monster_difficulty_score=counters.c.total_monster_difficulty_score
+                + score_delta,
+            )
         )
+        if result.rowcount == 0 and char_type in (
+            Player.CHARACTER_TYPE,
+            Monster.CHARACTER_TYPE,
+        ):
+            self._seed_stats_counters(session, [char_type])
 
-        avg_monster_ai_difficulty_str: str
-        if avg_monster_ai_difficulty_score == 0:
-            avg_monster_ai_difficulty_str = "not available"
-        elif round(avg_monster_ai_difficulty_score) == 1:
-            avg_monster_ai_difficulty_str = "easy"
-        elif round(avg_monster_ai_difficulty_score) == 2:
-            avg_monster_ai_difficulty_str = "normal"
-        else:
-            avg_monster_ai_difficulty_str = "hard"
-
-        return ServerStats(
-            total_num_characters,
-            num_monsters,
-            num_players,
-            avg_player_level,
-            avg_monster_ai_difficulty_str,
+    def _read_stats_counters(self, session: Session) -> dict:
+        """Private helper returning the stored counters keyed by character type."""
+
+        counters = ServerStatsCounter.__table__
+        rows = session.execute(select(counters)).mappings().all()
+        return {
+            row["character_type"]: {
+                field: row[field] for field in ServerStatsCounter.COUNTER_FIELDS
+            }
+            for row in rows
+        }
+
+    def _compute_stats_totals(self, session: Session) -> dict:
+        """Private helper aggregating the counter values from the characters table."""
+
+        characters = AbstractCharacter.__table__
+        difficulty_score = self._difficulty_score_expression()
+
+        rows = session.execute(
+            select(
+                characters.c.type,
+                func.count(characters.c.id),
+                func.coalesce(func.sum(characters.c.player_level), 0),
+                func.coalesce(func.sum(difficulty_score), 0),
+            ).group_by(characters.c.type)
+        ).all()
+
+        totals = {
+            char_type: {field: 0 for field in ServerStatsCounter.COUNTER_FIELDS}
+            for char_type in (Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE)
+        }
+        for char_type, count, level_sum, score_sum in rows:
+            if char_type not in totals:
+                continue
+            totals[char_type] = {
+                "num_characters": count,
+                "total_player_level": (
+                    level_sum if char_type == Player.CHARACTER_TYPE else 0
+                ),
+                "total_monster_difficulty_score": (
+                    score_sum if char_type == Monster.CHARACTER_TYPE else 0
+                ),
+            }
+        return totals
+
+    @staticmethod
+    def _difficulty_score_expression():
+        """Private helper returning the SQL difficulty score of a stored monster."""
+
+        characters = AbstractCharacter.__table__
+        return case(
+            *(
+                (characters.c.monster_ai_difficulty == difficulty, score)
+                for difficulty, score in Monster.MONSTER_AI_DIFFICULTY_SCORE.items()
+            ),
+            else_=0,
         )
 
+    def _reconcile_stats_counters(self, session: Session) -> dict:
+        """
+        Private helper comparing stored counters with recomputed ones.
+        Types without a stored row are skipped since they are seeded on demand.
+        """
+
+        stored = self._read_stats_counters(session)
+        drift = {}
+        for char_type, actual in self._compute_stats_totals(session).items():
+            if char_type not in stored:
+                continue
+            differences = {
+                field: (stored[char_type][field], actual[field])
+                for field in ServerStatsCounter.COUNTER_FIELDS
+                if stored[char_type][field] != actual[field]
+            }
+            if differences:
+                drift[char_type] = differences
+        return drift
+
     def get_character_details(self, char_id: int) -> str:
         """Returns full details for a single character by ID."""
 
@@ -258,11 +1827,12 @@ class CharacterManager:
     def get_character_details_by_type(self, character_type: str) -> list[str]:
         """Returns a list of brief details for characters of a specific type."""
 
-        characters = self.get_all_by_type(character_type)
+        self._get_character_class(character_type)
+        characters = self.get_views(character_type)
         return [char.get_details() for char in characters]
 
     def get_all_character_details(self) -> list[str]:
         """Returns a list of brief details for all characters on the server."""
 
-        characters = self.get_all()
+        characters = self.get_views()
         return [char.get_details() for char in characters]
@@ -0,0 +1,260 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress
+
+from player import Player
+from monster import Monster
+
+
+class CharacterSnapshot:
+    """Columnar in-memory copy of the characters table for analytics.
+    Numbers are kept in typed arrays and strings as small integer codes,
+    one entry per character in ID order"""
+
+    ROW_FIELDS = [
+        "id",
+        "type",
+        "health",
+        "damage",
+        "x",
+        "y",
+        "alive",
+        "job",
+        "player_level",
+        "monster_type",
+        "monster_ai_difficulty",
+    ]
+    COLUMN_TYPECODES = {
+        "id": "q",
+        "type": "b",
+        "health": "i",
+        "damage": "i",
+        "x": "q",
+        "y": "q",
+        "alive": "b",
+        "job": "b",
+        "player_level": "b",
+        "monster_type": "b",
+        "monster_ai_difficulty": "b",
+    }
+    CODED_COLUMNS = {
+        "type": [Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE],
+        "job": Player.PLAYER_JOB,
+        "monster_type": Monster.MONSTER_TYPE,
+        "monster_ai_difficulty": Monster.MONSTER_AI_DIFFICULTY,
+    }
+    MISSING_CODE = -1
+    COLUMN_LABEL = "Column"
+
+    def __init__(self):
+        """Constructor - Initialize an empty snapshot that has never been loaded."""
+
+        self._columns = self._empty_columns()
+        self._version = None
+
+    def __len__(self) -> int:
+        """Returns the number of characters in the snapshot."""
+        return len(self._columns["id"])
+
+    def get_version(self) -> int:
+        """Returns the data version the snapshot was loaded at (None before loading)."""
+        return self._version
+
+    def get_nbytes(self) -> int:
+        """Returns the memory held by the column buffers, in bytes."""
+        return sum(len(column) * column.itemsize for column in self._columns.values())
+
+    def load(self, rows, version: int):
+        """Replaces the contents with rows, tuples in ROW_FIELDS order sorted by ID."""
+
+        columns = self._empty_columns()
+        for row in rows:
+            self._append_row(columns, row)
+        self._columns = columns
+        self._version = version
+
+    def apply_changes(self, changed_ids, rows, version: int):
+        """
+        Brings the snapshot up to date from the current rows of changed_ids.
+        IDs in changed_ids without a row were deleted. Rows already present
+        are overwritten in place; inserts and deletes rebuild the columns once.
+        """
+
+        rows = {row[0]: row for row in rows}
+        ids = self._columns["id"]
+        deleted = set()
+        for char_id in changed_ids:
+            position = bisect_left(ids, char_id)
+            if position == len(ids) or ids[position] != char_id:
+                continue
+            if char_id in rows:
+                self._write_row(self._columns, position, rows.pop(char_id))
+            else:
+                deleted.add(char_id)
+
+        # What is left in rows was inserted since the last load
+        if rows or deleted:
+            columns = self._empty_columns()
+            new_rows = sorted(rows.values())
+            next_new = 0
+            for position, char_id in enumerate(ids):
+                while next_new < len(new_rows) and new_rows[next_new][0] < char_id:
+                    self._append_row(columns, new_rows[next_new])
+                    next_new += 1
+                if char_id not in deleted:
+                    self._copy_row(columns, position)
+            for row in new_rows[next_new:]:
+                self._append_row(columns, row)
+            self._columns = columns
+
+        self._version = version
+
+    def column(self, name: str) -> array:
+        """Returns one column as a typed array (a copy, in ID order)."""
+
+        self._validate_column(name)
+        return array(self._columns[name].typecode, self._columns[name])
+
+    def mask(self, **conditions) -> bytes:
+        """
+        Returns a byte mask (1 = match) of the rows equal to every condition,
+        e.g. mask(type="player", job="knight"). String columns are compared
+        by code, so each condition is a single pass over a small-int array.
+        """
+
+        result = None
+        for name, value in conditions.items():
+            self._validate_column(name)
+            if name in self.CODED_COLUMNS:
+                value = self._encode(name, value)
+            matches = self._equal_mask(self._columns[name], value)
+            if result is None:
+                result = matches
+            else:
+                # AND the two masks as big integers instead of byte by byte
+                result = (
+                    int.from_bytes(result, "big") & int.from_bytes(matches, "big")
+                ).to_bytes(len(matches), "big")
+        if result is None:
+            return b"\x01" * len(self)
+        return result
+
+    def ids(self, mask: bytes = None) -> list[int]:
+        """Returns the IDs of the rows selected by mask (every row when None)."""
+        return self._select("id", mask)
+
+    def count(self, mask: bytes = None) -> int:
+        """Returns the number of rows selected by mask."""
+        return len(self) if mask is None else mask.count(1)
+
+    def total(self, name: str, mask: bytes = None) -> int:
+        """Returns the sum of a numeric column over the rows selected by mask."""
+        self._validate_numeric_column(name)
+        return sum(self._select(name, mask))
+
+    def mean(self, name: str, mask: bytes = None) -> float:
+        """Returns the rounded average of a numeric column, or None without rows."""
+        self._validate_numeric_column(name)
+        values = self._select(name, mask)
+        return round(sum(values) / len(values), 2) if values else None
+
+    def distribution(self, name: str, mask: bytes = None) -> dict:
+        """Returns {value: count} for a column, decoding string columns."""
+
+        self._validate_column(name)
+        counts = Counter(self._select(name, mask))
+        if name in self.CODED_COLUMNS:
+            labels = self.CODED_COLUMNS[name]
+            return {
+                labels[code]: counts[code]
+                for code in sorted(counts)
+                if code != self.MISSING_CODE
+            }
+        return dict(sorted(counts.items()))
+
+    def heatmap(self, cell_size: int = 1, mask: bytes = None) -> dict:
+        """Returns {(cell_x, cell_y): count} over square cells of cell_size."""
+
+        if not isinstance(cell_size, int) or cell_size < 1:
+            raise ValueError("Cell Size must be a positive integer.")
+        xs = self._select("x", mask)
+        ys = self._select("y", mask)
+        return dict(Counter((x // cell_size, y // cell_size) for x, y in zip(xs, ys)))
+
+    def _empty_columns(self) -> dict:
+        """Private helper creating one empty typed array per column."""
+        return {
+            name: array(typecode) for name, typecode in self.COLUMN_TYPECODES.items()
+        }
+
+    def _encode_row(self, row) -> list:
+        """Private helper turning a table row into column values."""
+        values = []
+        for name, value in zip(self.ROW_FIELDS, row):
+            if name in self.CODED_COLUMNS:
+                value = self._encode(name, value)
+            elif value is None:
+                value = 0
+            values.append(value)
+        return values
+
+    def _append_row(self, columns: dict, row):
+        """Private helper appending one table row to the columns."""
+        for name, value in zip(self.ROW_FIELDS, self._encode_row(row)):
+            columns[name].append(value)
+
+    def _write_row(self, columns: dict, position: int, row):
+        """Private helper overwriting the row at position."""
+        for name, value in zip(self.ROW_FIELDS, self._encode_row(row)):
+            columns[name][position] = value
+
+    def _copy_row(self, columns: dict, position: int):
+        """Private helper appending the current row at position to other columns."""
+        for name, column in self._columns.items():
+            columns[name].append(column[position])
+
+    @staticmethod
+    def _equal_mask(column: array, value) -> bytes:
+        """
+        Private helper returning a byte mask of column == value. Byte columns
+        are translated through a 256-entry lookup table in a single C-level
+        pass; wider columns are compared item by item.
+        """
+
+        if column.typecode == "b":
+            table = bytearray(256)
+            if isinstance(value, int) and -128 <= value <= 127:
+                table[value & 0xFF] = 1
+            return column.tobytes().translate(table)
+        return bytes(item == value for item in column)
+
+    def _encode(self, name: str, value) -> int:
+        """Private helper mapping a string to its code (MISSING_CODE if unknown)."""
+        if isinstance(value, str):
+            value = value.lower()
+        labels = self.CODED_COLUMNS[name]
+        return labels.index(value) if value in labels else self.MISSING_CODE
+
+    def _select(self, name: str, mask: bytes) -> list:
+        """Private helper returning a column's values for the rows in mask."""
+        column = self._columns[name]
+        if mask is None:
+            return list(column)
+        if len(mask) != len(column):
+            raise ValueError("Mask length does not match the snapshot.")
+        return list(compress(column, mask))
+
+    def _validate_column(self, name: str):
+        """Private helper validating a column name."""
+        if name not in self.COLUMN_TYPECODES:
+            raise ValueError(
+                f"Unsupported {self.COLUMN_LABEL.lower()} '{name}'. "
+                f"Use one of: {', '.join(self.COLUMN_TYPECODES)}."
+            )
+
+    def _validate_numeric_column(self, name: str):
+        """Private helper validating a numeric (non-coded) column name."""
+        self._validate_column(name)
+        if name in self.CODED_COLUMNS:
+            raise ValueError(f"{self.COLUMN_LABEL} '{name}' is not numeric.")
@@ -0,0 +1,83 @@
+from collections import namedtuple
+
+from player import Player
+
+
+class CharacterView(
+    namedtuple(
+        "CharacterRow",
+        [
+            "id",
+            "type",
+            "health",
+            "damage",
+            "x",
+            "y",
+            "alive",
+            "job",
+            "player_level",
+            "monster_type",
+            "monster_ai_difficulty",
+        ],
+    )
+):
+    """Immutable read-only view of one character row, with the same output
+    methods as Player and Monster but none of the ORM bookkeeping"""
+
+    __slots__ = ()
+
+    def get_type(self) -> str:
+        """Returns the character type"""
+        return self.type
+
+    def get_position(self) -> list[int]:
+        """Returns character position as a list [x, y]"""
+        return [self.x, self.y]
+
+    def get_stats(self) -> list[int]:
+        """Returns characters stats as a list [damage, health]"""
+        return [self.damage, self.health]
+
+    def get_details(self) -> str:
+        """Returns the brief description used by Player and Monster"""
+
+        if self.type == Player.CHARACTER_TYPE:
+            return f"The player (id: {self.id}) is level {self.player_level} {self.job}"
+        return (
+            f"The monster (id: {self.id}) is {self.monster_ai_difficulty} "
+            f"{self.monster_type}"
+        )
+
+    def get_full_details(self) -> str:
+        """Returns the full description used by Player and Monster"""
+
+        if self.type == Player.CHARACTER_TYPE:
+            return (
+                f"The player (id: {self.id}) is level {self.player_level} {self.job} "
+                f"with {self.health} health and {self.damage} damage, "
+                f"Position: X = {self.x} Y = {self.y}"
+            )
+        return (
+            f"The monster (id: {self.id}) is {self.monster_ai_difficulty} "
+            f"{self.monster_type} with {self.health} health and {self.damage} damage, "
+            f"Position: X = {self.x} Y = {self.y}"
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the same dictionary as Player.to_dict or Monster.to_dict"""
+
+        details = {
+            "id": self.id,
+            "health": self.health,
+            "damage": self.damage,
+            "position": [self.x, self.y],
+            "alive": self.alive,
+        }
+        if self.type == Player.CHARACTER_TYPE:
+            details["player_level"] = self.player_level
+            details["job"] = self.job
+        else:
+            details["monster_ai_difficulty"] = self.monster_ai_difficulty
+            details["monster_type"] = self.monster_type
+        details["type"] = self.type
+        return details
@@ -0,0 +1,62 @@
+import sys
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine
+from player import Player
+from monster import Monster
+
+# Queries on the hot paths, each expected to be answered through an index
+HOT_QUERIES = {
+    "players by type": select(Player),
+    "monsters by type": select(Monster),
+    "players by job and level": select(Player).where(
+        Player.job == "knight", Player.player_level == 10
+    ),
+    "monsters by type and difficulty": select(Monster).where(
+        Monster.monster_type == "orc", Monster.monster_ai_difficulty == "hard"
+    ),
+    "top knights by level": select(Player)
+    .where(Player.job == "knight", Player.player_level >= 8)
+    .order_by(Player.player_level.desc())
+    .limit(20),
+}
+
+
+def explain_query_plan(engine: Engine, statement) -> list[str]:
+    """Returns the EXPLAIN QUERY PLAN detail lines for a statement"""
+    sql = statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return [row[-1] for row in rows]
+
+
+def check_query_plans(engine: Engine) -> dict:
+    """Returns {query name: (uses_index, plan lines)} for every hot query"""
+    results = {}
+    for name, statement in HOT_QUERIES.items():
+        plan = explain_query_plan(engine, statement)
+        uses_index = all(
+            "USING INDEX" in line
+            or "USING COVERING INDEX" in line
+            or "USING INTEGER PRIMARY KEY" in line
+            for line in plan
+            if line.startswith(("SCAN", "SEARCH"))
+        )
+        results[name] = (uses_index, plan)
+    return results
+
+
+def main():
+    """Prints the query plan of every hot query and fails on full table scans"""
+    engine = create_engine("sqlite:///characters.sqlite")
+    failed = False
+    for name, (uses_index, plan) in check_query_plans(engine).items():
+        status = "OK" if uses_index else "FULL SCAN"
+        failed = failed or not uses_index
+        print(f"[{status}] {name}: {'; '.join(plan)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ c = conn.cursor()
 
 # Drop existing for dev/testing
 c.execute("DROP TABLE IF EXISTS characters")
+c.execute("DROP TABLE IF EXISTS server_stats_counters")
+c.execute("DROP TABLE IF EXISTS data_version")
 
 # Create new table
 c.execute(
@@ -25,5 +27,43 @@ c.execute(
 """
 )
 
+c.execute("CREATE INDEX ix_characters_type ON characters (type)")
+c.execute(
+    "CREATE INDEX ix_characters_type_job_level "
+    "ON characters (type, job, player_level)"
+)
+c.execute(
+    "CREATE INDEX ix_characters_type_monster_type_difficulty "
+    "ON characters (type, monster_type, monster_ai_difficulty)"
+)
+
+c.execute(
+    """
+    CREATE TABLE server_stats_counters (
+        character_type VARCHAR(7) PRIMARY KEY,
+        num_characters INTEGER NOT NULL DEFAULT 0,
+        total_player_level INTEGER NOT NULL DEFAULT 0,
+        total_monster_difficulty_score INTEGER NOT NULL DEFAULT 0
+    )
+"""
+)
+
+# Seed the counters of the empty table, so reading the stats never has to write
+c.executemany(
+    "INSERT INTO server_stats_counters (character_type) VALUES (?)",
+    [("player",), ("monster",)],
+)
+
+# Every write through CharacterManager increments the single version row
+c.execute(
+    """
+    CREATE TABLE data_version (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+"""
+)
+c.execute("INSERT INTO data_version (id, version) VALUES (1, 0)")
+
 conn.commit()
 conn.close()
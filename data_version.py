@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer
+from base import Base
+
+
+class DataVersion(Base):
+    """Represent the version counter every write transaction increments"""
+
+    __tablename__ = "data_version"
+
+    ROW_ID = 1
+
+    id: Column[Integer] = Column(Integer, primary_key=True)
+    version: Column[Integer] = Column(Integer, nullable=False, default=0)
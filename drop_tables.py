@@ -8,6 +8,16 @@ c.execute(
     DROP TABLE IF EXISTS characters
 """
 )
+c.execute(
+    """
+    DROP TABLE IF EXISTS server_stats_counters
+"""
+)
+c.execute(
+    """
+    DROP TABLE IF EXISTS data_version
+"""
+)
 
 conn.commit()
 conn.close()
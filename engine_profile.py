@@ -0,0 +1,161 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+class EngineProfile:
+    """SQLite engine settings: per-connection pragmas and connection pooling"""
+
+    JOURNAL_MODES = ["delete", "truncate", "persist", "memory", "wal", "off"]
+    SYNCHRONOUS_MODES = ["off", "normal", "full", "extra"]
+    TEMP_STORE_MODES = ["default", "file", "memory"]
+    PRAGMA_NAMES = [
+        "journal_mode",
+        "synchronous",
+        "busy_timeout",
+        "cache_size",
+        "mmap_size",
+        "temp_store",
+    ]
+
+    JOURNAL_MODE_LABEL = "Journal Mode"
+    SYNCHRONOUS_LABEL = "Synchronous"
+    TEMP_STORE_LABEL = "Temp Store"
+    BUSY_TIMEOUT_LABEL = "Busy Timeout"
+    CACHE_SIZE_LABEL = "Cache Size"
+    MMAP_SIZE_LABEL = "Mmap Size"
+    POOL_SIZE_LABEL = "Pool Size"
+    MAX_OVERFLOW_LABEL = "Max Overflow"
+    POOL_TIMEOUT_LABEL = "Pool Timeout"
+
+    # Execution option marking an engine or connection whose transactions
+    # write; they begin with BEGIN IMMEDIATE instead of BEGIN
+    WRITE_OPTION = "sqlite_write"
+
+    def __init__(
+        self,
+        journal_mode: str = "wal",
+        synchronous: str = "normal",
+        busy_timeout: int = 5000,
+        cache_size: int = -64000,
+        mmap_size: int = 268435456,
+        temp_store: str = "memory",
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: int = 30,
+    ):
+        """Constructor - Initialize and validate the engine settings.
+        busy_timeout is in milliseconds, a negative cache_size is in KiB
+        (SQLite convention), mmap_size is in bytes and pool_timeout in seconds."""
+
+        self._journal_mode = self._validate_choice(
+            self.JOURNAL_MODE_LABEL, journal_mode, self.JOURNAL_MODES
+        )
+        self._synchronous = self._validate_choice(
+            self.SYNCHRONOUS_LABEL, synchronous, self.SYNCHRONOUS_MODES
+        )
+        self._temp_store = self._validate_choice(
+            self.TEMP_STORE_LABEL, temp_store, self.TEMP_STORE_MODES
+        )
+
+        self._validate_integer(self.CACHE_SIZE_LABEL, cache_size)
+        self._cache_size = cache_size
+        self._busy_timeout = self._validate_non_negative(
+            self.BUSY_TIMEOUT_LABEL, busy_timeout
+        )
+        self._mmap_size = self._validate_non_negative(self.MMAP_SIZE_LABEL, mmap_size)
+        self._max_overflow = self._validate_non_negative(
+            self.MAX_OVERFLOW_LABEL, max_overflow
+        )
+        self._pool_timeout = self._validate_non_negative(
+            self.POOL_TIMEOUT_LABEL, pool_timeout
+        )
+
+        self._pool_size = self._validate_non_negative(self.POOL_SIZE_LABEL, pool_size)
+        if pool_size == 0:
+            raise ValueError(f"{self.POOL_SIZE_LABEL} must be a positive integer.")
+
+    def get_pragmas(self) -> dict:
+        """Returns the pragmas applied to every new connection, in order."""
+        values = [
+            self._journal_mode,
+            self._synchronous,
+            self._busy_timeout,
+            self._cache_size,
+            self._mmap_size,
+            self._temp_store,
+        ]
+        return dict(zip(self.PRAGMA_NAMES, values))
+
+    def get_pool_settings(self) -> dict:
+        """Returns the connection pool sizing."""
+        return {
+            "pool_size": self._pool_size,
+            "max_overflow": self._max_overflow,
+            "pool_timeout": self._pool_timeout,
+        }
+
+    def create_engine(self, db_filename: str) -> Engine:
+        """Creates an engine for db_filename that applies this profile.
+
+        Connections are pooled with a QueuePool and may be used from any
+        thread; SQLite itself serializes writers, waiting up to busy_timeout.
+        Transactions are begun by SQLAlchemy rather than by pysqlite, which
+        would otherwise commit when the first SAVEPOINT is released."""
+
+        engine = create_engine(
+            f"sqlite:///{db_filename}",
+            poolclass=QueuePool,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": self._busy_timeout / 1000,
+            },
+            **self.get_pool_settings(),
+        )
+        event.listen(engine, "connect", self._apply_pragmas)
+        event.listen(engine, "begin", self._begin)
+        return engine
+
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        """Private listener running the profile pragmas on a new DBAPI connection.
+        It also turns off pysqlite's implicit transactions (see _begin)."""
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.get_pragmas().items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    def _begin(self, connection):
+        """Private listener emitting BEGIN for every SQLAlchemy transaction, so
+        SAVEPOINTs nest inside it (SQLAlchemy's pysqlite savepoint recipe).
+        Writing connections use BEGIN IMMEDIATE: a deferred transaction that
+        read first could not upgrade to a write once another writer committed."""
+        if connection.get_execution_options().get(self.WRITE_OPTION):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            connection.exec_driver_sql("BEGIN")
+
+    @staticmethod
+    def _validate_choice(display_name: str, value, choices: list) -> str:
+        """Private helper to validate a case-insensitive string option."""
+        if not isinstance(value, str):
+            raise ValueError(f"{display_name} must be a string.")
+        if value.lower() not in choices:
+            raise ValueError(f"{display_name} must be one of: {', '.join(choices)}.")
+        return value.lower()
+
+    @staticmethod
+    def _validate_integer(display_name: str, value):
+        """Private helper to validate that a value is an integer."""
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"{display_name} must be an integer.")
+
+    @staticmethod
+    def _validate_non_negative(display_name: str, value) -> int:
+        """Private helper to validate that a value is a non-negative integer."""
+        EngineProfile._validate_integer(display_name, value)
+        if value < 0:
+            raise ValueError(f"{display_name} cannot be negative.")
+        return value
@@ -1,5 +1,6 @@
 from abstract_character import AbstractCharacter
-from sqlalchemy import Column, String
+from stat_tables import get_stat_tables
+from sqlalchemy import Column, Index, String
 
 
 class Monster(AbstractCharacter):
@@ -12,6 +13,7 @@ class Monster(AbstractCharacter):
 
     MONSTER_TYPE = ["dragon", "orc", "elf"]
     MONSTER_AI_DIFFICULTY = ["easy", "normal", "hard"]
+    MONSTER_AI_DIFFICULTY_SCORE = {"easy": 1, "normal": 2, "hard": 3}
     MONSTER_TYPE_LABEL = "Monster type"
     MONSTER_AI_DIFFICULTY_LABEL = "Monster AI difficulty"
     CHARACTER_TYPE = "monster"
@@ -26,28 +28,39 @@ class Monster(AbstractCharacter):
 
         self._update_stats_based_on_type_and_difficulty()
 
-    def _validate_input_string(self, label: str, value):
+    @staticmethod
+    def _validate_input_string(label: str, value):
         """Helper to validate if an input is a non-empty string."""
         if not isinstance(value, str):
             raise ValueError(f"{label} must be a string.")
         AbstractCharacter._validate_string_input(label, value)
 
-    def _set_initial_monster_type(self, monster_type_value: str):
-        """Internal method for initial validation and setting of monster_type."""
-        self._validate_input_string(Monster.MONSTER_TYPE_LABEL, monster_type_value)
+    @staticmethod
+    def _validate_monster_type_input(monster_type_value):
+        """Private helper to validate monster type input type and accepted values."""
+        Monster._validate_input_string(Monster.MONSTER_TYPE_LABEL, monster_type_value)
         if monster_type_value.lower() not in Monster.MONSTER_TYPE:
             raise ValueError("Monster type must be either dragon, orc or elf")
-        self.monster_type = monster_type_value.lower()
 
-    def _set_initial_monster_ai_difficulty(self, monster_ai_difficulty_value: str):
-        """Internal method for initial validation and setting of monster_ai_difficulty."""
-        self._validate_input_string(
+    @staticmethod
+    def _validate_monster_ai_difficulty_input(monster_ai_difficulty_value):
+        """Private helper to validate monster AI difficulty input type and accepted values."""
+        Monster._validate_input_string(
             Monster.MONSTER_AI_DIFFICULTY_LABEL, monster_ai_difficulty_value
         )
         if monster_ai_difficulty_value.lower() not in Monster.MONSTER_AI_DIFFICULTY:
             raise ValueError(
                 "Monster AI difficulty must be either easy, normal, or hard."
             )
+
+    def _set_initial_monster_type(self, monster_type_value: str):
+        """Internal method for initial validation and setting of monster_type."""
+        self._validate_monster_type_input(monster_type_value)
+        self.monster_type = monster_type_value.lower()
+
+    def _set_initial_monster_ai_difficulty(self, monster_ai_difficulty_value: str):
+        """Internal method for initial validation and setting of monster_ai_difficulty."""
+        self._validate_monster_ai_difficulty_input(monster_ai_difficulty_value)
         self.monster_ai_difficulty = monster_ai_difficulty_value.lower()
 
     def set_monster_type(self, monster_type: str):
@@ -69,25 +82,16 @@ class Monster(AbstractCharacter):
         Helper to update health and damage based on the current
         monster_type and monster_ai_difficulty.
         """
-        # Set base health based on type
-        if self.monster_type == "dragon":
-            self.health = 150
-        elif self.monster_type == "orc":
-            self.health = 130
-        elif self.monster_type == "elf":
-            self.health = 110
-        else:
-            self.health = 100
-
-        # Set base damage based on AI difficulty
-        if self.monster_ai_difficulty == "easy":
-            self.damage = 10
-        elif self.monster_ai_difficulty == "normal":
-            self.damage = 20
-        elif self.monster_ai_difficulty == "hard":
-            self.damage = 30
-        else:
-            self.damage = 15
+        self.health, self.damage = Monster.calculate_stats(
+            self.monster_type, self.monster_ai_difficulty
+        )
+
+    @staticmethod
+    def calculate_stats(
+        monster_type: str, monster_ai_difficulty: str
+    ) -> tuple[int, int]:
+        """Returns the (health, damage) of a monster with the given type and AI difficulty."""
+        return get_stat_tables().get_monster_stats(monster_type, monster_ai_difficulty)
 
     def get_monster_ai_difficulty(self) -> str:
         """Return the monster AI difficulty."""
@@ -122,3 +126,11 @@ class Monster(AbstractCharacter):
             "monster_type": self.monster_type,
             "type": self.get_type(),
         }
+
+
+Index(
+    "ix_characters_type_monster_type_difficulty",
+    Monster.__table__.c.type,
+    Monster.__table__.c.monster_type,
+    Monster.__table__.c.monster_ai_difficulty,
+)
@@ -1,5 +1,6 @@
 from abstract_character import AbstractCharacter
-from sqlalchemy import Column, String, Integer
+from stat_tables import get_stat_tables
+from sqlalchemy import Column, Index, String, Integer
 
 
 class Player(AbstractCharacter):
@@ -26,7 +27,8 @@ class Player(AbstractCharacter):
 
         self._update_stats_based_on_job_and_level()
 
-    def _validate_player_level_input(self, level_value):
+    @staticmethod
+    def _validate_player_level_input(level_value):
         """Private helper to validate player level input type and range."""
         if not isinstance(level_value, int):
             raise ValueError(f"{Player.PLAYER_LEVEL_LABEL} must be an integer.")
@@ -43,7 +45,8 @@ class Player(AbstractCharacter):
         self._validate_player_level_input(player_level_value)
         self.player_level = player_level_value
 
-    def _validate_job_input(self, job_value):
+    @staticmethod
+    def _validate_job_input(job_value):
         """Private helper to validate job input type and accepted values."""
         if not isinstance(job_value, str):
             raise ValueError(f"{Player.JOB_LABEL} must be a string.")
@@ -75,18 +78,12 @@ class Player(AbstractCharacter):
 
     def _update_stats_based_on_job_and_level(self):
         """Helper to update health and damage based on current job and level."""
-        if self.job == "assassin":
-            self.health = 80 + ((self.player_level - 1) * 4)
-            self.damage = 30 + ((self.player_level - 1) * 3)
-        elif self.job == "knight":
-            self.health = 100 + ((self.player_level - 1) * 4)
-            self.damage = 20 + ((self.player_level - 1) * 3)
-        elif self.job == "warrior":
-            self.health = 120 + ((self.player_level - 1) * 4)
-            self.damage = 10 + ((self.player_level - 1) * 3)
-        else:
-            self.health = 100
-            self.damage = 10
+        self.health, self.damage = Player.calculate_stats(self.job, self.player_level)
+
+    @staticmethod
+    def calculate_stats(job: str, player_level: int) -> tuple[int, int]:
+        """Returns the (health, damage) of a player with the given job and level."""
+        return get_stat_tables().get_player_stats(job, player_level)
 
     def get_job(self) -> str:
         """Return Player Job"""
@@ -131,3 +128,11 @@ class Player(AbstractCharacter):
         """Private helper to validate player level values."""
         if level not in Player.LEVEL_RANGE:
             raise ValueError(f"{display_value} is out of range, please enter 1-10")
+
+
+Index(
+    "ix_characters_type_job_level",
+    Player.__table__.c.type,
+    Player.__table__.c.job,
+    Player.__table__.c.player_level,
+)
@@ -0,0 +1,16 @@
+import sys
+from character_manager import CharacterManager
+from stat_tables import STAT_CONFIG_PATH, StatTables
+
+
+def main():
+    """Reload the stat config and rewrite stored health and damage to match it"""
+    config_path = sys.argv[1] if len(sys.argv) > 1 else STAT_CONFIG_PATH
+    acit = CharacterManager("ACIT", "characters.sqlite")
+
+    updated = acit.rebalance(StatTables.from_file(config_path))
+    print(f"Rebalanced {updated} characters using {config_path}.")
+
+
+if __name__ == "__main__":
+    main()
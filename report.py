@@ -11,9 +11,7 @@ def main():
     player2 = Player(2, "assassin")
     monster1 = Monster("dragon", "hard")
 
-    acit.add_character(player1)
-    acit.add_character(player2)
-    acit.add_character(monster1)
+    acit.add_characters([player1, player2, monster1])
 
     # print(acit.get(1).to_dict())
     print([c.to_dict() for c in acit.get_all()])
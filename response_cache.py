@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized responses keyed by route and data version"""
+
+    MAX_ENTRIES_LABEL = "Max Entries"
+
+    def __init__(self, max_entries: int = 256):
+        """Constructor - Initialize an empty cache holding at most max_entries responses."""
+
+        if not isinstance(max_entries, int) or isinstance(max_entries, bool):
+            raise ValueError(f"{self.MAX_ENTRIES_LABEL} must be an integer.")
+        if max_entries < 1:
+            raise ValueError(f"{self.MAX_ENTRIES_LABEL} must be a positive integer.")
+
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._data_version = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, route: str, data_version: int):
+        """Returns the response stored for route at data_version, or None."""
+        key = (route, data_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, route: str, data_version: int, entry):
+        """Stores a response for route at data_version.
+
+        Entries of older versions can never be hit again, so they are
+        dropped as soon as a newer version is stored."""
+        with self._lock:
+            if self._data_version is not None and data_version < self._data_version:
+                return
+            if data_version != self._data_version:
+                self._entries.clear()
+                self._data_version = data_version
+
+            self._entries[(route, data_version)] = entry
+            self._entries.move_to_end((route, data_version))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Returns the cache size, capacity and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
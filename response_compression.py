@@ -0,0 +1,94 @@
+import zlib
+
+GZIP_WBITS = 31  # zlib window bits selecting the gzip container
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_GZIP_MIN_SIZE = 1024
+# A GET body depends on Accept (JSON or NDJSON) and on Accept-Encoding
+VARY_HEADERS = ["Accept", "Accept-Encoding"]
+
+
+def accepts_gzip(request) -> bool:
+    """Returns True if the request's Accept-Encoding allows gzip"""
+    return request.accept_encodings["gzip"] > 0
+
+
+def gzip_etag(etag: str) -> str:
+    """Returns the strong ETag of the gzip-encoded form of a representation"""
+    return f"{etag}-gzip"
+
+
+def add_vary(response):
+    """Adds the request headers a response depends on to its Vary header"""
+    for header in VARY_HEADERS:
+        response.vary.add(header)
+
+
+def should_gzip(request, response, streamed: bool, min_size: int) -> bool:
+    """Returns True if a Flask or Quart response should be gzipped: it
+    succeeded, has no encoding yet, the client accepts gzip and the body is
+    streamed or at least min_size bytes. Every successful response gets the
+    Vary headers, whether or not it is compressed."""
+
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return False
+    add_vary(response)
+    if not accepts_gzip(request):
+        return False
+    return streamed or (response.content_length or 0) >= min_size
+
+
+def mark_gzipped(response, streamed: bool):
+    """Labels a response whose body was replaced by its gzip encoding. The
+    ETag gets a -gzip suffix, since the bytes differ, and a streamed body
+    loses its Content-Length."""
+
+    response.headers["Content-Encoding"] = "gzip"
+    if streamed:
+        response.headers.pop("Content-Length", None)
+    etag, _ = response.get_etag()
+    if etag is not None:
+        response.set_etag(gzip_etag(etag))
+
+
+def gzip_body(data: bytes, level: int = DEFAULT_GZIP_LEVEL) -> bytes:
+    """Compresses a whole response body into one gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def gzip_stream_compressor(level: int = DEFAULT_GZIP_LEVEL):
+    """Returns a compressor producing one gzip member across many chunks"""
+    return zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+
+def gzip_stream_chunk(compressor, chunk) -> bytes:
+    """Compresses one chunk of a stream and sync-flushes it, so clients can
+    decode everything sent so far without waiting for the end"""
+    if isinstance(chunk, str):
+        chunk = chunk.encode("utf-8")
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def gzip_chunks(chunks, level: int = DEFAULT_GZIP_LEVEL):
+    """Compresses a stream of chunks incrementally into one gzip member"""
+
+    compressor = gzip_stream_compressor(level)
+    for chunk in chunks:
+        compressed = gzip_stream_chunk(compressor, chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def cached_gzip_body(response_cache, cache_key, data: bytes, level: int) -> bytes:
+    """Returns data gzipped, reusing the body compressed for the same
+    (route, data version) cache_key when there is one"""
+
+    if cache_key is None:
+        return gzip_body(data, level)
+    route, data_version = cache_key
+    compressed = response_cache.get(f"gzip:{route}", data_version)
+    if compressed is None:
+        compressed = gzip_body(data, level)
+        response_cache.put(f"gzip:{route}", data_version, compressed)
+    return compressed
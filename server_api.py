@@ -1,122 +1,128 @@
-from flask import Flask, request, jsonify
+import functools
+from flask import (
+    Flask,
+    Response,
+    g,
+    request,
+    jsonify,
+    make_response,
+    stream_with_context,
+)
+from api_routes import (
+    NDJSON_MIMETYPE,
+    ROUTES,
+    ApiRequest,
+    request_etag,
+    revalidate,
+    tag_response,
+    wants_ndjson,
+)
 from character_manager import CharacterManager
-from monster import Monster
-from player import Player
+from response_cache import ResponseCache
+from response_compression import (
+    DEFAULT_GZIP_LEVEL,
+    DEFAULT_GZIP_MIN_SIZE,
+    cached_gzip_body,
+    gzip_chunks,
+    mark_gzipped,
+    should_gzip,
+)
 
 app = Flask(__name__)
+# Responses of at least GZIP_MIN_SIZE bytes are gzipped for clients that accept it
+app.config["GZIP_LEVEL"] = DEFAULT_GZIP_LEVEL
+app.config["GZIP_MIN_SIZE"] = DEFAULT_GZIP_MIN_SIZE
 
-server = CharacterManager("ACIT", "characters.sqlite")
+server = CharacterManager("ACIT", "characters.sqlite", cache_size=1000)
 
+response_cache = ResponseCache(max_entries=256)
 
-# API Methods
 
+def cached_get(view):
+    """Serves a GET route from the response cache while the data version is
+    unchanged and tags its 200 responses (see api_routes.request_etag)"""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        data_version = server.get_data_version()
+        etag = request_etag(request, data_version)
+        revalidated = revalidate(request, Response, etag)
+        if revalidated is not None:
+            return revalidated
+
+        if wants_ndjson(request):
+            return tag_response(make_response(view(*args, **kwargs)), etag)
 
-@app.route("/server/characters", methods=["POST"])
-def add_character():
-    """Adds a character to the Server"""
-    content = request.json
+        route = request.full_path
+        g.cache_key = (route, data_version)
+        cached = response_cache.get(route, data_version)
+        if cached is not None:
+            body, mimetype = cached
+            return tag_response(Response(body, status=200, mimetype=mimetype), etag)
 
-    try:
-        if content["type"] == "player":
-            character = Player(content["player_level"], content["job"])
-        else:
-            character = Monster(
-                content["monster_type"], content["monster_ai_difficulty"]
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            response_cache.put(
+                route, data_version, (response.get_data(), response.mimetype)
             )
+        return tag_response(response, etag)
+
+    return wrapper
+
 
-        server.add_character(character)
-
-        return "", 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/characters/<int:id>", methods=["GET"])
-def get_character(id):
-    """Gets an existing character from the Server"""
-    try:
-        character = server.get(id)
-        return jsonify(character.to_dict()), 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/characters/details/<int:id>", methods=["GET"])
-def get_character_details(id):
-    """Gets character details from the Server"""
-    print(id)
-    try:
-        character = server.get_character_details(id)
-        return jsonify(character), 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/characters/<int:id>", methods=["DELETE"])
-def delete_character(id):
-    """Delete an existing character from the Server"""
-    try:
-        server.delete_character(id)
-        return "", 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/characters/all/<string:character_type>", methods=["GET"])
-def get_all_by_type(character_type):
-    """Gets all existing characters from the Server by type"""
-    try:
-        result = server.get_character_details_by_type(character_type)
-        return jsonify(result), 200
-    except ValueError as e:
-        return str(e), 400
-
-
-@app.route("/server/characters/all", methods=["GET"])
-def get_all():
-    """Gets all existing characters from the Server"""
-    try:
-        characters = server.get_all()
-        character_list = [character.to_dict() for character in characters]
-        return jsonify(character_list), 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/characters/all_details", methods=["GET"])
-def get_all_details():
-    """Gets all existing characters from the Server"""
-    try:
-        return jsonify(server.get_all_character_details()), 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/character/<int:id>", methods=["PUT"])
-def update_character(id):
-    """Update existing character in the Server"""
-    content = request.json
-    try:
-        current = server.get(id)
-        if current.get_type() == "player":
-            server.update_character(id, content["job"], content["player_level"])
-        else:
-            server.update_character(
-                id, content["monster_type"], content["monster_ai_difficulty"]
+@app.after_request
+def compress_response(response):
+    """Gzips responses as response_compression.should_gzip decides, reusing
+    the compressed body of a cached response"""
+
+    streamed = response.is_streamed
+    if not should_gzip(request, response, streamed, app.config["GZIP_MIN_SIZE"]):
+        return response
+
+    level = app.config["GZIP_LEVEL"]
+    if streamed:
+        response.response = gzip_chunks(response.iter_encoded(), level)
+    else:
+        response.set_data(
+            cached_gzip_body(
+                response_cache, g.get("cache_key"), response.get_data(), level
             )
-        return "", 200
-    except ValueError as e:
-        return str(e), 404
-
-
-@app.route("/server/serverstats", methods=["GET"])
-def get_server_stats():
-    """Gets server stats"""
-    try:
-        stats = server.get_server_stats().to_dict()
-        return jsonify(stats), 200
-    except ValueError as e:
-        return str(e), 404
+        )
+    mark_gzipped(response, streamed)
+    return response
+
+
+def to_response(result):
+    """Turns a route handler's ApiResult into a Flask response"""
+    if result.kind == "ndjson":
+        return Response(stream_with_context(result.body), mimetype=NDJSON_MIMETYPE)
+    if result.kind == "json":
+        return jsonify(result.body), result.status
+    return result.body, result.status
+
+
+def add_route(route):
+    """Registers one shared API route on the Flask app"""
+
+    def view(**view_args):
+        api_request = ApiRequest(
+            request.args,
+            request.json if route.reads_body else None,
+            wants_ndjson(request),
+        )
+        return to_response(route.handler(server, api_request, **view_args))
+
+    view.__name__ = route.handler.__name__
+    view.__doc__ = route.handler.__doc__
+    if route.cached:
+        view = cached_get(view)
+    app.add_url_rule(route.rule, view_func=view, methods=[route.method])
+
+
+# API Methods
+
+for api_route in ROUTES:
+    add_route(api_route)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, Response, g, request, jsonify, make_response
+from quart.wrappers.response import IterableBody
+from api_routes import (
+    NDJSON_MIMETYPE,
+    ROUTES,
+    ApiRequest,
+    request_etag,
+    revalidate,
+    tag_response,
+    wants_ndjson,
+)
+from character_manager import CharacterManager
+from engine_profile import EngineProfile
+from response_cache import ResponseCache
+from response_compression import (
+    DEFAULT_GZIP_LEVEL,
+    DEFAULT_GZIP_MIN_SIZE,
+    cached_gzip_body,
+    gzip_stream_chunk,
+    gzip_stream_compressor,
+    mark_gzipped,
+    should_gzip,
+)
+
+app = Quart(__name__)
+# Responses of at least GZIP_MIN_SIZE bytes are gzipped for clients that accept it
+app.config["GZIP_LEVEL"] = DEFAULT_GZIP_LEVEL
+app.config["GZIP_MIN_SIZE"] = DEFAULT_GZIP_MIN_SIZE
+
+engine_profile = EngineProfile()
+server = CharacterManager(
+    "ACIT", "characters.sqlite", cache_size=1000, engine_profile=engine_profile
+)
+
+# One worker per pooled connection: database calls beyond that wait in the
+# executor queue instead of blocking the event loop or opening threads
+pool_settings = engine_profile.get_pool_settings()
+DB_WORKERS = pool_settings["pool_size"] + pool_settings["max_overflow"]
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
+response_cache = ResponseCache(max_entries=256)
+
+inflight_responses = {}
+
+
+async def run_db(function, *args, **kwargs):
+    """Runs a blocking CharacterManager call on the database executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor, functools.partial(function, *args, **kwargs)
+    )
+
+
+def cached_get(view):
+    """Serves a GET route from the response cache while the data version is
+    unchanged and tags its 200 responses (see api_routes.request_etag).
+    Only the data version is read on the database executor for cache hits
+    and 304s, and concurrent misses for the same route and version share a
+    single database call."""
+
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        data_version = await run_db(server.get_data_version)
+        etag = request_etag(request, data_version)
+        revalidated = revalidate(request, Response, etag)
+        if revalidated is not None:
+            return revalidated
+
+        if wants_ndjson(request):
+            return tag_response(await make_response(await view(*args, **kwargs)), etag)
+
+        route = request.full_path
+        g.cache_key = (route, data_version)
+        cached = response_cache.get(route, data_version)
+        if cached is not None:
+            body, mimetype = cached
+            return tag_response(Response(body, status=200, mimetype=mimetype), etag)
+
+        key = (route, data_version)
+        pending = inflight_responses.get(key)
+        if pending is not None:
+            shared = await asyncio.shield(pending)
+            if shared is not None:
+                body, status, mimetype = shared
+                response = Response(body, status=status, mimetype=mimetype)
+            else:
+                response = await make_response(await view(*args, **kwargs))
+            return tag_response(response, etag)
+
+        future = asyncio.get_running_loop().create_future()
+        inflight_responses[key] = future
+        try:
+            response = await make_response(await view(*args, **kwargs))
+            body = await response.get_data()
+            future.set_result((body, response.status_code, response.mimetype))
+            if response.status_code == 200:
+                response_cache.put(route, data_version, (body, response.mimetype))
+            return tag_response(response, etag)
+        finally:
+            # Waiters run the view themselves if this request failed
+            if not future.done():
+                future.set_result(None)
+            inflight_responses.pop(key, None)
+
+    return wrapper
+
+
+async def gzip_iterable_body(body, level):
+    """Compresses a streamed response body chunk by chunk on the event loop"""
+    compressor = gzip_stream_compressor(level)
+    async with body as chunks:
+        async for chunk in chunks:
+            compressed = gzip_stream_chunk(compressor, chunk)
+            if compressed:
+                yield compressed
+    yield compressor.flush()
+
+
+@app.after_request
+async def compress_response(response):
+    """Gzips responses as response_compression.should_gzip decides. Streams
+    are compressed on the event loop, whole bodies on the database executor
+    so large ones do not stall it."""
+
+    streamed = isinstance(response.response, IterableBody)
+    if not should_gzip(request, response, streamed, app.config["GZIP_MIN_SIZE"]):
+        return response
+
+    level = app.config["GZIP_LEVEL"]
+    if streamed:
+        response.response = IterableBody(gzip_iterable_body(response.response, level))
+    else:
+        response.set_data(
+            await run_db(
+                cached_gzip_body,
+                response_cache,
+                g.get("cache_key"),
+                await response.get_data(),
+                level,
+            )
+        )
+    mark_gzipped(response, streamed)
+    return response
+
+
+def ndjson_body(chunks):
+    """Streams NDJSON chunks, pulling each one (a step of the query) on the
+    database executor"""
+
+    async def generate():
+        while (chunk := await run_db(next, chunks, None)) is not None:
+            yield chunk
+
+    return generate()
+
+
+def to_response(result):
+    """Turns a route handler's ApiResult into a Quart response"""
+    if result.kind == "ndjson":
+        return Response(ndjson_body(result.body), mimetype=NDJSON_MIMETYPE)
+    if result.kind == "json":
+        return jsonify(result.body), result.status
+    return result.body, result.status
+
+
+def add_route(route):
+    """Registers one shared API route on the Quart app; its handler runs on
+    the database executor"""
+
+    async def view(**view_args):
+        api_request = ApiRequest(
+            request.args,
+            await request.get_json() if route.reads_body else None,
+            wants_ndjson(request),
+        )
+        return to_response(
+            await run_db(route.handler, server, api_request, **view_args)
+        )
+
+    view.__name__ = route.handler.__name__
+    view.__doc__ = route.handler.__doc__
+    if route.cached:
+        view = cached_get(view)
+    app.add_url_rule(route.rule, view_func=view, methods=[route.method])
+
+
+# API Methods
+
+for api_route in ROUTES:
+    add_route(api_route)
+
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5001)
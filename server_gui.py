@@ -39,6 +39,8 @@ class MainAppController(tk.Frame):
         self._num_players = tk.IntVar()
         self._avg_player_level = tk.IntVar()
         self._avg_monster_ai_difficulty = tk.StringVar()
+        # Last ETag-tagged GET response per URL, revalidated with If-None-Match
+        self._validated_responses = {}
 
     def _init_widgets(self):
         tk.Label(self, text="Characters in the Server").grid(
@@ -88,9 +90,22 @@ class MainAppController(tk.Frame):
         self._server_stats()
 
     def _safe_request(self, method, url, **kwargs):
+        headers = kwargs.pop("headers", {})
+        # requests decodes gzip bodies transparently
+        headers.setdefault("Accept-Encoding", "gzip")
+        cached = self._validated_responses.get(url) if method == "GET" else None
+        if cached is not None:
+            headers["If-None-Match"] = cached.headers["ETag"]
+
         try:
-            response = requests.request(method, url, timeout=5, **kwargs)
+            response = requests.request(
+                method, url, timeout=5, headers=headers, **kwargs
+            )
             response.raise_for_status()
+            if response.status_code == 304:
+                return cached
+            if method == "GET" and "ETag" in response.headers:
+                self._validated_responses[url] = response
             return response
         except requests.RequestException as e:
             messagebox.showerror("Error", f"Request failed: {e}")
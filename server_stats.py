@@ -31,6 +31,46 @@ class ServerStats:
             raise ValueError("Invalid average monster AI difficulty value")
         self._avg_monster_ai_difficulty = avg_monster_ai_difficulty
 
+    @classmethod
+    def from_totals(
+        cls,
+        num_players: int,
+        num_monsters: int,
+        total_player_level: int,
+        total_monster_difficulty_score: int,
+    ) -> "ServerStats":
+        """Builds server stats from per-type counts and summed values.
+
+        Averages are derived here so every caller applies the same
+        rounding and "not available" rules.
+        """
+
+        avg_player_level = (
+            int(total_player_level / num_players) if num_players != 0 else 0
+        )
+
+        avg_monster_ai_difficulty_score = (
+            total_monster_difficulty_score / num_monsters if num_monsters != 0 else 0
+        )
+
+        avg_monster_ai_difficulty_str: str
+        if avg_monster_ai_difficulty_score == 0:
+            avg_monster_ai_difficulty_str = "not available"
+        elif round(avg_monster_ai_difficulty_score) == 1:
+            avg_monster_ai_difficulty_str = "easy"
+        elif round(avg_monster_ai_difficulty_score) == 2:
+            avg_monster_ai_difficulty_str = "normal"
+        else:
+            avg_monster_ai_difficulty_str = "hard"
+
+        return cls(
+            num_players + num_monsters,
+            num_monsters,
+            num_players,
+            avg_player_level,
+            avg_monster_ai_difficulty_str,
+        )
+
     @property
     def total_num_characters(self) -> int:
         """Returns the total number of characters."""
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer
+from base import Base
+
+
+class ServerStatsCounter(Base):
+    """Represent the running totals kept for one character type"""
+
+    __tablename__ = "server_stats_counters"
+
+    character_type: Column[String] = Column(String(7), primary_key=True)
+    num_characters: Column[Integer] = Column(Integer, nullable=False, default=0)
+    total_player_level: Column[Integer] = Column(Integer, nullable=False, default=0)
+    total_monster_difficulty_score: Column[Integer] = Column(
+        Integer, nullable=False, default=0
+    )
+
+    COUNTER_FIELDS = [
+        "num_characters",
+        "total_player_level",
+        "total_monster_difficulty_score",
+    ]
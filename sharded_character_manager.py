@@ -0,0 +1,858 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from heapq import merge
+from itertools import count, islice
+
+from abstract_character import AbstractCharacter
+from player import Player
+from monster import Monster
+from server_stats import ServerStats
+from server_stats_counter import ServerStatsCounter
+from character_manager import CharacterManager
+from character_snapshot import CharacterSnapshot
+from character_view import CharacterView
+from engine_profile import EngineProfile
+from stat_tables import StatTables
+
+from sqlalchemy.engine import Engine
+
+
+class ShardedCharacterManager:
+    """Spreads characters over several database files, one CharacterManager
+    per shard, behind the same public API as CharacterManager.
+
+    The shard is encoded in every character ID: a character stored with
+    local ID n in shard s has the global ID n * shard_count + s, so single
+    character operations go straight to one shard and fan-out operations
+    run on every shard in parallel before their results are merged."""
+
+    SHARDS_LABEL = "Database Names"
+    # Shard-local IDs quoted in error messages, rewritten to global IDs
+    ERROR_ID_PATTERN = re.compile(r"\b(IDs?) (-?\d+(?:, -?\d+)*)\b")
+
+    def __init__(
+        self,
+        server_name: str,
+        db_filenames: list[str],
+        engines: list[Engine] = None,
+        cache_size: int = 0,
+        engine_profile: EngineProfile = None,
+        spatial_cell_size: int = None,
+    ):
+        """
+        Constructor - Initializes one CharacterManager per database file.
+        engines, when given, holds one engine per file in the same order;
+        the other parameters are passed to every shard. New characters are
+        spread over the shards round-robin.
+        """
+
+        if not isinstance(db_filenames, (list, tuple)) or not db_filenames:
+            raise ValueError(
+                f"{self.SHARDS_LABEL} must be a non-empty list of file names."
+            )
+        if len(set(db_filenames)) != len(db_filenames):
+            raise ValueError(f"{self.SHARDS_LABEL} must not contain duplicates.")
+        if engines is None:
+            engines = [None] * len(db_filenames)
+        if not isinstance(engines, (list, tuple)) or len(engines) != len(db_filenames):
+            raise ValueError("Engines must be a list with one engine per shard.")
+
+        self._shards = [
+            CharacterManager(
+                server_name,
+                db_filename,
+                engine=engine,
+                cache_size=cache_size,
+                engine_profile=engine_profile,
+                spatial_cell_size=spatial_cell_size,
+            )
+            for db_filename, engine in zip(db_filenames, engines)
+        ]
+        self._server_name = server_name
+        self._db_filenames = list(db_filenames)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._shards), thread_name_prefix="shard"
+        )
+        self._next_shard = count()
+        self._next_shard_lock = threading.Lock()
+
+    def close(self):
+        """Shuts down the thread pool that runs the per-shard calls."""
+        self._executor.shutdown()
+
+    def __enter__(self):
+        """Returns the manager itself for use in a with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the manager when the with statement ends."""
+        self.close()
+
+    def get_shard_count(self) -> int:
+        """Returns the number of shards."""
+        return len(self._shards)
+
+    def get_shard_index(self, char_id: int) -> int:
+        """Returns the index of the shard holding the given character ID."""
+
+        self._validate_integer_id(CharacterManager.ID_LABEL, char_id)
+        return char_id % len(self._shards)
+
+    def _validate_integer_id(self, display_name: str, id_value):
+        """Private helper to validate that an ID is an integer."""
+        self._shards[0]._validate_integer_id(display_name, id_value)
+
+    def _validate_positive_integer(self, display_name: str, value):
+        """Private helper to validate that a value is a positive integer."""
+        self._shards[0]._validate_positive_integer(display_name, value)
+
+    def _to_global(self, shard_index: int, local_id: int) -> int:
+        """Private helper turning a shard-local ID into a global ID."""
+        return local_id * len(self._shards) + shard_index
+
+    def _route(self, char_id: int) -> tuple[int, int]:
+        """Private helper validating a global ID and returning (shard, local ID)."""
+
+        self._validate_integer_id(CharacterManager.ID_LABEL, char_id)
+        local_id, shard_index = divmod(char_id, len(self._shards))
+        return shard_index, local_id
+
+    def _group_ids(self, ids) -> list[list[int]]:
+        """Private helper splitting validated global IDs into local IDs per shard."""
+
+        ids = self._shards[0]._validate_id_list(ids)
+        groups = [[] for _ in self._shards]
+        for char_id in dict.fromkeys(ids):
+            local_id, shard_index = divmod(char_id, len(self._shards))
+            groups[shard_index].append(local_id)
+        return groups
+
+    def _pick_shard(self) -> int:
+        """Private helper returning the shard that receives the next new character."""
+
+        with self._next_shard_lock:
+            return next(self._next_shard) % len(self._shards)
+
+    @contextmanager
+    def _global_errors(self, shard_index: int):
+        """Private helper rewriting shard-local IDs in raised errors as global IDs."""
+
+        try:
+            yield
+        except ValueError as e:
+            raise ValueError(self._globalize_message(shard_index, str(e))) from e
+
+    def _globalize_message(self, shard_index: int, message: str) -> str:
+        """Private helper rewriting the shard-local IDs quoted in a message."""
+
+        def globalize(match):
+            ids = match.group(2).split(", ")
+            global_ids = (self._to_global(shard_index, int(i)) for i in ids)
+            return f"{match.group(1)} {', '.join(map(str, global_ids))}"
+
+        return self.ERROR_ID_PATTERN.sub(globalize, message)
+
+    def _fan_out(self, call) -> list:
+        """
+        Private helper running call(shard_index, shard) on every shard in
+        parallel and returning the results in shard order. The first error
+        is raised with its IDs rewritten as global IDs.
+        """
+
+        def run(shard_index):
+            with self._global_errors(shard_index):
+                return call(shard_index, self._shards[shard_index])
+
+        return list(self._executor.map(run, range(len(self._shards))))
+
+    def _globalize_character(
+        self, shard_index: int, character: AbstractCharacter
+    ) -> AbstractCharacter:
+        """
+        Private helper returning a copy of a loaded character that carries its
+        global ID. The loaded instance keeps its shard-local identity.
+        """
+
+        if character is None:
+            return None
+        character_class, values = CharacterManager._take_snapshot(character)
+        values["id"] = self._to_global(shard_index, values["id"])
+        return CharacterManager._restore_snapshot((character_class, values))
+
+    def _globalize_view(self, shard_index: int, view: CharacterView) -> CharacterView:
+        """Private helper returning a view carrying its global ID."""
+        return view._replace(id=self._to_global(shard_index, view.id))
+
+    def get_engine_settings(self) -> dict:
+        """
+        Returns the settings of the first shard, which every shard shares,
+        with the pool checkouts summed over all shards.
+        """
+
+        all_settings = self._fan_out(lambda _, shard: shard.get_engine_settings())
+        settings = dict(all_settings[0])
+        if "pool_checked_out" in settings:
+            settings["pool_checked_out"] = sum(
+                shard_settings.get("pool_checked_out", 0)
+                for shard_settings in all_settings
+            )
+        settings["shard_count"] = len(self._shards)
+        return settings
+
+    def add_character(self, character_obj: AbstractCharacter) -> int:
+        """Adds a character object to the next shard and returns its global ID."""
+
+        shard_index = self._pick_shard()
+        with self._global_errors(shard_index):
+            local_id = self._shards[shard_index].add_character(character_obj)
+        return self._to_global(shard_index, local_id)
+
+    def add_characters(self, characters, batch_size: int = 1000) -> list[int]:
+        """
+        Adds many character objects and returns their global IDs in input
+        order. Each batch is dealt round-robin over the shards, which insert
+        their share in parallel. Batches before an invalid object stay committed.
+        """
+
+        if characters is None:
+            raise ValueError("Characters cannot be undefined (None).")
+        self._validate_positive_integer(CharacterManager.BATCH_SIZE_LABEL, batch_size)
+
+        new_ids = []
+        iterator = iter(characters)
+        while batch := list(islice(iterator, batch_size)):
+            # Validate the whole batch first so no shard commits part of it
+            for character_obj in batch:
+                self._shards[0]._validate_character_object(character_obj)
+            shard_indexes = [self._pick_shard() for _ in batch]
+            shares = [[] for _ in self._shards]
+            for shard_index, character_obj in zip(shard_indexes, batch):
+                shares[shard_index].append(character_obj)
+
+            local_ids = self._fan_out(
+                lambda shard_index, shard: shard.add_characters(
+                    shares[shard_index], batch_size
+                )
+            )
+            local_ids = [iter(shard_ids) for shard_ids in local_ids]
+            new_ids.extend(
+                self._to_global(shard_index, next(local_ids[shard_index]))
+                for shard_index in shard_indexes
+            )
+
+        return new_ids
+
+    def character_exists(self, char_id: int) -> bool:
+        """Checks if a character with the given global ID exists."""
+
+        shard_index, local_id = self._route(char_id)
+        return self._shards[shard_index].character_exists(local_id)
+
+    def existing_ids(self, ids: list[int], chunk_size: int = 500) -> set[int]:
+        """Returns the subset of ids that exist, checking every shard in parallel."""
+
+        self._validate_positive_integer(CharacterManager.CHUNK_SIZE_LABEL, chunk_size)
+        groups = self._group_ids(ids)
+
+        found = self._fan_out(
+            lambda shard_index, shard: shard.existing_ids(
+                groups[shard_index], chunk_size
+            )
+        )
+        return {
+            self._to_global(shard_index, local_id)
+            for shard_index, local_ids in enumerate(found)
+            for local_id in local_ids
+        }
+
+    def get(self, char_id: int) -> AbstractCharacter:
+        """Retrieves a character object by global ID from its shard."""
+
+        shard_index, local_id = self._route(char_id)
+        with self._global_errors(shard_index):
+            character = self._shards[shard_index].get(local_id)
+        return self._globalize_character(shard_index, character)
+
+    def get_many(self, ids: list[int], chunk_size: int = 500) -> list:
+        """
+        Retrieves many characters by global ID and returns them in request
+        order, with None in place of each ID that does not exist.
+        """
+
+        self._validate_positive_integer(CharacterManager.CHUNK_SIZE_LABEL, chunk_size)
+        groups = self._group_ids(ids)
+
+        loaded = self._fan_out(
+            lambda shard_index, shard: shard.get_many(groups[shard_index], chunk_size)
+        )
+        found = {}
+        for shard_index, characters in enumerate(loaded):
+            for character in characters:
+                if character is not None:
+                    character = self._globalize_character(shard_index, character)
+                    found[character.id] = character
+        return [found.get(char_id) for char_id in ids]
+
+    def get_data_version(self) -> int:
+        """
+        Returns the sum of the shard data versions, which increases after
+        every committed write on any shard.
+        """
+
+        return sum(shard.get_data_version() for shard in self._shards)
+
+    def get_cache_stats(self) -> dict:
+        """Returns the character cache counters summed over all shards."""
+
+        totals = {}
+        for shard in self._shards:
+            for key, value in shard.get_cache_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def get_all(self) -> list[AbstractCharacter]:
+        """Returns all characters from every shard, players first, each in ID order."""
+
+        return self.get_all_by_type(Player.CHARACTER_TYPE) + self.get_all_by_type(
+            Monster.CHARACTER_TYPE
+        )
+
+    def get_all_by_type(self, character_type: str) -> list[AbstractCharacter]:
+        """Returns the characters of one type from every shard, in ID order."""
+
+        self._shards[0]._get_character_class(character_type)
+        characters = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_character(shard_index, character)
+                for character in shard.get_all_by_type(character_type)
+            ]
+        )
+        return sorted(
+            (
+                character
+                for shard_characters in characters
+                for character in shard_characters
+            ),
+            key=lambda character: character.id,
+        )
+
+    def _validate_cursor(self, after_id: int, page_size: int):
+        """Private helper validating a keyset cursor and page size."""
+
+        if after_id is not None:
+            self._validate_integer_id(CharacterManager.AFTER_ID_LABEL, after_id)
+        self._validate_positive_integer(CharacterManager.PAGE_SIZE_LABEL, page_size)
+
+    def _local_after_id(self, shard_index: int, after_id: int) -> int:
+        """
+        Private helper translating a global keyset cursor into a shard's
+        local cursor: the largest local ID whose global ID is <= after_id.
+        """
+
+        if after_id is None:
+            return None
+        return (after_id - shard_index) // len(self._shards)
+
+    def _merge_shard_iterators(self, iterators) -> object:
+        """Private helper merging per-shard iterators (each in ID order) by global ID."""
+        return merge(*iterators, key=lambda item: item.id)
+
+    def iter_all(
+        self, character_type: str = None, after_id: int = None, page_size: int = 1000
+    ):
+        """
+        Returns an iterator over characters of every shard in global ID
+        order. Each shard is paged lazily and the pages are merged, so
+        memory stays bounded by page_size per shard.
+        """
+
+        self._validate_cursor(after_id, page_size)
+        iterators = [
+            map(
+                lambda character, shard_index=shard_index: self._globalize_character(
+                    shard_index, character
+                ),
+                shard.iter_all(
+                    character_type,
+                    self._local_after_id(shard_index, after_id),
+                    page_size,
+                ),
+            )
+            for shard_index, shard in enumerate(self._shards)
+        ]
+        return self._merge_shard_iterators(iterators)
+
+    def get_page(
+        self, character_type: str = None, after_id: int = None, page_size: int = 100
+    ) -> tuple[list[AbstractCharacter], int]:
+        """
+        Returns one keyset page of characters in global ID order and the
+        cursor for the next page, which is None after the last page.
+        """
+
+        self._validate_cursor(after_id, page_size)
+        characters = list(
+            islice(
+                self.iter_all(character_type, after_id, page_size + 1), page_size + 1
+            )
+        )
+        if len(characters) > page_size:
+            characters = characters[:page_size]
+            return characters, characters[-1].id
+        return characters, None
+
+    def get_view(self, char_id: int) -> CharacterView:
+        """Returns a read-only view of one character by global ID."""
+
+        shard_index, local_id = self._route(char_id)
+        with self._global_errors(shard_index):
+            view = self._shards[shard_index].get_view(local_id)
+        return self._globalize_view(shard_index, view)
+
+    def get_views(self, character_type: str = None) -> list[CharacterView]:
+        """
+        Returns read-only views of all characters, or of one type, from every
+        shard. Like get_all, players come first, each type in ID order.
+        """
+
+        if character_type is not None:
+            self._shards[0]._get_character_class(character_type)
+        views = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_view(shard_index, view)
+                for view in shard.get_views(character_type)
+            ]
+        )
+        return sorted(
+            (view for shard_views in views for view in shard_views),
+            key=lambda view: (view.type != Player.CHARACTER_TYPE, view.id),
+        )
+
+    def iter_views(
+        self, character_type: str = None, after_id: int = None, page_size: int = 1000
+    ):
+        """Returns an iterator over read-only views of every shard in global ID order."""
+
+        self._validate_cursor(after_id, page_size)
+        iterators = [
+            map(
+                lambda view, shard_index=shard_index: self._globalize_view(
+                    shard_index, view
+                ),
+                shard.iter_views(
+                    character_type,
+                    self._local_after_id(shard_index, after_id),
+                    page_size,
+                ),
+            )
+            for shard_index, shard in enumerate(self._shards)
+        ]
+        return self._merge_shard_iterators(iterators)
+
+    def find_characters(
+        self, filters: dict = None, sort: list[str] = None, limit: int = None
+    ) -> list[CharacterView]:
+        """
+        Returns read-only views of the characters matching filters, ordered
+        by sort and cut at limit. Every shard evaluates the query in SQL and
+        returns at most limit rows; those are merged in the same order.
+        """
+
+        views = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_view(shard_index, view)
+                for view in shard.find_characters(filters, sort, limit)
+            ]
+        )
+        views = sorted(
+            (view for shard_views in views for view in shard_views),
+            key=lambda view: view.id,
+        )
+
+        # Stable sorts from the last key to the first reproduce ORDER BY
+        sort_keys = []
+        for key in sort or []:
+            sort_keys.append(key)
+            if key.removeprefix("-") == "id":
+                break
+        for key in reversed(sort_keys):
+            views.sort(
+                key=self._sort_value(key.removeprefix("-")), reverse=key.startswith("-")
+            )
+
+        return views if limit is None else views[:limit]
+
+    @staticmethod
+    def _sort_value(column_name: str):
+        """
+        Private helper returning a sort key for one view column that orders
+        like SQLite: NULLs first, difficulties ranked easy < normal < hard.
+        """
+
+        def value(view):
+            column_value = getattr(view, column_name)
+            if column_name == "monster_ai_difficulty" and column_value is not None:
+                column_value = Monster.MONSTER_AI_DIFFICULTY_SCORE[column_value]
+            return (column_value is not None, column_value)
+
+        return value
+
+    def snapshot(self) -> CharacterSnapshot:
+        """Returns a columnar snapshot of every character of every shard."""
+
+        return self.refresh_snapshot(CharacterSnapshot())
+
+    def refresh_snapshot(
+        self, snapshot: CharacterSnapshot, chunk_size: int = 500
+    ) -> CharacterSnapshot:
+        """
+        Brings a snapshot up to date and returns it. Shard change logs are
+        not merged, so a snapshot behind the current data version is
+        reloaded in full from the merged shard views.
+        """
+
+        if not isinstance(snapshot, CharacterSnapshot):
+            raise ValueError("Snapshot must be an instance of CharacterSnapshot.")
+        self._validate_positive_integer(CharacterManager.CHUNK_SIZE_LABEL, chunk_size)
+
+        # Read the version first: rows written meanwhile are fetched again next time
+        version = self.get_data_version()
+        if snapshot.get_version() != version:
+            snapshot.load(self.iter_views(page_size=10000), version)
+        return snapshot
+
+    def characters_in_rect(
+        self,
+        min_x: int,
+        min_y: int,
+        max_x: int,
+        max_y: int,
+        character_type: str = None,
+    ) -> list[AbstractCharacter]:
+        """Returns the characters of every shard inside the inclusive rectangle, in ID order."""
+
+        characters = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_character(shard_index, character)
+                for character in shard.characters_in_rect(
+                    min_x, min_y, max_x, max_y, character_type
+                )
+            ]
+        )
+        return sorted(
+            (
+                character
+                for shard_characters in characters
+                for character in shard_characters
+            ),
+            key=lambda character: character.id,
+        )
+
+    def characters_within_radius(
+        self, x: int, y: int, radius: int, character_type: str = None
+    ) -> list[AbstractCharacter]:
+        """Returns the characters of every shard within radius of (x, y), nearest first."""
+
+        characters = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_character(shard_index, character)
+                for character in shard.characters_within_radius(
+                    x, y, radius, character_type
+                )
+            ]
+        )
+        return self._by_distance(characters, x, y)
+
+    def nearest(
+        self, k: int, x: int, y: int, character_type: str = None
+    ) -> list[AbstractCharacter]:
+        """
+        Returns up to k characters closest to (x, y) over all shards, nearest
+        first (ties by ID). Each shard returns its own k nearest.
+        """
+
+        characters = self._fan_out(
+            lambda shard_index, shard: [
+                self._globalize_character(shard_index, character)
+                for character in shard.nearest(k, x, y, character_type)
+            ]
+        )
+        return self._by_distance(characters, x, y)[:k]
+
+    @staticmethod
+    def _by_distance(characters: list[list], x: int, y: int) -> list:
+        """Private helper merging per-shard results by distance to (x, y), then ID."""
+
+        return sorted(
+            (
+                character
+                for shard_characters in characters
+                for character in shard_characters
+            ),
+            key=lambda character: (
+                (character.x - x) ** 2 + (character.y - y) ** 2,
+                character.id,
+            ),
+        )
+
+    def update_character(
+        self, char_id: int, type_specific_param1, type_specific_param2
+    ) -> int:
+        """
+        Updates a character's type-specific attributes on its shard and
+        returns the affected row count.
+        """
+
+        shard_index, local_id = self._route(char_id)
+        with self._global_errors(shard_index):
+            return self._shards[shard_index].update_character(
+                local_id, type_specific_param1, type_specific_param2
+            )
+
+    def move_many(self, moves, chunk_size: int = 500) -> int:
+        """
+        Moves many characters at once from (id, x, y) triples and returns the
+        number of characters moved. Every move is validated and every ID is
+        checked on its shard before the shards apply their moves in parallel,
+        each in its own transaction.
+        """
+
+        if not isinstance(moves, (list, tuple)):
+            raise ValueError("Moves must be a list of [id, x, y] entries.")
+        self._validate_positive_integer(CharacterManager.CHUNK_SIZE_LABEL, chunk_size)
+
+        shares = [[] for _ in self._shards]
+        for move in moves:
+            if not isinstance(move, (list, tuple)) or len(move) != 3:
+                raise ValueError("Each move must be an [id, x, y] entry.")
+            char_id, x, y = move
+            shard_index, local_id = self._route(char_id)
+            AbstractCharacter._validate_position_input(AbstractCharacter.X_LABEL, x)
+            AbstractCharacter._validate_position_input(AbstractCharacter.Y_LABEL, y)
+            shares[shard_index].append((local_id, x, y))
+
+        ids = list(dict.fromkeys(move[0] for move in moves))
+        found = self.existing_ids(ids, chunk_size)
+        missing = [char_id for char_id in ids if char_id not in found]
+        if missing:
+            raise ValueError(
+                f"Characters with IDs {', '.join(map(str, missing))} do not exist."
+            )
+
+        return sum(
+            self._fan_out(
+                lambda shard_index, shard: shard.move_many(
+                    shares[shard_index], chunk_size
+                )
+            )
+        )
+
+    def execute_batch(self, operations, atomic: bool = True) -> list[dict]:
+        """
+        Runs a list of mixed operations and returns one result per operation,
+        in order, like CharacterManager.execute_batch. Creates go to the next
+        shard; updates and deletes go to the shard of their ID.
+        An atomic batch runs in one transaction and therefore has to stay
+        within one shard. Otherwise the shards run their share in parallel.
+        """
+
+        if not isinstance(operations, (list, tuple)):
+            raise ValueError(f"{CharacterManager.OPERATIONS_LABEL} must be a list.")
+
+        routed = [self._route_operation(operation) for operation in operations]
+
+        if atomic:
+            shard_indexes = {
+                shard_index for shard_index, _ in routed if shard_index is not None
+            }
+            if len(shard_indexes) > 1:
+                raise ValueError(
+                    "Atomic batches cannot span shards; use atomic=False instead."
+                )
+            shard_index = shard_indexes.pop() if shard_indexes else self._pick_shard()
+            with self._global_errors(shard_index):
+                results = self._shards[shard_index].execute_batch(
+                    [operation for _, operation in routed]
+                )
+            return [
+                dict(result, id=self._to_global(shard_index, result["id"]))
+                for result in results
+            ]
+
+        shares = [[] for _ in self._shards]
+        for index, (shard_index, operation) in enumerate(routed):
+            if shard_index is None:
+                shard_index = self._pick_shard()
+            shares[shard_index].append((index, operation))
+
+        shard_results = self._fan_out(
+            lambda shard_index, shard: shard.execute_batch(
+                [operation for _, operation in shares[shard_index]], atomic=False
+            )
+        )
+
+        results = [None] * len(operations)
+        for shard_index, share in enumerate(shares):
+            for (index, _), result in zip(share, shard_results[shard_index]):
+                result = dict(result, index=index)
+                if result["ok"]:
+                    result["id"] = self._to_global(shard_index, result["id"])
+                else:
+                    result["id"] = CharacterManager._batch_operation_id(
+                        operations[index]
+                    )
+                    result["error"] = self._globalize_message(
+                        shard_index, result["error"]
+                    )
+                results[index] = result
+        return results
+
+    def _route_operation(self, operation) -> tuple:
+        """
+        Private helper returning (shard, operation) for one batch operation.
+        Operations naming an integer ID get the shard-local ID; the shard is
+        None for creates and malformed operations, which any shard can run.
+        """
+
+        if not isinstance(operation, dict):
+            return None, operation
+        char_id = operation.get("id")
+        if operation.get("op") == "create" or not isinstance(char_id, int):
+            return None, operation
+        local_id, shard_index = divmod(char_id, len(self._shards))
+        return shard_index, dict(operation, id=local_id)
+
+    def delete_character(self, char_id: int):
+        """Deletes an existing character by global ID from its shard."""
+
+        shard_index, local_id = self._route(char_id)
+        with self._global_errors(shard_index):
+            self._shards[shard_index].delete_character(local_id)
+
+    def delete_characters(
+        self, ids: list[int] = None, filters: dict = None, chunk_size: int = 500
+    ) -> int:
+        """
+        Deletes characters either by a list of global IDs or by an attribute
+        filter on every shard in parallel, and returns the number of deleted
+        rows. IDs that do not exist are ignored.
+        """
+
+        if (ids is None) == (filters is None):
+            raise ValueError("Provide either IDs or a filter to delete characters.")
+        self._validate_positive_integer(CharacterManager.CHUNK_SIZE_LABEL, chunk_size)
+
+        if ids is not None:
+            groups = self._group_ids(ids)
+            return sum(
+                self._fan_out(
+                    lambda shard_index, shard: shard.delete_characters(
+                        ids=groups[shard_index], chunk_size=chunk_size
+                    )
+                )
+            )
+
+        return sum(
+            self._fan_out(
+                lambda _, shard: shard.delete_characters(
+                    filters=filters, chunk_size=chunk_size
+                )
+            )
+        )
+
+    def get_filter_keys(self) -> list[str]:
+        """Returns every key accepted in a filter dictionary."""
+        return self._shards[0].get_filter_keys()
+
+    def get_filter_type(self, key: str) -> type:
+        """Returns the type a filter value must have for key: int, bool or str."""
+        return self._shards[0].get_filter_type(key)
+
+    def rebalance(self, stat_tables: StatTables = None) -> int:
+        """
+        Rewrites stored health and damage on every shard in parallel and
+        returns the number of changed rows.
+        """
+
+        return sum(self._fan_out(lambda _, shard: shard.rebalance(stat_tables)))
+
+    def get_server_name(self) -> str:
+        """Returns the name of the server."""
+        return self._server_name
+
+    def get_server_stats(self) -> ServerStats:
+        """
+        Returns a ServerStats object for all shards. The raw counters are
+        summed before the averages are derived, so each shard weighs in by
+        its number of characters rather than as one average among others.
+        """
+
+        totals = self.get_server_stats_totals()
+        player_totals = totals[Player.CHARACTER_TYPE]
+        monster_totals = totals[Monster.CHARACTER_TYPE]
+
+        return ServerStats.from_totals(
+            player_totals["num_characters"],
+            monster_totals["num_characters"],
+            player_totals["total_player_level"],
+            monster_totals["total_monster_difficulty_score"],
+        )
+
+    def get_server_stats_totals(self) -> dict:
+        """Returns the raw per-type counters summed over all shards, as {type: {field: value}}."""
+
+        totals = {
+            char_type: dict.fromkeys(ServerStatsCounter.COUNTER_FIELDS, 0)
+            for char_type in (Player.CHARACTER_TYPE, Monster.CHARACTER_TYPE)
+        }
+        for shard_totals in self._fan_out(
+            lambda _, shard: shard.get_server_stats_totals()
+        ):
+            for char_type, fields in totals.items():
+                for field in fields:
+                    fields[field] += shard_totals[char_type][field]
+        return totals
+
+    def verify_server_stats_counters(self) -> dict:
+        """
+        Recomputes the server stats counters of every shard and returns the
+        drift keyed by database file name. An empty dictionary means the
+        counters are accurate.
+        """
+
+        drifts = self._fan_out(lambda _, shard: shard.verify_server_stats_counters())
+        return {
+            db_filename: drift
+            for db_filename, drift in zip(self._db_filenames, drifts)
+            if drift
+        }
+
+    def rebuild_server_stats_counters(self) -> dict:
+        """
+        Rebuilds the server stats counters of every shard and returns the
+        drift that was corrected, keyed by database file name.
+        """
+
+        drifts = self._fan_out(lambda _, shard: shard.rebuild_server_stats_counters())
+        return {
+            db_filename: drift
+            for db_filename, drift in zip(self._db_filenames, drifts)
+            if drift
+        }
+
+    def get_character_details(self, char_id: int) -> str:
+        """Returns full details for a single character by global ID."""
+        return self.get(char_id).get_full_details()
+
+    def get_character_details_by_type(self, character_type: str) -> list[str]:
+        """Returns a list of brief details for characters of a specific type."""
+
+        self._shards[0]._get_character_class(character_type)
+        return [char.get_details() for char in self.get_views(character_type)]
+
+    def get_all_character_details(self) -> list[str]:
+        """Returns a list of brief details for all characters on every shard."""
+        return [char.get_details() for char in self.get_views()]
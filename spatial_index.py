@@ -0,0 +1,172 @@
+import heapq
+import math
+import threading
+
+
+class SpatialGridIndex:
+    """In-memory uniform grid over character positions, answering rectangle,
+    radius and nearest-K queries by visiting only nearby cells"""
+
+    CELL_SIZE_LABEL = "Cell Size"
+
+    def __init__(self, cell_size: int):
+        """Constructor - Initialize an empty grid with square cells of cell_size."""
+
+        if not isinstance(cell_size, int) or isinstance(cell_size, bool):
+            raise ValueError(f"{self.CELL_SIZE_LABEL} must be an integer.")
+        if cell_size < 1:
+            raise ValueError(f"{self.CELL_SIZE_LABEL} must be a positive integer.")
+
+        self._cell_size = cell_size
+        self._cells = {}
+        self._positions = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Returns the number of indexed characters."""
+        return len(self._positions)
+
+    def upsert(self, char_id: int, x: int, y: int, char_type: str):
+        """Adds a character, or moves it if it is already indexed."""
+        with self._lock:
+            self.remove(char_id)
+            self._positions[char_id] = (x, y, char_type)
+            self._cells.setdefault(self._cell_of(x, y), set()).add(char_id)
+
+    def remove(self, char_id: int):
+        """Drops a character from the index if it is present."""
+        with self._lock:
+            position = self._positions.pop(char_id, None)
+            if position is None:
+                return
+            cell = self._cell_of(position[0], position[1])
+            members = self._cells[cell]
+            members.discard(char_id)
+            if not members:
+                del self._cells[cell]
+
+    def in_rect(
+        self, min_x: int, min_y: int, max_x: int, max_y: int, char_type: str = None
+    ) -> list[int]:
+        """Returns the IDs inside the inclusive rectangle, in ID order."""
+        min_cell_x, min_cell_y = self._cell_of(min_x, min_y)
+        max_cell_x, max_cell_y = self._cell_of(max_x, max_y)
+
+        with self._lock:
+            cells = self._cells_in_range(min_cell_x, min_cell_y, max_cell_x, max_cell_y)
+            found = [
+                char_id
+                for cell in cells
+                for char_id in self._cells[cell]
+                if self._matches(char_id, char_type)
+                and min_x <= self._positions[char_id][0] <= max_x
+                and min_y <= self._positions[char_id][1] <= max_y
+            ]
+        return sorted(found)
+
+    def within_radius(
+        self, x: int, y: int, radius: int, char_type: str = None
+    ) -> list[int]:
+        """Returns the IDs within radius of (x, y), nearest first."""
+        min_cell_x, min_cell_y = self._cell_of(x - radius, y - radius)
+        max_cell_x, max_cell_y = self._cell_of(x + radius, y + radius)
+
+        with self._lock:
+            cells = self._cells_in_range(min_cell_x, min_cell_y, max_cell_x, max_cell_y)
+            found = []
+            for cell in cells:
+                for char_id in self._cells[cell]:
+                    if not self._matches(char_id, char_type):
+                        continue
+                    distance = self._distance(char_id, x, y)
+                    if distance <= radius:
+                        found.append((distance, char_id))
+        return [char_id for _, char_id in sorted(found)]
+
+    def nearest(self, k: int, x: int, y: int, char_type: str = None) -> list[int]:
+        """Returns up to k IDs closest to (x, y), nearest first.
+
+        Cells are visited in growing square rings around (x, y). Ring r + 1
+        is at least r * cell_size away, so the search stops once k matches
+        closer than that have been found."""
+        center_x, center_y = self._cell_of(x, y)
+        best = []  # max-heap of (-distance, -id) holding the k best so far
+
+        with self._lock:
+            ring = 0
+            while True:
+                if len(best) == k and -best[0][0] < (ring - 1) * self._cell_size:
+                    break
+                # Once a ring has more cells than are occupied, finish with
+                # one pass over the remaining occupied cells instead
+                sparse = 8 * ring > len(self._cells)
+                for cell in self._ring_cells(center_x, center_y, ring, sparse):
+                    for char_id in self._cells[cell]:
+                        if not self._matches(char_id, char_type):
+                            continue
+                        candidate = (-self._distance(char_id, x, y), -char_id)
+                        if len(best) < k:
+                            heapq.heappush(best, candidate)
+                        elif candidate > best[0]:
+                            heapq.heapreplace(best, candidate)
+                if sparse:
+                    break
+                ring += 1
+
+        return [-neg_id for _, neg_id in sorted(best, reverse=True)]
+
+    def _cell_of(self, x: int, y: int) -> tuple[int, int]:
+        """Private helper mapping a position to its grid cell."""
+        return x // self._cell_size, y // self._cell_size
+
+    def _cells_in_range(
+        self, min_cell_x: int, min_cell_y: int, max_cell_x: int, max_cell_y: int
+    ) -> list:
+        """Private helper listing the occupied cells in a cell rectangle,
+        iterating whichever of the rectangle or the occupied cells is smaller."""
+        area = (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1)
+        if area > len(self._cells):
+            return [
+                (cell_x, cell_y)
+                for cell_x, cell_y in self._cells
+                if min_cell_x <= cell_x <= max_cell_x
+                and min_cell_y <= cell_y <= max_cell_y
+            ]
+        return [
+            (cell_x, cell_y)
+            for cell_x in range(min_cell_x, max_cell_x + 1)
+            for cell_y in range(min_cell_y, max_cell_y + 1)
+            if (cell_x, cell_y) in self._cells
+        ]
+
+    def _ring_cells(
+        self, center_x: int, center_y: int, ring: int, and_beyond: bool = False
+    ) -> list:
+        """Private helper listing the occupied cells exactly ring cells away,
+        or at least ring cells away when and_beyond is set."""
+        if and_beyond:
+            return [
+                (cell_x, cell_y)
+                for cell_x, cell_y in self._cells
+                if max(abs(cell_x - center_x), abs(cell_y - center_y)) >= ring
+            ]
+        if ring == 0:
+            cells = [(center_x, center_y)]
+        else:
+            cells = []
+            for offset in range(-ring, ring + 1):
+                cells.append((center_x + offset, center_y - ring))
+                cells.append((center_x + offset, center_y + ring))
+            for offset in range(-ring + 1, ring):
+                cells.append((center_x - ring, center_y + offset))
+                cells.append((center_x + ring, center_y + offset))
+        return [cell for cell in cells if cell in self._cells]
+
+    def _matches(self, char_id: int, char_type: str) -> bool:
+        """Private helper applying the optional character type filter."""
+        return char_type is None or self._positions[char_id][2] == char_type
+
+    def _distance(self, char_id: int, x: int, y: int) -> float:
+        """Private helper returning the Euclidean distance to a character."""
+        char_x, char_y, _ = self._positions[char_id]
+        return math.hypot(char_x - x, char_y - y)
@@ -0,0 +1,122 @@
+import json
+import os
+
+STAT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "stat_config.json"
+)
+
+
+class StatTables:
+    """Precomputed health/damage lookup tables keyed by (job, level) for
+    players and (monster_type, difficulty) for monsters"""
+
+    def __init__(self, config: dict):
+        """Constructor - Validate a stat config and precompute its lookup tables."""
+
+        if not isinstance(config, dict):
+            raise ValueError("Stat config must be a dictionary.")
+
+        try:
+            player = config["player"]
+            monster = config["monster"]
+            min_level, max_level = player["levels"]
+            self._health_per_level = player["health_per_level"]
+            self._damage_per_level = player["damage_per_level"]
+            self._job_base = {
+                job: (base["health"], base["damage"])
+                for job, base in player["jobs"].items()
+            }
+            self._player_default = (
+                player["default"]["health"],
+                player["default"]["damage"],
+            )
+            self._health_by_type = dict(monster["health_by_type"])
+            self._damage_by_difficulty = dict(monster["damage_by_difficulty"])
+            self._monster_default = (
+                monster["default"]["health"],
+                monster["default"]["damage"],
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid stat config: {e!r}") from e
+
+        self._player_table = {
+            (job, level): self._compute_player_stats(job, level)
+            for job in self._job_base
+            for level in range(min_level, max_level + 1)
+        }
+        self._monster_table = {
+            (monster_type, difficulty): self._compute_monster_stats(
+                monster_type, difficulty
+            )
+            for monster_type in self._health_by_type
+            for difficulty in self._damage_by_difficulty
+        }
+
+        for key, stats in {**self._player_table, **self._monster_table}.items():
+            if not all(isinstance(value, int) for value in stats):
+                raise ValueError(
+                    f"Invalid stat config: stats for {key} must be integers."
+                )
+
+    @classmethod
+    def from_file(cls, path: str = STAT_CONFIG_PATH) -> "StatTables":
+        """Builds stat tables from a JSON config file."""
+        with open(path, encoding="utf-8") as config_file:
+            return cls(json.load(config_file))
+
+    def get_player_stats(self, job: str, player_level: int) -> tuple[int, int]:
+        """Returns (health, damage) for a player job and level."""
+        stats = self._player_table.get((job, player_level))
+        if stats is None:
+            stats = self._compute_player_stats(job, player_level)
+        return stats
+
+    def get_monster_stats(self, monster_type: str, difficulty: str) -> tuple[int, int]:
+        """Returns (health, damage) for a monster type and AI difficulty."""
+        stats = self._monster_table.get((monster_type, difficulty))
+        if stats is None:
+            stats = self._compute_monster_stats(monster_type, difficulty)
+        return stats
+
+    def get_player_table(self) -> dict:
+        """Returns a copy of the {(job, level): (health, damage)} table."""
+        return dict(self._player_table)
+
+    def get_monster_table(self) -> dict:
+        """Returns a copy of the {(monster_type, difficulty): (health, damage)} table."""
+        return dict(self._monster_table)
+
+    def _compute_player_stats(self, job: str, player_level: int) -> tuple[int, int]:
+        """Private helper applying the player formula; unknown jobs get the default."""
+        if job not in self._job_base:
+            return self._player_default
+        base_health, base_damage = self._job_base[job]
+        return (
+            base_health + (player_level - 1) * self._health_per_level,
+            base_damage + (player_level - 1) * self._damage_per_level,
+        )
+
+    def _compute_monster_stats(
+        self, monster_type: str, difficulty: str
+    ) -> tuple[int, int]:
+        """Private helper combining type health and difficulty damage, with defaults."""
+        return (
+            self._health_by_type.get(monster_type, self._monster_default[0]),
+            self._damage_by_difficulty.get(difficulty, self._monster_default[1]),
+        )
+
+
+_active_stat_tables = StatTables.from_file()
+
+
+def get_stat_tables() -> StatTables:
+    """Returns the stat tables used by Player and Monster."""
+    return _active_stat_tables
+
+
+def set_stat_tables(stat_tables: StatTables):
+    """Replaces the stat tables used by Player and Monster in this process."""
+    global _active_stat_tables
+    if not isinstance(stat_tables, StatTables):
+        raise ValueError("Stat tables must be an instance of StatTables.")
+    _active_stat_tables = stat_tables
@@ -1,6 +1,10 @@
 import os
 import sys
-from sqlalchemy import create_engine
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from sqlalchemy import create_engine, event, inspect
 
 # project root directory
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -10,10 +14,17 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 import unittest
+from unittest import mock
 from monster import Monster
 from player import Player
+import character_manager
 from character_manager import CharacterManager
 from base import Base
+from check_indexes import check_query_plans
+from engine_profile import EngineProfile
+from stat_tables import StatTables, get_stat_tables, set_stat_tables
+from character_snapshot import CharacterSnapshot
+from sharded_character_manager import ShardedCharacterManager
 
 
 class TestCharacterManager(unittest.TestCase):
@@ -483,6 +494,1194 @@ class TestCharacterManager(unittest.TestCase):
                     invalid_id,
                 )
 
+    def test_server_stats_counters_valid(self):
+        """140A - Server stats counters follow adds, updates and deletes"""
+        self.server.add_character(self.player)
+        self.server.add_character(self.monster)
+        self.server.add_character(Player(9, "warrior"))
+        self.server.update_character(1, "knight", 5)
+        self.server.update_character(2, "orc", "hard")
+        self.server.delete_character(3)
+
+        stats = self.server.get_server_stats()
+        self.assertEqual(stats.total_num_characters, 2)
+        self.assertEqual(stats.num_players, 1)
+        self.assertEqual(stats.avg_player_level, 5)
+        self.assertEqual(stats.avg_monster_ai_difficulty, "hard")
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_server_stats_counters_drift(self):
+        """140B - Verify reports counter drift and rebuild corrects it"""
+        self.server.add_character(self.player)
+        self.server.add_character(self.monster)
+
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "UPDATE server_stats_counters SET num_characters = 7 "
+                "WHERE character_type = 'player'"
+            )
+
+        self.assertEqual(self.server.get_server_stats().num_players, 7)
+        self.assertEqual(
+            self.server.verify_server_stats_counters(),
+            {"player": {"num_characters": (7, 1)}},
+        )
+
+        drift = self.server.rebuild_server_stats_counters()
+        self.assertEqual(drift, {"player": {"num_characters": (7, 1)}})
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+        self.assertEqual(self.server.get_server_stats().num_players, 1)
+
+    def test_server_stats_counters_concurrent_updates(self):
+        """140C - Interleaved updates of one character keep the counters exact"""
+        self.server.add_character(self.player)
+        get_update_values = self.server._get_update_values
+        interleaved = []
+
+        def update_in_between(*args):
+            # Another thread updates the same character while this update runs
+            if not interleaved:
+                interleaved.append(True)
+                thread = threading.Thread(
+                    target=self.server.update_character, args=(1, "knight", 5)
+                )
+                thread.start()
+                thread.join()
+            return get_update_values(*args)
+
+        self.server._get_update_values = update_in_between
+        self.server.update_character(1, "knight", 9)
+
+        self.assertEqual(interleaved, [True])
+        self.assertEqual(self.server.get(1).player_level, 9)
+        self.assertEqual(self.server.get_server_stats().avg_player_level, 9)
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_server_stats_counters_concurrent_seeding(self):
+        """140D - Concurrent first stats reads seed the missing counters once"""
+        self.server.add_characters([self.player, self.monster, Player(9, "warrior")])
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM server_stats_counters")
+
+        barrier = threading.Barrier(4)
+        results, errors = [], []
+
+        def read_totals():
+            barrier.wait()
+            try:
+                results.append(self.server.get_server_stats_totals())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read_totals) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 4)
+        for totals in results:
+            self.assertEqual(totals["player"]["num_characters"], 2)
+            self.assertEqual(totals["player"]["total_player_level"], 10)
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+        # A manager opened on an existing database seeds the rows up front
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM server_stats_counters")
+        CharacterManager("ACIT", self.DB_FILE, engine=self.engine)
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                "SELECT character_type, num_characters FROM server_stats_counters "
+                "ORDER BY character_type"
+            ).all()
+        self.assertEqual(rows, [("monster", 1), ("player", 2)])
+
+    def test_get_cache_valid(self):
+        """150A - Cached get serves snapshots and is invalidated by writes"""
+        server = CharacterManager(
+            "ACIT", self.DB_FILE, engine=self.engine, cache_size=1
+        )
+        server.add_character(self.player)
+        server.add_character(self.monster)
+
+        first = server.get(2)
+        second = server.get(2)
+        self.assertIsNot(first, second)
+        self.assertIsInstance(second, Monster)
+        self.assertEqual(second.to_dict(), first.to_dict())
+        self.assertEqual(
+            server.get_cache_stats(), {"size": 1, "max_size": 1, "hits": 1, "misses": 1}
+        )
+
+        second.move_position(5, 5)
+        self.assertEqual(server.get(2).get_position(), [0, 0])
+
+        server.update_character(2, "orc", "hard")
+        self.assertEqual(server.get(2).get_monster_type(), "orc")
+
+        server.get(1)
+        self.assertEqual(server.get_cache_stats()["size"], 1)
+
+        server.delete_character(1)
+        self.assertRaisesRegex(
+            ValueError, "Character with ID 1 does not exist\\.", server.get, 1
+        )
+
+    def test_get_cache_invalid(self):
+        """150B - Invalid cache sizes raise errors"""
+        test_cases = [
+            ("10", "Cache Size must be an integer\\."),
+            (-1, "Cache Size cannot be negative\\."),
+        ]
+        for cache_size, expected_regex in test_cases:
+            with self.subTest(cache_size=cache_size):
+                self.assertRaisesRegex(
+                    ValueError,
+                    expected_regex,
+                    CharacterManager,
+                    "ACIT",
+                    self.DB_FILE,
+                    self.engine,
+                    cache_size,
+                )
+
+    def test_get_cache_racing_write(self):
+        """150C - A write committed while a cache miss loads is not undone by its put"""
+        server = CharacterManager(
+            "ACIT", self.DB_FILE, engine=self.engine, cache_size=10
+        )
+        server.add_character(self.player)
+        take_snapshot = server._take_snapshot
+
+        for method, level, read in (
+            ("get", 5, server.get),
+            ("get_many", 9, lambda char_id: server.get_many([char_id])[0]),
+        ):
+            with self.subTest(method=method):
+
+                def write_in_between(character, level=level):
+                    # Another request commits an update between the load and the put
+                    server._take_snapshot = take_snapshot
+                    server.update_character(1, "assassin", level)
+                    return take_snapshot(character)
+
+                server.update_character(1, "assassin", 1)
+                server._take_snapshot = write_in_between
+                self.assertEqual(read(1).player_level, 1)
+                self.assertEqual(server.get(1).player_level, level)
+                self.assertEqual(server.get_many([1])[0].player_level, level)
+
+    def test_add_characters_valid(self):
+        """160A - Bulk add stores characters and returns IDs in input order"""
+        self.server.add_character(self.player)
+        characters = (
+            Player(level, "knight") if level % 2 else Monster("orc", "hard")
+            for level in range(1, 6)
+        )
+
+        new_ids = self.server.add_characters(characters, batch_size=2)
+
+        self.assertEqual(new_ids, [2, 3, 4, 5, 6])
+        self.assertIsInstance(self.server.get(2), Player)
+        self.assertEqual(self.server.get(2).get_level(), 1)
+        self.assertIsInstance(self.server.get(3), Monster)
+        self.assertEqual(
+            self.server.get_character_details(6),
+            "The player (id: 6) is level 5 knight with 116 health and 32 damage, Position: X = 0 Y = 0",
+        )
+        self.assertEqual(self.server.add_characters([]), [])
+
+        stats = self.server.get_server_stats()
+        self.assertEqual(stats.num_players, 4)
+        self.assertEqual(stats.num_monsters, 2)
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_add_characters_invalid(self):
+        """160B - Bulk add with invalid input raises errors"""
+        test_cases = [
+            (None, 10, "Characters cannot be undefined \\(None\\)\\."),
+            ([self.player], 0, "Batch Size must be a positive integer\\."),
+            ([self.player], "10", "Batch Size needs to be an integer\\."),
+            (
+                [self.player, "String Object"],
+                10,
+                "Invalid Character Object: Must be an instance of AbstractCharacter or its subclass\\.",
+            ),
+        ]
+        for characters, batch_size, expected_regex in test_cases:
+            with self.subTest(characters=characters, batch_size=batch_size):
+                self.assertRaisesRegex(
+                    ValueError,
+                    expected_regex,
+                    self.server.add_characters,
+                    characters,
+                    batch_size,
+                )
+        self.assertEqual(len(self.server.get_all()), 0)
+
+    def test_iter_all_and_get_page_valid(self):
+        """170A - Keyset iteration and paging return characters in ID order"""
+        self.assertEqual(list(self.server.iter_all()), [])
+        self.assertEqual(self.server.get_page(), ([], None))
+
+        self.server.add_characters(
+            [Player(1, "knight"), Monster("orc", "easy"), Player(2, "warrior")]
+            + [Monster("elf", "hard"), Player(3, "assassin")]
+        )
+
+        all_ids = [char.id for char in self.server.iter_all(page_size=2)]
+        self.assertEqual(all_ids, [1, 2, 3, 4, 5])
+
+        players = list(self.server.iter_all("player", after_id=1, page_size=1))
+        self.assertEqual([char.id for char in players], [3, 5])
+        self.assertIsInstance(players[0], Player)
+
+        page, cursor = self.server.get_page(page_size=2)
+        self.assertEqual([char.id for char in page], [1, 2])
+        self.assertEqual(cursor, 2)
+        page, cursor = self.server.get_page(after_id=cursor, page_size=2)
+        self.assertEqual([char.id for char in page], [3, 4])
+        page, cursor = self.server.get_page(after_id=cursor, page_size=2)
+        self.assertEqual([char.id for char in page], [5])
+        self.assertIsNone(cursor)
+
+        page, cursor = self.server.get_page("monster", page_size=2)
+        self.assertEqual([char.id for char in page], [2, 4])
+        self.assertIsNone(cursor)
+
+    def test_iter_all_and_get_page_invalid(self):
+        """170B - Keyset iteration and paging with invalid parameters raise errors"""
+        test_cases = [
+            (
+                "Random",
+                None,
+                10,
+                "Character type must be either 'player' or 'monster'\\.",
+            ),
+            (None, "1", 10, "After ID needs to be an integer\\."),
+            (None, None, 0, "Page Size must be a positive integer\\."),
+            (None, None, None, "Page Size cannot be undefined \\(None\\)\\."),
+        ]
+        for character_type, after_id, page_size, expected_regex in test_cases:
+            for method in (self.server.iter_all, self.server.get_page):
+                with self.subTest(method=method.__name__, page_size=page_size):
+                    self.assertRaisesRegex(
+                        ValueError,
+                        expected_regex,
+                        method,
+                        character_type,
+                        after_id,
+                        page_size,
+                    )
+
+    def test_hot_queries_use_indexes(self):
+        """180A - Hot queries are answered through the characters indexes"""
+        self.server.add_characters([Player(10, "knight"), Monster("orc", "hard")])
+
+        for name, (uses_index, plan) in check_query_plans(self.engine).items():
+            with self.subTest(query=name):
+                self.assertTrue(uses_index, plan)
+
+    def test_engine_profile_valid(self):
+        """190A - Engine profiles apply their pragmas to pooled connections"""
+        db_file = "test_profile_characters.sqlite"
+        profiles = [
+            (None, "wal", "normal", "memory"),
+            (
+                EngineProfile("delete", "full", 1000, temp_store="file"),
+                "delete",
+                "full",
+                "file",
+            ),
+        ]
+        for profile, journal_mode, synchronous, temp_store in profiles:
+            with self.subTest(journal_mode=journal_mode):
+                server = CharacterManager("ACIT", db_file, engine_profile=profile)
+                try:
+                    settings = server.get_engine_settings()
+                finally:
+                    # pylint: disable=protected-access
+                    server._engine.dispose()
+                    for suffix in ("", "-wal", "-shm"):
+                        if os.path.exists(db_file + suffix):
+                            os.remove(db_file + suffix)
+
+                self.assertEqual(settings["journal_mode"], journal_mode)
+                self.assertEqual(settings["synchronous"], synchronous)
+                self.assertEqual(settings["temp_store"], temp_store)
+                self.assertEqual(settings["pool_class"], "QueuePool")
+                self.assertEqual(settings["pool_size"], 5)
+
+        self.assertEqual(
+            EngineProfile(busy_timeout=250).get_pragmas()["busy_timeout"], 250
+        )
+
+    def test_engine_profile_invalid(self):
+        """190B - Invalid engine profile settings raise errors"""
+        test_cases = [
+            (
+                {"journal_mode": "fast"},
+                "Journal Mode must be one of: delete, truncate, persist, memory, wal, off\\.",
+            ),
+            ({"synchronous": 1}, "Synchronous must be a string\\."),
+            (
+                {"temp_store": "disk"},
+                "Temp Store must be one of: default, file, memory\\.",
+            ),
+            ({"busy_timeout": -1}, "Busy Timeout cannot be negative\\."),
+            ({"cache_size": "big"}, "Cache Size must be an integer\\."),
+            ({"pool_size": 0}, "Pool Size must be a positive integer\\."),
+        ]
+        for kwargs, expected_regex in test_cases:
+            with self.subTest(kwargs=kwargs):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, EngineProfile, **kwargs
+                )
+
+        self.assertRaisesRegex(
+            ValueError,
+            "Engine Profile must be an instance of EngineProfile\\.",
+            CharacterManager,
+            "ACIT",
+            self.DB_FILE,
+            engine_profile="wal",
+        )
+
+    def test_data_version_valid(self):
+        """200A - Data version increases on writes only"""
+        versions = [self.server.get_data_version()]
+
+        self.server.add_character(self.player)
+        versions.append(self.server.get_data_version())
+        self.server.add_characters([self.monster])
+        versions.append(self.server.get_data_version())
+
+        self.server.get(1)
+        self.server.get_all()
+        self.server.get_server_stats()
+        self.assertEqual(self.server.get_data_version(), versions[-1])
+
+        self.server.update_character(1, "knight", 2)
+        versions.append(self.server.get_data_version())
+        self.server.delete_character(2)
+        versions.append(self.server.get_data_version())
+
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_data_version_other_process(self):
+        """200B - Writes through another manager's engine are seen by cached reads"""
+        server = CharacterManager(
+            "ACIT", self.DB_FILE, engine=self.engine, cache_size=10
+        )
+        server.add_characters([self.player, self.monster])
+        self.assertEqual(server.get(1).get_level(), 1)
+        self.assertEqual([char.id for char in server.nearest(1, 0, 0)], [1])
+        snapshot = server.snapshot()
+        version = server.get_data_version()
+
+        # A second engine stands in for another process, e.g. verify_stats.py
+        other_engine = create_engine(f"sqlite:///{self.DB_FILE}")
+        self.addCleanup(other_engine.dispose)
+        other = CharacterManager("ACIT", self.DB_FILE, engine=other_engine)
+        other.update_character(1, "knight", 7)
+        other.move_many([(1, 9, 9)])
+
+        self.assertGreater(server.get_data_version(), version)
+        self.assertEqual(server.get(1).get_level(), 7)
+        self.assertEqual(server.get_many([1])[0].get_position(), [9, 9])
+        self.assertEqual([char.id for char in server.nearest(1, 0, 0)], [2])
+        server.refresh_snapshot(snapshot)
+        self.assertEqual(snapshot.total("player_level"), 7)
+        self.assertEqual(snapshot.get_version(), server.get_data_version())
+
+    def test_update_character_row_count(self):
+        """210A - Update writes only the derived columns and returns the row count"""
+        self.server.add_characters([self.player, self.monster])
+
+        self.assertEqual(self.server.update_character(1, "WARRIOR", 3), 1)
+        self.assertEqual(self.server.update_character(2, "Elf", "HARD"), 1)
+
+        player = self.server.get(1)
+        self.assertEqual(player.get_job(), "warrior")
+        self.assertEqual(player.get_stats(), [16, 128])
+        monster = self.server.get(2)
+        self.assertEqual(monster.get_monster_ai_difficulty(), "hard")
+        self.assertEqual(monster.get_stats(), [30, 110])
+
+        self.assertRaisesRegex(
+            ValueError,
+            "Level needs to be an integer\\.",
+            self.server.update_character,
+            1,
+            "orc",
+            "hard",
+        )
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_delete_characters_valid(self):
+        """220A - Bulk delete by IDs or filter returns the number of deleted rows"""
+        self.server.add_characters(
+            [Monster("orc", "easy"), Monster("orc", "hard"), Monster("elf", "hard")]
+            + [Player(3, "knight"), Player(4, "knight"), Monster("orc", "easy")]
+        )
+
+        self.assertEqual(
+            self.server.delete_characters(ids=[1, 4, 4, 999], chunk_size=1), 2
+        )
+        self.assertFalse(self.server.character_exists(1))
+        self.assertFalse(self.server.character_exists(4))
+
+        deleted = self.server.delete_characters(
+            filters={"type": "monster", "monster_type": "ORC"}, chunk_size=1
+        )
+        self.assertEqual(deleted, 2)
+        self.assertEqual([char.id for char in self.server.get_all()], [5, 3])
+
+        self.assertEqual(self.server.delete_characters(filters={"job": "warrior"}), 0)
+        self.assertEqual(self.server.delete_characters(ids=[]), 0)
+
+        stats = self.server.get_server_stats()
+        self.assertEqual(stats.num_players, 1)
+        self.assertEqual(stats.num_monsters, 1)
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_delete_characters_invalid(self):
+        """220B - Bulk delete with invalid parameters raises errors"""
+        test_cases = [
+            ({}, "Provide either IDs or a filter to delete characters\\."),
+            (
+                {"ids": [1], "filters": {"type": "monster"}},
+                "Provide either IDs or a filter to delete characters\\.",
+            ),
+            ({"ids": "1,2"}, "IDs must be a list of integers\\."),
+            ({"ids": [1, "2"]}, "ID needs to be an integer\\."),
+            ({"filters": {}}, "Filter must be a non-empty dictionary\\."),
+            ({"filters": {"health": 10}}, "Unsupported filter 'health'\\."),
+            ({"filters": {"job": ""}}, "Filter 'job' cannot be empty\\."),
+            ({"filters": {"job": ["a"]}}, "Filter 'job' must be a string\\."),
+            ({"filters": {"job": 3}}, "Filter 'job' must be a string\\."),
+            ({"filters": {"alive": {"x": 1}}}, "Filter 'alive' must be a boolean\\."),
+            ({"filters": {"alive": 1}}, "Filter 'alive' must be a boolean\\."),
+            (
+                {"filters": {"player_level": "abc"}},
+                "Filter 'player_level' must be an integer\\.",
+            ),
+            (
+                {"filters": {"player_level": True}},
+                "Filter 'player_level' must be an integer\\.",
+            ),
+            (
+                {"filters": {"type": "npc"}},
+                "Character type must be either 'player' or 'monster'\\.",
+            ),
+            ({"ids": [1], "chunk_size": 0}, "Chunk Size must be a positive integer\\."),
+        ]
+        for kwargs, expected_regex in test_cases:
+            with self.subTest(kwargs=kwargs):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, self.server.delete_characters, **kwargs
+                )
+
+    def test_existing_ids_valid(self):
+        """230A - Bulk existence lookup returns the IDs that exist"""
+        self.assertEqual(self.server.existing_ids([1, 2]), set())
+
+        self.server.add_characters([self.player, self.monster, Player(3, "knight")])
+        self.server.delete_character(2)
+
+        self.assertEqual(
+            self.server.existing_ids([3, 1, 2, 999, 1], chunk_size=2), {1, 3}
+        )
+        self.assertIs(self.server.character_exists(3), True)
+        self.assertIs(self.server.character_exists(2), False)
+
+    def test_existing_ids_invalid(self):
+        """230B - Bulk existence lookup with invalid parameters raises errors"""
+        test_cases = [
+            (None, 10, "IDs must be a list of integers\\."),
+            ([1, None], 10, "ID cannot be undefined \\(None\\)\\."),
+            ([1], 0, "Chunk Size must be a positive integer\\."),
+        ]
+        for ids, chunk_size, expected_regex in test_cases:
+            with self.subTest(ids=ids, chunk_size=chunk_size):
+                self.assertRaisesRegex(
+                    ValueError,
+                    expected_regex,
+                    self.server.existing_ids,
+                    ids,
+                    chunk_size,
+                )
+
+    def test_rebalance_valid(self):
+        """240A - Rebalance rewrites stored stats from new stat tables"""
+        self.server.add_characters(
+            [Player(1, "knight"), Player(3, "assassin"), Monster("orc", "easy")]
+        )
+        self.assertEqual(self.server.rebalance(), 0)
+
+        original_tables = get_stat_tables()
+        with open(
+            os.path.join(project_root, "stat_config.json"), encoding="utf-8"
+        ) as f:
+            config = json.load(f)
+        config["player"]["jobs"]["knight"]["health"] = 200
+        config["player"]["damage_per_level"] = 5
+        config["monster"]["damage_by_difficulty"]["easy"] = 12
+        try:
+            self.assertEqual(self.server.rebalance(StatTables(config)), 3)
+            self.assertEqual(self.server.get(1).get_stats(), [20, 200])
+            self.assertEqual(self.server.get(2).get_stats(), [40, 88])
+            self.assertEqual(self.server.get(3).get_stats(), [12, 130])
+            self.assertEqual(Player(2, "knight").get_stats(), [25, 204])
+        finally:
+            set_stat_tables(original_tables)
+
+    def test_rebalance_invalid(self):
+        """240B - Invalid stat configs raise errors"""
+        test_cases = [
+            ("config", "Stat config must be a dictionary\\."),
+            ({"player": {}}, "Invalid stat config"),
+        ]
+        for config, expected_regex in test_cases:
+            with self.subTest(config=config):
+                self.assertRaisesRegex(ValueError, expected_regex, StatTables, config)
+
+        self.assertRaisesRegex(
+            ValueError,
+            "Stat tables must be an instance of StatTables\\.",
+            self.server.rebalance,
+            {"player": {}},
+        )
+
+    def test_spatial_queries_valid(self):
+        """250A - Spatial queries find characters by position and follow writes"""
+        positions = [(1, 1), (2, 2), (8, 8), (5, 5), (2, 3)]
+        characters = []
+        for i, (x, y) in enumerate(positions):
+            character = Player(1, "knight") if i % 2 == 0 else Monster("elf", "easy")
+            character.move_position(x, y)
+            characters.append(character)
+        self.server.add_characters(characters)
+
+        def ids(found):
+            return [character.id for character in found]
+
+        self.assertEqual(ids(self.server.characters_in_rect(0, 0, 3, 3)), [1, 2, 5])
+        self.assertEqual(
+            ids(self.server.characters_in_rect(0, 0, 3, 3, "monster")), [2]
+        )
+        self.assertEqual(ids(self.server.characters_within_radius(2, 2, 1)), [2, 5])
+        self.assertEqual(ids(self.server.nearest(3, 2, 2)), [2, 5, 1])
+        self.assertEqual(ids(self.server.nearest(2, 9, 9, "player")), [3, 5])
+        self.assertIsInstance(self.server.nearest(1, 5, 5)[0], Monster)
+
+        # Writes after the index is built are reflected in later queries
+        newcomer = Monster("orc", "hard")
+        newcomer.move_position(9, 9)
+        self.server.add_character(newcomer)
+        self.server.delete_character(3)
+        self.assertEqual(ids(self.server.nearest(2, 9, 9)), [6, 4])
+        self.server.delete_characters(filters={"type": "monster"})
+        self.assertEqual(ids(self.server.characters_in_rect(0, 0, 10, 10)), [1, 5])
+
+    def test_spatial_queries_invalid(self):
+        """250B - Spatial queries and world bounds with invalid parameters raise errors"""
+        test_cases = [
+            (self.server.characters_in_rect, (0, 0, None, 1), "Maximum X cannot be"),
+            (
+                self.server.characters_in_rect,
+                (5, 0, 1, 1),
+                "Minimum X/Y cannot be greater than Maximum X/Y\\.",
+            ),
+            (
+                self.server.characters_within_radius,
+                (0, 0, -1),
+                "Radius cannot be negative\\.",
+            ),
+            (
+                self.server.nearest,
+                (0, 0, 0),
+                "Count must be a positive integer\\.",
+            ),
+            (
+                self.server.nearest,
+                (1, 0, 0, "npc"),
+                "Character type must be either 'player' or 'monster'\\.",
+            ),
+            (
+                Player.set_world_bounds,
+                (10, 0),
+                "Minimum range must be lower than maximum range\\.",
+            ),
+            (
+                CharacterManager,
+                ("ACIT", self.DB_FILE, self.engine, 0, None, 0),
+                "Cell Size must be a positive integer\\.",
+            ),
+        ]
+        for method, args, expected_regex in test_cases:
+            with self.subTest(method=method.__name__, args=args):
+                self.assertRaisesRegex(ValueError, expected_regex, method, *args)
+
+    def test_world_bounds(self):
+        """250C - Configurable world bounds widen the allowed positions"""
+        # The bounds are process-wide startup configuration; restore the default
+        self.addCleanup(Player.set_world_bounds, *Player.get_world_bounds())
+        Player.set_world_bounds(-500, 500)
+        server = CharacterManager("ACIT", self.DB_FILE, engine=self.engine)
+        character = Monster("dragon", "hard")
+        character.move_position(-400, 450)
+        server.add_character(character)
+        self.assertEqual([found.id for found in server.nearest(1, -390, 440)], [1])
+
+        Player.set_world_bounds(0, 10)
+        with self.assertRaisesRegex(ValueError, "out of range"):
+            Player(1, "knight").move_position(11, 0)
+
+    def test_move_many_valid(self):
+        """260A - Batched moves update positions, caches and the spatial index"""
+        server = CharacterManager(
+            "ACIT", self.DB_FILE, engine=self.engine, cache_size=10
+        )
+        server.add_characters([self.player, self.monster, Player(3, "knight")])
+        self.assertEqual(server.get(1).get_position(), [0, 0])
+        self.assertEqual(server.nearest(1, 10, 10)[0].id, 1)
+
+        self.assertEqual(server.move_many([]), 0)
+        self.assertEqual(
+            server.move_many([[1, 2, 3], (3, 10, 10), [1, 4, 5]], chunk_size=1), 2
+        )
+        self.assertEqual(server.get(1).get_position(), [4, 5])
+        self.assertEqual(server.get(2).get_position(), [0, 0])
+        self.assertEqual(server.get(3).get_position(), [10, 10])
+        self.assertEqual(server.nearest(1, 10, 10)[0].id, 3)
+        self.assertEqual(
+            [found.id for found in server.characters_in_rect(4, 5, 4, 5)], [1]
+        )
+
+    def test_move_many_invalid(self):
+        """260B - Invalid moves raise errors and leave every position unchanged"""
+        self.server.add_characters([self.player, self.monster])
+        test_cases = [
+            ("1,2,3", "Moves must be a list of \\[id, x, y\\] entries\\."),
+            ([[1, 2]], "Each move must be an \\[id, x, y\\] entry\\."),
+            ([[None, 1, 1]], "ID cannot be undefined \\(None\\)\\."),
+            ([[1, 1, 1], [2, 11, 0]], "X \\(11\\) is out of range\\."),
+            ([[1, 1, "1"]], "Y must be an integer\\."),
+            (
+                [[1, 1, 1], [7, 1, 1], [9, 1, 1]],
+                "Characters with IDs 7, 9 do not exist\\.",
+            ),
+        ]
+        for moves, expected_regex in test_cases:
+            with self.subTest(moves=moves):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, self.server.move_many, moves
+                )
+        self.assertEqual(self.server.get(1).get_position(), [0, 0])
+
+    def test_move_many_racing_delete(self):
+        """260C - A delete committed between the existence check and the update fails the move"""
+        self.server.add_characters([self.player, self.monster, Player(2, "knight")])
+        self.server.nearest(1, 0, 0)  # builds the spatial index
+        deleted = []
+
+        def chunked_then_delete(iterable, size):
+            # Another request deletes character 2 once the IDs have been checked
+            yield from chunked(iterable, size)
+            if not deleted:
+                deleted.append(True)
+                self.server.delete_character(2)
+
+        chunked = character_manager._chunked
+        with mock.patch("character_manager._chunked", chunked_then_delete):
+            self.assertRaisesRegex(
+                ValueError,
+                "Characters with IDs 2 do not exist\\.",
+                self.server.move_many,
+                [[1, 1, 1], [2, 1, 1]],
+            )
+
+        self.assertEqual(deleted, [True])
+        self.assertEqual(self.server.get(1).get_position(), [0, 0])
+        self.assertEqual([char.id for char in self.server.nearest(2, 0, 0)], [1, 3])
+
+    def test_snapshot_valid(self):
+        """270A - Snapshots aggregate columns and refresh incrementally"""
+        self.server.add_characters(
+            [Player(2, "knight"), Monster("orc", "hard"), Player(4, "knight")]
+        )
+        snapshot = self.server.snapshot()
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot.get_version(), self.server.get_data_version())
+
+        players = snapshot.mask(type="player")
+        self.assertEqual(snapshot.ids(players), [1, 3])
+        self.assertEqual(snapshot.count(snapshot.mask(type="player", job="knight")), 2)
+        self.assertEqual(snapshot.mean("player_level", players), 3)
+        self.assertEqual(snapshot.total("damage"), 23 + 30 + 29)
+        self.assertEqual(snapshot.distribution("type"), {"player": 2, "monster": 1})
+        self.assertEqual(snapshot.heatmap(5), {(0, 0): 3})
+
+        self.server.delete_character(1)
+        self.server.move_many([[2, 7, 8]])
+        self.server.add_character(Monster("elf", "easy"))
+        refreshed = self.server.refresh_snapshot(snapshot)
+        self.assertIs(refreshed, snapshot)
+        self.assertEqual(snapshot.ids(), [2, 3, 4])
+        self.assertEqual(snapshot.heatmap(5), {(1, 1): 1, (0, 0): 2})
+        self.assertEqual(snapshot.distribution("monster_type"), {"orc": 1, "elf": 1})
+        fresh = self.server.snapshot()
+        for name in CharacterSnapshot.COLUMN_TYPECODES:
+            self.assertEqual(snapshot.column(name), fresh.column(name))
+
+    def test_snapshot_invalid(self):
+        """270B - Snapshot queries with invalid parameters raise errors"""
+        snapshot = self.server.snapshot()
+        test_cases = [
+            (snapshot.mask, {"health_points": 1}, "Unsupported column"),
+            (snapshot.total, {"name": "job"}, "Column 'job' is not numeric\\."),
+            (snapshot.heatmap, {"cell_size": 0}, "Cell Size must be a positive"),
+            (snapshot.ids, {"mask": b"\x01"}, "Mask length does not match"),
+            (
+                self.server.refresh_snapshot,
+                {"snapshot": "snapshot"},
+                "Snapshot must be an instance of CharacterSnapshot\\.",
+            ),
+        ]
+        for method, kwargs, expected_regex in test_cases:
+            with self.subTest(method=method.__name__, kwargs=kwargs):
+                self.assertRaisesRegex(ValueError, expected_regex, method, **kwargs)
+
+    def test_character_views_valid(self):
+        """280A - Character views match the ORM objects' output"""
+        self.monster.move_position(3, 4)
+        self.server.add_characters(
+            [self.monster, self.player, Monster("elf", "normal"), Player(7, "warrior")]
+        )
+
+        views = self.server.get_views()
+        characters = self.server.get_all()
+        self.assertEqual([view.id for view in views], [2, 4, 1, 3])
+        for view, character in zip(views, characters):
+            with self.subTest(id=view.id):
+                self.assertEqual(view.to_dict(), character.to_dict())
+                self.assertEqual(view.get_details(), character.get_details())
+                self.assertEqual(view.get_full_details(), character.get_full_details())
+                self.assertEqual(view.get_stats(), character.get_stats())
+
+        self.assertEqual(
+            self.server.get_view(1).get_full_details(),
+            self.server.get_character_details(1),
+        )
+        self.assertEqual([view.id for view in self.server.get_views("monster")], [1, 3])
+        self.assertEqual(
+            [view.id for view in self.server.iter_views(after_id=1, page_size=2)],
+            [2, 3, 4],
+        )
+        self.assertEqual(
+            [view.id for view in self.server.iter_views("player", page_size=1)],
+            [2, 4],
+        )
+        with self.assertRaises(AttributeError):
+            views[0].health = 1
+
+    def test_character_views_invalid(self):
+        """280B - Character view reads with invalid parameters raise errors"""
+        test_cases = [
+            (self.server.get_view, (1,), "Character with ID 1 does not exist\\."),
+            (self.server.get_view, ("1",), "ID needs to be an integer\\."),
+            (
+                self.server.get_views,
+                ("npc",),
+                "Character type must be either 'player' or 'monster'\\.",
+            ),
+            (
+                self.server.iter_views,
+                (None, None, 0),
+                "Page Size must be a positive integer\\.",
+            ),
+        ]
+        for method, args, expected_regex in test_cases:
+            with self.subTest(method=method.__name__, args=args):
+                self.assertRaisesRegex(ValueError, expected_regex, method, *args)
+
+    def test_execute_batch_valid(self):
+        """290A - Batches of mixed operations commit together"""
+        self.server.add_characters([self.player, self.monster])
+        results = self.server.execute_batch(
+            [
+                {"op": "create", "type": "player", "job": "warrior", "player_level": 4},
+                {"op": "update", "id": 1, "job": "knight", "player_level": 9},
+                {"op": "delete", "id": 2},
+                {
+                    "op": "create",
+                    "type": "monster",
+                    "monster_type": "orc",
+                    "monster_ai_difficulty": "hard",
+                },
+            ]
+        )
+        self.assertEqual([result["id"] for result in results], [3, 1, 2, 4])
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertEqual(self.server.get(1).get_level(), 9)
+        self.assertIs(self.server.character_exists(2), False)
+        self.assertEqual(self.server.get(4).get_monster_type(), "orc")
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+        results = self.server.execute_batch(
+            [{"op": "delete", "id": 3}, {"op": "delete", "id": 99}, {"op": "rename"}],
+            atomic=False,
+        )
+        self.assertEqual([result["ok"] for result in results], [True, False, False])
+        self.assertEqual(results[1]["error"], "Character with ID 99 does not exist.")
+        self.assertIs(self.server.character_exists(3), False)
+
+    def test_execute_batch_invalid(self):
+        """290B - A failing operation rolls back an atomic batch"""
+        self.server.add_character(self.player)
+        version = self.server.get_data_version()
+        test_cases = [
+            ("create", "Operations must be a list\\."),
+            ([["delete", 1]], "Operation 0 failed: Operation must be a dictionary\\."),
+            (
+                [{"op": "delete", "id": 1}, {"op": "update", "id": 1, "job": "cook"}],
+                "Operation 1 failed: Character with ID 1 does not exist\\.",
+            ),
+            (
+                [{"op": "update", "id": 1, "job": "cook", "player_level": 2}],
+                "Operation 0 failed: Player Job",
+            ),
+            (
+                [{"op": "create", "type": "npc"}],
+                "Operation 0 failed: Character type must be either",
+            ),
+        ]
+        for operations, expected_regex in test_cases:
+            with self.subTest(operations=operations):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, self.server.execute_batch, operations
+                )
+        self.assertEqual(self.server.get(1).get_job(), "assassin")
+        self.assertEqual(self.server.get_data_version(), version)
+        self.assertEqual(self.server.verify_server_stats_counters(), {})
+
+    def test_execute_batch_single_transaction(self):
+        """290C - A best-effort batch commits once, after its last operation"""
+        db_file = "test_batch_characters.sqlite"
+        engine = EngineProfile().create_engine(db_file)
+        self.addCleanup(self._remove_profile_db, engine, db_file)
+        Base.metadata.create_all(engine)
+        server = CharacterManager("ACIT", db_file, engine=engine)
+
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        event.listen(engine, "commit", lambda conn: statements.append("COMMIT"))
+
+        # Another connection counts the committed characters before each operation
+        committed = []
+        run_batch_operation = server._run_batch_operation
+
+        def count_then_run(session, operation):
+            with closing(sqlite3.connect(db_file)) as connection:
+                committed.append(
+                    connection.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+                )
+            return run_batch_operation(session, operation)
+
+        server._run_batch_operation = count_then_run
+        results = server.execute_batch(
+            [
+                {"op": "create", "type": "player", "job": "warrior", "player_level": 4},
+                {"op": "create", "type": "player", "job": "knight", "player_level": 2},
+                {"op": "delete", "id": 99},
+                {"op": "delete", "id": 1},
+            ],
+            atomic=False,
+        )
+
+        self.assertEqual(
+            [result["ok"] for result in results], [True, True, False, True]
+        )
+        self.assertEqual(committed, [0, 0, 0, 0])
+        self.assertEqual(statements[0], "BEGIN IMMEDIATE")
+        self.assertEqual(statements.count("COMMIT"), 1)
+        self.assertEqual(statements[-1], "COMMIT")
+        self.assertEqual([view.id for view in server.get_views()], [2])
+        self.assertEqual(server.verify_server_stats_counters(), {})
+
+    @staticmethod
+    def _remove_profile_db(engine, db_file: str):
+        """Disposes a profile engine and removes its WAL database files"""
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_file + suffix):
+                os.remove(db_file + suffix)
+
+    def test_get_many_valid(self):
+        """300A - Multi-get returns characters in request order with None markers"""
+        server = CharacterManager(
+            "ACIT", self.DB_FILE, engine=self.engine, cache_size=10
+        )
+        server.add_characters([self.player, self.monster, Player(5, "warrior")])
+        server.get(2)
+
+        characters = server.get_many([3, 99, 2, 1, 3], chunk_size=1)
+        self.assertIsNone(characters[1])
+        self.assertEqual(
+            [character.id for character in characters if character], [3, 2, 1, 3]
+        )
+        self.assertIsInstance(characters[0], Player)
+        self.assertIsInstance(characters[2], Monster)
+        self.assertEqual(characters[0].get_level(), 5)
+        self.assertEqual(server.get_cache_stats()["hits"], 1)
+        self.assertEqual(server.get_many([]), [])
+
+    def test_get_many_invalid(self):
+        """300B - Multi-get with invalid parameters raises errors"""
+        test_cases = [
+            ("1,2", 10, "IDs must be a list of integers\\."),
+            ([1, "2"], 10, "ID needs to be an integer\\."),
+            ([1], 0, "Chunk Size must be a positive integer\\."),
+        ]
+        for ids, chunk_size, expected_regex in test_cases:
+            with self.subTest(ids=ids, chunk_size=chunk_size):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, self.server.get_many, ids, chunk_size
+                )
+
+    def test_find_characters_valid(self):
+        """310A - Filters, sort keys and limits are applied in SQL"""
+        knight = Player(10, "knight")
+        knight.move_position(5, 5)
+        self.server.add_characters(
+            [
+                Player(9, "knight"),
+                knight,
+                Player(10, "knight"),
+                Player(10, "warrior"),
+                Monster("orc", "easy"),
+                Monster("orc", "hard"),
+                Monster("elf", "normal"),
+            ]
+        )
+
+        def ids(*args):
+            return [view.id for view in self.server.find_characters(*args)]
+
+        self.assertEqual(ids({"job": "knight", "player_level": 10}), [2, 3])
+        self.assertEqual(
+            ids({"job": "KNIGHT", "min_player_level": 9}, ["-id"], 2), [3, 2]
+        )
+        self.assertEqual(ids({"min_x": 1, "max_x": 5, "min_y": 5}), [2])
+        self.assertEqual(ids({"monster_type": "orc", "max_damage": 20}), [5])
+        self.assertEqual(ids(None, ["-monster_ai_difficulty"], 3), [6, 7, 5])
+        self.assertEqual(
+            ids({"type": "player"}, ["-player_level", "job"]), [2, 3, 4, 1]
+        )
+        self.assertEqual(ids(), list(range(1, 8)))
+        self.assertEqual(ids({"alive": True, "type": "monster"}), [5, 6, 7])
+        self.assertEqual(ids({"alive": False}), [])
+        self.assertEqual(
+            [
+                self.server.get_filter_type(key)
+                for key in ("alive", "player_level", "max_x", "job")
+            ],
+            [bool, int, int, str],
+        )
+        self.assertEqual(
+            self.server.delete_characters(filters={"max_player_level": 9}), 1
+        )
+
+    def test_find_characters_invalid(self):
+        """310B - Filters, sort keys and limits outside the whitelist raise errors"""
+        test_cases = [
+            ({"filters": {"password": 1}}, "Unsupported filter 'password'\\."),
+            (
+                {"filters": {"min_health": "10"}},
+                "Filter 'min_health' must be an integer\\.",
+            ),
+            ({"filters": {"min_job": 1}}, "Unsupported filter 'min_job'\\."),
+            ({"sort": "health"}, "Sort must be a list of column names\\."),
+            ({"sort": ["-alive"]}, "Unsupported sort 'alive'\\."),
+            ({"limit": 0}, "Limit must be a positive integer\\."),
+        ]
+        for kwargs, expected_regex in test_cases:
+            with self.subTest(kwargs=kwargs):
+                self.assertRaisesRegex(
+                    ValueError, expected_regex, self.server.find_characters, **kwargs
+                )
+
+    def _create_sharded_server(self, shard_count: int) -> ShardedCharacterManager:
+        """Creates a sharded server over temporary shard files removed after the test"""
+        db_files = [f"test_shard_{index}.sqlite" for index in range(shard_count)]
+        engines = []
+        for db_file in db_files:
+            if os.path.exists(db_file):
+                os.remove(db_file)
+            engine = create_engine(f"sqlite:///{db_file}")
+            Base.metadata.create_all(engine)
+            engines.append(engine)
+            self.addCleanup(os.remove, db_file)
+            self.addCleanup(engine.dispose)
+        sharded = ShardedCharacterManager("ACIT", db_files, engines=engines)
+        self.addCleanup(sharded.close)
+        return sharded
+
+    def test_sharded_manager_valid(self):
+        """320A - Characters are spread over shards and merged like one server"""
+        sharded = self._create_sharded_server(3)
+        characters = [
+            Player(2, "knight"),
+            Player(9, "knight"),
+            Monster("orc", "hard"),
+            Player(4, "warrior"),
+            Monster("elf", "easy"),
+        ]
+        ids = sharded.add_characters(characters, batch_size=2)
+        ids.append(sharded.add_character(Player(10, "knight")))
+        self.server.add_characters(
+            [Player(2, "knight"), Player(9, "knight"), Monster("orc", "hard")]
+            + [Player(4, "warrior"), Monster("elf", "easy"), Player(10, "knight")]
+        )
+
+        self.assertEqual(len(set(ids)), 6)
+        self.assertEqual(
+            sorted(sharded.get_shard_index(char_id) for char_id in ids),
+            [0, 0, 1, 1, 2, 2],
+        )
+        self.assertEqual(sharded.get(ids[1]).player_level, 9)
+        self.assertEqual(sharded.get(ids[1]).id, ids[1])
+        self.assertEqual(
+            [char.id for char in sharded.get_all()],
+            sorted(ids[:2] + ids[3:4] + ids[5:]) + sorted([ids[2], ids[4]]),
+        )
+
+        # Averages are derived from the summed counters, as on one server
+        stats = sharded.get_server_stats()
+        expected = self.server.get_server_stats()
+        self.assertEqual(stats.num_players, expected.num_players)
+        self.assertEqual(stats.avg_player_level, expected.avg_player_level)
+        self.assertEqual(
+            stats.avg_monster_ai_difficulty, expected.avg_monster_ai_difficulty
+        )
+        self.assertEqual(
+            sharded.get_server_stats_totals(), self.server.get_server_stats_totals()
+        )
+
+        self.assertEqual(
+            [
+                view.id
+                for view in sharded.find_characters(
+                    {"job": "knight"}, ["-player_level"], 2
+                )
+            ],
+            [ids[5], ids[1]],
+        )
+        page, cursor = sharded.get_page(page_size=4)
+        self.assertEqual([char.id for char in page], sorted(ids)[:4])
+        self.assertEqual(
+            [char.id for char in sharded.iter_all(after_id=cursor)], sorted(ids)[4:]
+        )
+
+        self.assertEqual(sharded.update_character(ids[2], "dragon", "easy"), 1)
+        self.assertEqual(sharded.get(ids[2]).monster_type, "dragon")
+        results = sharded.execute_batch(
+            [{"op": "delete", "id": ids[0]}, {"op": "delete", "id": 999}],
+            atomic=False,
+        )
+        self.assertEqual([result["ok"] for result in results], [True, False])
+        self.assertEqual(results[1]["error"], "Character with ID 999 does not exist.")
+        self.assertEqual(sharded.delete_characters(filters={"type": "monster"}), 2)
+        self.assertEqual(sharded.get_server_stats().total_num_characters, 3)
+        self.assertEqual(sharded.verify_server_stats_counters(), {})
+
+    def test_sharded_manager_invalid(self):
+        """320B - Invalid shard lists, unknown IDs and cross-shard atomic batches raise errors"""
+        self.assertRaisesRegex(
+            ValueError,
+            "Database Names must be a non-empty list of file names\\.",
+            ShardedCharacterManager,
+            "ACIT",
+            [],
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "Database Names must not contain duplicates\\.",
+            ShardedCharacterManager,
+            "ACIT",
+            ["a.sqlite", "a.sqlite"],
+        )
+
+        sharded = self._create_sharded_server(2)
+        first_id, second_id = sharded.add_characters(
+            [Player(1, "knight"), Player(2, "knight")]
+        )
+        test_cases = [
+            (sharded.get, ("1",), "ID needs to be an integer\\."),
+            (sharded.get, (101,), "Character with ID 101 does not exist\\."),
+            (
+                sharded.delete_character,
+                (100,),
+                "Character with ID 100 does not exist\\.",
+            ),
+            (
+                sharded.execute_batch,
+                (
+                    [
+                        {"op": "delete", "id": first_id},
+                        {"op": "delete", "id": second_id},
+                    ],
+                ),
+                "Atomic batches cannot span shards",
+            ),
+            (
+                sharded.move_many,
+                ([[first_id, 1, 1], [100, 2, 2]],),
+                "Characters with IDs 100 do not exist\\.",
+            ),
+        ]
+        for method, args, expected_regex in test_cases:
+            with self.subTest(method=method.__name__, args=args):
+                self.assertRaisesRegex(ValueError, expected_regex, method, *args)
+        self.assertEqual(sharded.get(first_id).get_position(), [0, 0])
+
+    def test_sharded_manager_global_ids(self):
+        """320C - Errors and loaded characters carry global IDs; closing stops the pool"""
+        with self._create_sharded_server(2) as sharded:
+            first_id, second_id = sharded.add_characters(
+                [Player(1, "knight"), Player(2, "knight")]
+            )
+
+            character = sharded.get(second_id)
+            self.assertEqual(character.id, second_id)
+            self.assertIn(inspect(character).identity, (None, (second_id,)))
+            self.assertEqual(sharded._shards[1].get(1).id, 1)
+            self.assertEqual(
+                [char.id for char in sharded.get_many([second_id, first_id])],
+                [second_id, first_id],
+            )
+
+            # IDs deleted between the existence check and the shard's UPDATE
+            # are reported by the shard in the plural form
+            with mock.patch.object(
+                sharded, "existing_ids", return_value={100, 102, first_id}
+            ):
+                self.assertRaisesRegex(
+                    ValueError,
+                    "Characters with IDs 100, 102 do not exist\\.",
+                    sharded.move_many,
+                    [[first_id, 1, 1], [100, 2, 2], [102, 3, 3]],
+                )
+            self.assertEqual(sharded.get(first_id).get_position(), [0, 0])
+
+        self.assertRaises(RuntimeError, sharded.get_all)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,420 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from sqlalchemy import create_engine
+
+# Setup path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from base import Base
+from player import Player
+from monster import Monster
+from character_manager import CharacterManager
+from response_cache import ResponseCache
+from server_gui import MainAppController
+
+
+class TestServerApi(unittest.TestCase):
+    """Tests for the Flask API server's ETags, revalidation and compression"""
+
+    DB_FILE = "test_characters.sqlite"
+
+    @classmethod
+    def setUpClass(cls):
+        """Imports the server from a scratch directory, since it opens
+        characters.sqlite in the working directory on import"""
+        cls.workdir = tempfile.TemporaryDirectory()
+        previous_dir = os.getcwd()
+        os.chdir(cls.workdir.name)
+        try:
+            import server_api
+        finally:
+            os.chdir(previous_dir)
+        cls.api = server_api
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the scratch directory"""
+        cls.api.server._engine.dispose()
+        cls.workdir.cleanup()
+
+    def setUp(self):
+        """Initialize fixtures"""
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+        self.engine = create_engine(f"sqlite:///{self.DB_FILE}")
+        self.server = CharacterManager("ACIT", self.DB_FILE, engine=self.engine)
+        Base.metadata.create_all(self.engine)
+        # Enough characters for the full listing to reach GZIP_MIN_SIZE
+        for _ in range(40):
+            self.server.add_character(Player(1, "knight"))
+
+        self.api.server = self.server
+        self.api.response_cache = ResponseCache()
+        self.client = self.api.app.test_client()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.engine.dispose()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    def test_etag_revalidation(self):
+        """Test 010A - A current If-None-Match gets a bodiless 304 until a write"""
+        response = self.client.get("/server/characters/1")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag)
+
+        response = self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(
+            sorted(response.headers["Vary"].split(", ")), ["Accept", "Accept-Encoding"]
+        )
+
+        response = self.client.put(
+            "/server/character/1", json={"job": "warrior", "player_level": 4}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["job"], "warrior")
+
+    def test_gzip_etag_revalidation(self):
+        """Test 010B - A gzipped response's -gzip tag also revalidates to a 304"""
+        response = self.client.get(
+            "/server/characters/all", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        gzip_tag = response.headers["ETag"]
+        self.assertTrue(gzip_tag.endswith('-gzip"'))
+
+        plain_tag = self.client.get("/server/characters/all").headers["ETag"]
+        self.assertEqual(gzip_tag, plain_tag[:-1] + '-gzip"')
+
+        response = self.client.get(
+            "/server/characters/all",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_tag},
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], gzip_tag)
+        self.assertEqual(response.get_data(), b"")
+
+    def test_representation_etags(self):
+        """Test 010C - JSON and NDJSON of a route get different tags"""
+        json_tag = self.client.get("/server/characters/all").headers["ETag"]
+        ndjson_tag = self.client.get("/server/characters/all?format=ndjson").headers[
+            "ETag"
+        ]
+        self.assertNotEqual(json_tag, ndjson_tag)
+
+        response = self.client.get(
+            "/server/characters/all?format=ndjson",
+            headers={"If-None-Match": json_tag},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_process_write(self):
+        """Test 010D - A write by another process ends cached bodies and old tags"""
+        response = self.client.get("/server/characters/1")
+        etag = response.headers["ETag"]
+        self.assertEqual(response.get_json()["job"], "knight")
+
+        # A second engine stands in for another process, e.g. verify_stats.py
+        other_engine = create_engine(f"sqlite:///{self.DB_FILE}")
+        self.addCleanup(other_engine.dispose)
+        other = CharacterManager("ACIT", self.DB_FILE, engine=other_engine)
+        other.update_character(1, "warrior", 3)
+
+        response = self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["job"], "warrior")
+
+    def test_gui_revalidation(self):
+        """Test 020A - The GUI resends its stored ETag and reuses the body on a 304"""
+        sent_headers = []
+
+        def send(method, url, timeout, headers, **kwargs):
+            """Forwards a requests call to the Flask test client"""
+            sent_headers.append(dict(headers))
+            path = url.replace("http://127.0.0.1:5001", "")
+            flask_response = self.client.open(path, method=method, headers=headers)
+            response = requests.Response()
+            response.status_code = flask_response.status_code
+            response.headers = CaseInsensitiveDict(flask_response.headers)
+            response._content = flask_response.get_data()
+            return response
+
+        controller = SimpleNamespace(_validated_responses={})
+        url = "http://127.0.0.1:5001/server/serverstats"
+        with mock.patch("server_gui.requests.request", side_effect=send):
+            first = MainAppController._safe_request(controller, "GET", url)
+            second = MainAppController._safe_request(controller, "GET", url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn("If-None-Match", sent_headers[0])
+        self.assertEqual(sent_headers[1]["If-None-Match"], first.headers["ETag"])
+        self.assertIs(second, first)
+
+    def test_compress_large_body(self):
+        """Test 030A - A body of at least GZIP_MIN_SIZE comes back gzipped"""
+        plain = self.client.get("/server/characters/all")
+        self.assertGreaterEqual(
+            len(plain.get_data()), self.api.app.config["GZIP_MIN_SIZE"]
+        )
+        self.assertIn("Accept-Encoding", plain.headers["Vary"])
+        self.assertIn("Accept", plain.headers["Vary"].split(", "))
+
+        response = self.client.get(
+            "/server/characters/all", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(gzip.decompress(response.get_data()), plain.get_data())
+
+    def test_small_body_unchanged(self):
+        """Test 030B - A body below GZIP_MIN_SIZE is sent as is"""
+        plain = self.client.get("/server/serverstats")
+        self.assertLess(len(plain.get_data()), self.api.app.config["GZIP_MIN_SIZE"])
+
+        response = self.client.get(
+            "/server/serverstats", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_data(), plain.get_data())
+        self.assertEqual(response.headers["ETag"], plain.headers["ETag"])
+
+    def test_compress_ndjson_stream(self):
+        """Test 030C - A gzipped NDJSON stream decompresses to the same lines"""
+        plain = self.client.get("/server/characters/all?format=ndjson")
+        lines = plain.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 40)
+
+        response = self.client.get(
+            "/server/characters/all?format=ndjson",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(
+            gzip.decompress(response.get_data()).decode().splitlines(), lines
+        )
+
+    def add_list_characters(self):
+        """Adds a live and a dead warrior and an orc after the 40 knights"""
+        dead_warrior = Player(7, "warrior")
+        dead_warrior.set_alive(False)
+        self.server.add_characters(
+            [Player(5, "warrior"), dead_warrior, Monster("orc", "hard")]
+        )
+
+    def test_list_query(self):
+        """Test 040A - List routes filter, sort and limit through the query string"""
+        self.add_list_characters()
+
+        def ids(query):
+            response = self.client.get(f"/server/characters/all?{query}")
+            self.assertEqual(response.status_code, 200)
+            return [character["id"] for character in response.get_json()]
+
+        self.assertEqual(ids("job=warrior"), [41, 42])
+        self.assertEqual(ids("job=warrior&alive=true"), [41])
+        self.assertEqual(ids("alive=false"), [42])
+        self.assertEqual(ids("alive=0&type=player"), [42])
+        self.assertEqual(ids("min_player_level=5&sort=-player_level"), [42, 41])
+        self.assertEqual(ids("sort=-id&limit=2"), [43, 42])
+        self.assertEqual(ids("player_level=5"), [41])
+
+        response = self.client.get("/server/characters/all_details?type=monster")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), ["The monster (id: 43) is hard orc"])
+
+        response = self.client.get("/server/characters/all/player?job=WARRIOR&alive=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json(), ["The player (id: 41) is level 5 warrior"]
+        )
+
+    def test_list_query_invalid(self):
+        """Test 040B - Invalid list queries return 400 on every list route"""
+        test_cases = [
+            ("player_level=abc", "Filter 'player_level' must be an integer."),
+            ("min_x=1.5", "Filter 'min_x' must be an integer."),
+            ("alive=maybe", "Filter 'alive' must be true or false."),
+            ("password=1", "Unsupported query parameter 'password'."),
+            ("limit=abc", "Limit must be a positive integer."),
+            ("limit=0", "Limit must be a positive integer."),
+            ("sort=alive", "Unsupported sort 'alive'."),
+        ]
+        for path in (
+            "/server/characters/all",
+            "/server/characters/all_details",
+            "/server/characters/all/player",
+        ):
+            for query, message in test_cases:
+                with self.subTest(path=path, query=query):
+                    response = self.client.get(f"{path}?{query}")
+                    self.assertEqual(response.status_code, 400)
+                    self.assertTrue(response.get_data(as_text=True).startswith(message))
+
+    def test_delete_characters(self):
+        """Test 050A - Bulk delete by an ID list or a filter body"""
+        self.add_list_characters()
+
+        response = self.client.delete("/server/characters", json={"ids": [1, 2, 999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"deleted": 2})
+
+        response = self.client.delete(
+            "/server/characters", json={"filter": {"job": "warrior", "alive": True}}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"deleted": 1})
+        self.assertEqual(self.server.get_server_stats().num_players, 39)
+
+        for body in (
+            {"ids": [3], "filter": {"job": "knight"}},
+            {"filter": {"alive": "yes"}},
+            [3],
+        ):
+            with self.subTest(body=body):
+                response = self.client.delete("/server/characters", json=body)
+                self.assertEqual(response.status_code, 400)
+        self.assertTrue(self.server.character_exists(3))
+
+    def test_spatial_queries(self):
+        """Test 060A - Rectangle, radius and nearest-K routes"""
+        self.server.move_many([(1, 5, 5), (2, 8, 8)])
+        self.server.add_character(Monster("orc", "hard"))
+
+        def ids(path):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            return [character["id"] for character in response.get_json()]
+
+        self.assertEqual(
+            ids("/server/characters/in_rect?min_x=4&min_y=4&max_x=8&max_y=8"), [1, 2]
+        )
+        self.assertEqual(ids("/server/characters/within_radius?x=8&y=7&radius=1"), [2])
+        self.assertEqual(ids("/server/characters/nearest?k=2&x=9&y=9"), [2, 1])
+        self.assertEqual(
+            ids("/server/characters/nearest?k=1&x=9&y=9&type=monster"), [41]
+        )
+
+        for path in (
+            "/server/characters/in_rect?min_x=4&min_y=4&max_x=8",
+            "/server/characters/in_rect?min_x=9&min_y=4&max_x=8&max_y=8",
+            "/server/characters/within_radius?x=8&y=7&radius=-1",
+            "/server/characters/within_radius?x=a&y=7&radius=1",
+            "/server/characters/nearest?k=0&x=9&y=9",
+            "/server/characters/nearest?k=1&x=9&y=9&type=npc",
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 400)
+
+    def test_move_characters(self):
+        """Test 070A - Moving characters in one request"""
+        response = self.client.patch(
+            "/server/characters/positions", json=[[1, 3, 4], [2, 5, 6]]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"moved": 2})
+        self.assertEqual(
+            self.client.get("/server/characters/2").get_json()["position"], [5, 6]
+        )
+
+        response = self.client.patch(
+            "/server/characters/positions", json=[[1, 7, 7], [999, 1, 1]]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.server.get(1).get_position(), [3, 4])
+
+    def test_get_many_characters(self):
+        """Test 080A - Multi-get by query string and by body marks missing IDs"""
+        expected = [
+            self.server.get(3).to_dict(),
+            {"id": 999, "missing": True},
+            self.server.get(1).to_dict(),
+        ]
+
+        response = self.client.get("/server/characters?ids=3,999,1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), expected)
+
+        response = self.client.post(
+            "/server/characters/lookup", json={"ids": [3, 999, 1]}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), expected)
+
+        response = self.client.get("/server/characters?ids=3,a")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_data(as_text=True),
+            "IDs must be a comma-separated list of integers.",
+        )
+        response = self.client.post("/server/characters/lookup", json=[3])
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_details(self):
+        """Test 090A - all_details streams one JSON document per line on request"""
+        self.add_list_characters()
+        headers = {"Accept": "application/x-ndjson"}
+
+        response = self.client.get("/server/characters/all_details", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertTrue(response.headers["ETag"].endswith('-ndjson"'))
+        lines = [
+            json.loads(line) for line in response.get_data(as_text=True).splitlines()
+        ]
+        self.assertEqual(len(lines), 43)
+        self.assertEqual(lines[0], "The player (id: 1) is level 1 knight")
+        self.assertEqual(lines[-1], "The monster (id: 43) is hard orc")
+
+        response = self.client.get(
+            "/server/characters/all_details?job=warrior&sort=-id", headers=headers
+        )
+        self.assertEqual(
+            response.get_data(as_text=True).splitlines(),
+            [
+                json.dumps("The player (id: 42) is level 7 warrior"),
+                json.dumps("The player (id: 41) is level 5 warrior"),
+            ],
+        )
+
+        response = self.client.get(
+            "/server/characters/all_details?limit=abc", headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
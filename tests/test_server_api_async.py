@@ -0,0 +1,157 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+
+# Setup path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from base import Base
+from player import Player
+from character_manager import CharacterManager
+from response_cache import ResponseCache
+
+
+class TestServerApiAsync(unittest.IsolatedAsyncioTestCase):
+    """Smoke tests for the Quart API server"""
+
+    DB_FILE = "test_characters.sqlite"
+
+    @classmethod
+    def setUpClass(cls):
+        """Imports the server from a scratch directory, since it opens
+        characters.sqlite in the working directory on import"""
+        cls.workdir = tempfile.TemporaryDirectory()
+        previous_dir = os.getcwd()
+        os.chdir(cls.workdir.name)
+        try:
+            import server_api_async
+        finally:
+            os.chdir(previous_dir)
+        cls.api = server_api_async
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the scratch directory"""
+        cls.api.server._engine.dispose()
+        cls.workdir.cleanup()
+
+    def setUp(self):
+        """Initialize fixtures"""
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+        self.engine = create_engine(f"sqlite:///{self.DB_FILE}")
+        self.server = CharacterManager("ACIT", self.DB_FILE, engine=self.engine)
+        Base.metadata.create_all(self.engine)
+        self.server.add_character(Player(1, "knight"))
+
+        self.api.server = self.server
+        self.api.response_cache = ResponseCache()
+        self.client = self.api.app.test_client()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.engine.dispose()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    async def test_cached_get_and_write(self):
+        """Test 010A - Cached GET, 304 revalidation and a write through the async server"""
+        response = await self.client.get("/server/characters/1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await response.get_json())["player_level"], 1)
+        etag = response.headers["ETag"]
+
+        response = await self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(await response.get_data(), b"")
+
+        response = await self.client.put(
+            "/server/character/1", json={"job": "warrior", "player_level": 4}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = await self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual((await response.get_json())["job"], "warrior")
+
+    async def test_invalid_requests(self):
+        """Test 010B - Unknown IDs and invalid payloads return errors"""
+        response = await self.client.get("/server/characters/99")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            await response.get_data(as_text=True),
+            "Character with ID 99 does not exist.",
+        )
+
+        response = await self.client.patch(
+            "/server/characters/positions", json=[[1, "a", 2]]
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_missing_body(self):
+        """Test 010C - Writes without a JSON object body return 400"""
+        for method, path in (
+            ("PUT", "/server/character/1"),
+            ("POST", "/server/characters"),
+        ):
+            with self.subTest(method=method):
+                response = await self.client.open(path, method=method)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    await response.get_data(as_text=True),
+                    "Request body must be a JSON object.",
+                )
+
+                response = await self.client.open(path, method=method, json=[1])
+                self.assertEqual(response.status_code, 400)
+
+        response = await self.client.put("/server/character/1", json={})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            (await self.client.get("/server/characters/1")).status_code, 200
+        )
+
+    async def test_shared_miss_fallback(self):
+        """Test 010D - A request whose shared cache miss failed is still tagged"""
+        loop = asyncio.get_running_loop()
+
+        class FailedMisses(dict):
+            """Reports an in-flight miss for every key, which then fails"""
+
+            def get(self, key, default=None):
+                future = loop.create_future()
+                future.set_result(None)
+                return future
+
+        inflight_responses = self.api.inflight_responses
+        self.api.inflight_responses = FailedMisses()
+        try:
+            response = await self.client.get("/server/characters/1")
+        finally:
+            self.api.inflight_responses = inflight_responses
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await response.get_json())["id"], 1)
+        etag = response.headers["ETag"]
+        self.assertIn("Accept", response.headers["Vary"])
+
+        response = await self.client.get(
+            "/server/characters/1", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import sys
+from character_manager import CharacterManager
+
+
+def main():
+    """Verify the server stats counters, or rebuild them with --rebuild"""
+    acit = CharacterManager("ACIT", "characters.sqlite")
+
+    if "--rebuild" in sys.argv[1:]:
+        drift = acit.rebuild_server_stats_counters()
+        action = "Corrected"
+    else:
+        drift = acit.verify_server_stats_counters()
+        action = "Found"
+
+    if not drift:
+        print("Server stats counters are accurate.")
+        return 0
+
+    for char_type, fields in drift.items():
+        for field, (stored, actual) in fields.items():
+            print(
+                f"{action} drift in {char_type}.{field}: stored {stored}, actual {actual}"
+            )
+
+    return 0 if action == "Corrected" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())